@@ -0,0 +1,47 @@
+import os
+import pytest
+
+from polytope_app.archive import EdgeArchive, pack_edge_data, unpack_archive
+
+def _write_edges(edge_dir, filename, edges):
+    with open(os.path.join(edge_dir, filename), "w") as f:
+        f.writelines(f"{u} {v}\n" for u, v in edges)
+
+def test_pack_round_trip(tmp_path):
+    """
+    Packing a directory other than Edge_Data stores exactly its files, with labels of every width,
+    and exporting the archive writes them back unchanged.
+    """
+    edge_dir = tmp_path / "edges"
+    edge_dir.mkdir()
+    graphs = {
+        0: [(0, 1), (1, 2), (2, 0)],
+        3: [(0, 300), (300, 7), (7, 0)],
+        5: [(0, 70000), (70000, 65536), (65536, 0)],
+    }
+    for number, edges in graphs.items():
+        _write_edges(edge_dir, f"simple_polytope_{number}.txt", edges)
+    _write_edges(edge_dir, "notes.txt", [(0, 1)])
+
+    path = str(tmp_path / "edges.pack")
+    assert pack_edge_data(path=path, edge_dir=str(edge_dir)) == 3
+    archive = EdgeArchive(path)
+    assert sorted(number for number, _ in archive) == [0, 3, 5]
+    for number, edges in graphs.items():
+        assert [tuple(edge) for edge in archive.edges(number).tolist()] == edges
+
+    out_dir = tmp_path / "out"
+    assert unpack_archive(path=path, edge_dir=str(out_dir)) == 3
+    for number in graphs:
+        filename = f"simple_polytope_{number}.txt"
+        assert (out_dir / filename).read_text() == (edge_dir / filename).read_text()
+
+@pytest.mark.parametrize("edges", [[(0, -1)], [(0, 2 ** 32)]])
+def test_pack_rejects_labels_out_of_range(tmp_path, edges):
+    edge_dir = tmp_path / "edges"
+    edge_dir.mkdir()
+    _write_edges(edge_dir, "simple_polytope_1.txt", edges)
+    path = tmp_path / "edges.pack"
+    with pytest.raises(ValueError):
+        pack_edge_data(path=str(path), edge_dir=str(edge_dir))
+    assert not path.exists()
@@ -0,0 +1,74 @@
+import os
+from rich.console import Console
+
+from polytope_app import backup
+from polytope_app.storage import append_line, write_text_atomically
+
+def _write(relative, text):
+    write_text_atomically(os.path.join(backup.DATA_DIR, relative), text)
+
+def _read(relative):
+    with open(os.path.join(backup.DATA_DIR, relative)) as f:
+        return f.read()
+
+def test_reset_restores_only_changed_files(tmp_path, monkeypatch):
+    """
+    The snapshot hard-links the data files, and a reset replaces the changed files, removes the new
+    ones and leaves the unchanged ones alone.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join(backup.DATA_DIR, "Edge_Data"))
+    _write(os.path.join("Edge_Data", "simple_polytope_1.txt"), "[(0, 1)]")
+    _write(os.path.join("Edge_Data", "simple_polytope_2.txt"), "[(1, 2)]")
+    _write("simple_polytope_properties.csv", "name\nsimple_polytope_1\n")
+    console = Console(file=open(os.devnull, "w"))
+
+    backup.create_backup(console)
+    backup.wait_for_snapshot()
+    snapshots = os.listdir(backup.SNAPSHOT_DIR)
+    assert len(snapshots) == 1
+    assert os.path.exists(os.path.join(backup.backup_folder, backup.SNAPSHOT_MANIFEST))
+    unchanged = os.path.join(backup.DATA_DIR, "Edge_Data", "simple_polytope_1.txt")
+    inode = os.stat(unchanged).st_ino
+
+    _write(os.path.join("Edge_Data", "simple_polytope_2.txt"), "[(2, 3)]")
+    _write(os.path.join("Edge_Data", "simple_polytope_3.txt"), "[(3, 4)]")
+    os.remove(os.path.join(backup.DATA_DIR, "simple_polytope_properties.csv"))
+    backup.reset_session(console)
+
+    assert sorted(os.listdir(os.path.join(backup.DATA_DIR, "Edge_Data"))) == [
+        "simple_polytope_1.txt", "simple_polytope_2.txt",
+    ]
+    assert _read(os.path.join("Edge_Data", "simple_polytope_2.txt")) == "[(1, 2)]"
+    assert _read("simple_polytope_properties.csv") == "name\nsimple_polytope_1\n"
+    assert os.stat(unchanged).st_ino == inode
+
+def test_reset_truncates_appended_rows(tmp_path, monkeypatch):
+    """
+    Rows appended in place by insert_row also reach the linked snapshot; a reset truncates the file
+    back to its recorded size and modification time.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join(backup.DATA_DIR, "Edge_Data"))
+    _write("simple_polytope_properties.csv", "name\nsimple_polytope_1\n")
+    path = os.path.join(backup.DATA_DIR, "simple_polytope_properties.csv")
+    recorded = os.stat(path)
+    console = Console(file=open(os.devnull, "w"))
+
+    backup.create_backup(console)
+    backup.wait_for_snapshot()
+    append_line(path, "simple_polytope_2\n")
+    backup.reset_session(console)
+
+    assert _read("simple_polytope_properties.csv") == "name\nsimple_polytope_1\n"
+    assert os.stat(path).st_mtime_ns == recorded.st_mtime_ns
+
+def test_old_snapshots_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join(backup.DATA_DIR, "Edge_Data"))
+    _write("polytope_properties.txt", "order\n")
+    for i in range(backup.KEEP_SNAPSHOTS + 2):
+        backup.take_snapshot(os.path.join(backup.SNAPSHOT_DIR, f"snapshot-{i}"))
+    assert sorted(os.listdir(backup.SNAPSHOT_DIR)) == [
+        f"snapshot-{i}" for i in range(2, backup.KEEP_SNAPSHOTS + 2)
+    ]
@@ -0,0 +1,42 @@
+import os
+import networkx as nx
+
+from polytope_app.database import compute_properties, get_property_names
+from polytope_app.invariants import GraphContext
+from polytope_app.parallel import parallel_map
+from polytope_app.registry import evaluate_property, resolve_property
+
+def _graph():
+    return nx.read_edgelist(os.path.join("Simple_Polytope_Data", "Edge_Data", "simple_polytope_10.txt"), nodetype=int)
+
+def test_budgeted_intermediates_are_kept():
+    """
+    Intermediates computed by a property run in an isolated worker are cached in the caller's
+    context, so vertex_cover_number reuses the independence number instead of solving again.
+    """
+    G = _graph()
+    ctx = GraphContext(G)
+    alpha = evaluate_property(resolve_property('independence_number'), ctx, budget=60)
+    assert ctx.profile["independence_number"]["count"] == 1
+
+    def no_solve(*args):
+        raise AssertionError("the independence number was computed again")
+
+    ctx.exact_cubic = no_solve
+    assert evaluate_property(resolve_property('vertex_cover_number'), ctx, budget=60) == G.number_of_nodes() - alpha
+
+def test_budgeted_properties_match_unbudgeted():
+    G = _graph()
+    ctx = GraphContext(G)
+    budgeted = compute_properties(G, context=ctx, budget=60)
+    assert budgeted == compute_properties(G)
+    assert set(get_property_names()) <= set(budgeted)
+    assert all(entry["count"] == 1 for entry in ctx.profile.values())
+
+def _pid(item):
+    return os.getpid()
+
+def test_single_worker_pool():
+    assert parallel_map(_pid, [0, 1], workers=1) == [os.getpid()] * 2
+    pids = parallel_map(_pid, [0, 1], workers=1, use_pool=True)
+    assert len(set(pids)) == 1 and pids[0] != os.getpid()
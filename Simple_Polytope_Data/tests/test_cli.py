@@ -0,0 +1,57 @@
+import json
+import os
+import pandas as pd
+import pytest
+
+from polytope_app.cli import build_parser, main
+from polytope_app.storage import save_database
+
+SUBCOMMANDS = {
+    "recompute": ["recompute", "--workers", "1"],
+    "add": ["add", "[(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]"],
+    "import": ["import", "graphs.g6"],
+    "add-property": ["add-property", "girth"],
+    "remove-property": ["remove-property", "girth"],
+    "query": ["query", "--where", "order > 4"],
+    "undo": ["undo", "3"],
+    "history": ["history", "--limit", "5"],
+    "test": ["test", "-k", "cli"],
+    "conjecture": ["conjecture", "α", "--searches", "2"],
+}
+
+@pytest.mark.parametrize("command", sorted(SUBCOMMANDS))
+def test_subcommands_parse(command):
+    """
+    Every subcommand parses to its handler and the modules it needs.
+    """
+    args = build_parser().parse_args(SUBCOMMANDS[command])
+    assert args.command == command
+    assert callable(args.handler)
+    assert all(module.startswith("polytope_app.") for module in args.modules)
+
+def test_full_recompute_needs_confirmation(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["recompute", "--mode", "full"])
+    assert exit_info.value.code == 2
+    assert "--yes" in capsys.readouterr().err
+
+def test_query_writes_json(tmp_path, monkeypatch, capsys):
+    """
+    query prints the selected rows and columns of the database as one JSON object with timings.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("Simple_Polytope_Data")
+    save_database(pd.DataFrame({
+        "name": ["simple_polytope_0", "simple_polytope_1", "simple_polytope_2"],
+        "order": [4, 6, 8],
+        "girth": [3, 3, 4],
+        "edgelist": [[(0, 1)], [(0, 1)], [(0, 1)]],
+    }))
+    assert main(["query", "--where", "order > 4", "--columns", "name,girth", "--limit", "1"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["status"] == "ok"
+    assert report["result"] == {"matches": 2, "rows": [{"name": "simple_polytope_1", "girth": 3}]}
+    assert set(report["timings"]) == {"import", "run", "total"}
+
+    assert main(["query", "--columns", "missing"]) == 1
+    assert json.loads(capsys.readouterr().out)["status"] == "error"
@@ -0,0 +1,66 @@
+import os
+import shutil
+import networkx as nx
+import pytest
+
+from polytope_app import csr_store
+from polytope_app.csr_store import build_csr_store
+
+def get_edgelist_files():
+    """
+    Returns the names of all simple_polytope_N.txt edgelist files in the directory.
+    """
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    return sorted(f for f in os.listdir(edge_dir) if f.startswith("simple_polytope_") and f.endswith(".txt"))
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    return build_csr_store(path=str(tmp_path_factory.mktemp("csr") / "store.bin"))
+
+def test_csr_store_matches_edge_files(store):
+    """
+    Every graph in the CSR store must be identical to the one read from its edge list file,
+    and its CSR arrays must list the same neighbors.
+    """
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    files = get_edgelist_files()
+    assert len(store) == len(files)
+    for filename in files:
+        number = int(filename[len("simple_polytope_"):-len(".txt")])
+        expected = nx.read_edgelist(os.path.join(edge_dir, filename), nodetype=int)
+        G = store.graph(number)
+        assert list(G.nodes()) == list(expected.nodes()), filename
+        assert list(G.edges()) == list(expected.edges()), filename
+
+        indptr, indices, labels = store.csr(number)
+        for i, label in enumerate(labels):
+            neighbors = sorted(labels[indices[indptr[i]:indptr[i + 1]]].tolist())
+            assert neighbors == sorted(expected.neighbors(int(label))), filename
+
+def test_reads_reuse_the_loaded_store(tmp_path, monkeypatch):
+    """
+    Reads after load_csr_store do not scan Edge_Data again; an edge file rewritten since the store
+    was built is read from the file instead.
+    """
+    source = os.path.join(os.getcwd(), "Simple_Polytope_Data", "Edge_Data")
+    monkeypatch.chdir(tmp_path)
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    os.makedirs(edge_dir)
+    for number in range(4):
+        shutil.copy(os.path.join(source, f"simple_polytope_{number}.txt"), edge_dir)
+    monkeypatch.setattr(csr_store, "_store", None)
+    store = csr_store.load_csr_store()
+
+    def no_scan(edge_dir=None):
+        raise AssertionError("Edge_Data was scanned")
+
+    monkeypatch.setattr(csr_store, "edge_data_fingerprint", no_scan)
+    for number in range(4):
+        G = csr_store.read_polytope_graph(f"simple_polytope_{number}.txt")
+        assert list(G.edges()) == list(store.graph(number).edges())
+
+    path = os.path.join(edge_dir, "simple_polytope_1.txt")
+    with open(path, "w") as f:
+        f.write("0 1\n1 2\n2 0\n")
+    assert not store.is_current(1, path)
+    assert list(csr_store.read_polytope_graph("simple_polytope_1.txt").edges()) == [(0, 1), (0, 2), (1, 2)]
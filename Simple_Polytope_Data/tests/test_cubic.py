@@ -0,0 +1,47 @@
+import os
+import networkx as nx
+import graphcalc as gc
+import pytest
+
+from polytope_app.cubic import (
+    cubic_domination_number,
+    cubic_independence_number,
+    cubic_total_domination_number,
+    frontier_order,
+)
+from polytope_app.faces import faces_and_p_vector
+
+def get_small_edgelist_files(max_order=32):
+    """
+    Returns the names of the simple_polytope_N.txt edgelist files with at most max_order vertices.
+    """
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    files = []
+    for f in sorted(os.listdir(edge_dir)):
+        if f.startswith("simple_polytope_") and f.endswith(".txt"):
+            with open(os.path.join(edge_dir, f)) as edges:
+                if 3 * max_order // 2 >= sum(1 for _ in edges):
+                    files.append(f)
+    return files
+
+@pytest.mark.parametrize("filename", get_small_edgelist_files())
+def test_cubic_solvers_match_graphcalc(filename):
+    """
+    The bitset solvers must agree with the graphcalc integer programs on the small polytopes.
+    """
+    G = nx.read_edgelist(os.path.join("Simple_Polytope_Data", "Edge_Data", filename), nodetype=int)
+    order = frontier_order(G)
+    p_vector, _ = faces_and_p_vector(G)
+    assert cubic_independence_number(G, p_vector, order) == gc.independence_number(G)
+    assert cubic_domination_number(G, order) == gc.domination_number(G)
+    assert cubic_total_domination_number(G, order) == gc.total_domination_number(G)
+
+def test_cubic_solvers_on_nonplanar_graph():
+    """
+    The solvers need no planar embedding: the Petersen graph has independence number 4,
+    domination number 3 and total domination number 4.
+    """
+    G = nx.petersen_graph()
+    assert cubic_independence_number(G) == 4
+    assert cubic_domination_number(G) == 3
+    assert cubic_total_domination_number(G) == 4
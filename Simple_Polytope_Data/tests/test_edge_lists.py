@@ -1,8 +1,9 @@
 import os
 import networkx as nx
-import graphcalc as gc
 import pytest
 
+from polytope_app.validation import validate_graphs
+
 def get_edgelist_files():
     """
     Returns a list of full paths to all .txt edgelist files in the directory.
@@ -10,17 +11,30 @@ def get_edgelist_files():
     edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
     return [os.path.join(edge_dir, f) for f in os.listdir(edge_dir) if f.endswith(".txt")]
 
+@pytest.fixture(scope="module")
+def validation_results():
+    """
+    Reads every edgelist file and validates all the graphs in one batched call.
+    Returns (results, errors): the ValidationResult of each readable file and the read error of the others.
+    """
+    paths, graphs, errors = [], [], {}
+    for file_path in get_edgelist_files():
+        try:
+            graphs.append(nx.read_edgelist(file_path, nodetype=int))
+            paths.append(file_path)
+        except Exception as e:
+            errors[file_path] = e
+    return dict(zip(paths, validate_graphs(graphs))), errors
+
 @pytest.mark.parametrize("file_path", get_edgelist_files())
-def test_simple_polytope_graph(file_path):
+def test_simple_polytope_graph(file_path, validation_results):
     """
-    For the given edgelist file, read the graph and compute gc.simple_polytope_graph(G).
-    Assert that a valid (truthy) value is returned.
+    For the given edgelist file, check that the graph passes every stage of the simple polytope validator.
     """
     filename = os.path.basename(file_path)
-    try:
-        G = nx.read_edgelist(file_path, nodetype=int)
-    except Exception as e:
-        pytest.fail(f"Error reading {filename}: {e}")
+    results, errors = validation_results
+    if file_path in errors:
+        pytest.fail(f"Error reading {filename}: {errors[file_path]}")
 
-    result = gc.simple_polytope_graph(G)
-    assert result, f"gc.simple_polytope_graph returned a false value for '{filename}': {result}"
+    result = results[file_path]
+    assert result.valid, f"'{filename}' is not a simple polytope graph: {result.stage} check failed: {result.reason}"
@@ -0,0 +1,40 @@
+import networkx as nx
+import pytest
+
+from polytope_app.generator import iter_truncations, truncate_vertex
+from polytope_app.isomorphism import isomorphism_keys
+from polytope_app.validation import validate_simple_polytope
+
+@pytest.mark.parametrize("G", [nx.complete_graph(4), nx.hypercube_graph(3), nx.dodecahedral_graph()])
+def test_truncation_gives_simple_polytope(G):
+    """
+    Truncating any vertex of a simple polytope gives a simple polytope with two more vertices.
+    """
+    G = nx.convert_node_labels_to_integers(G)
+    for v in G.nodes():
+        H = truncate_vertex(G, v)
+        assert H.number_of_nodes() == G.number_of_nodes() + 2
+        assert validate_simple_polytope(H).valid
+
+def test_breadth_first_expansion():
+    """
+    The expansion from the tetrahedron yields pairwise non-isomorphic polytopes of increasing
+    order up to the limit, skips indexed polytopes and stops at the output budget.
+    """
+    seeds = [("tetrahedron", list(nx.complete_graph(4).edges()))]
+    empty = {"buckets": {}}
+    generated = list(iter_truncations(seeds, 12, index=empty, workers=1))
+    graphs = [nx.Graph(edges) for _, edges in generated]
+    orders = [G.number_of_nodes() for G in graphs]
+    assert orders == sorted(orders) and orders[0] == 6 and orders[-1] == 12
+    assert len({isomorphism_keys(G) for G in graphs}) == len(graphs)
+
+    key, digest = isomorphism_keys(graphs[0])
+    index = {"buckets": {key: {digest: ["prism"]}}}
+    assert list(iter_truncations(seeds, 12, index=index, workers=1)) == []
+    assert len(list(iter_truncations(seeds, 12, max_new=2, index=empty, workers=1))) == 2
+
+def test_expansion_requires_a_bound():
+    seeds = [("tetrahedron", list(nx.complete_graph(4).edges()))]
+    with pytest.raises(ValueError):
+        next(iter_truncations(seeds, 12, max_new=None, index={"buckets": {}}, workers=1))
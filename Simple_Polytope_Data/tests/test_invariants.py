@@ -0,0 +1,33 @@
+import os
+import networkx as nx
+
+from polytope_app import spectral
+from polytope_app.database import compute_properties, get_property_names
+from polytope_app.invariants import GraphContext
+
+def _graph():
+    return nx.read_edgelist(os.path.join("Simple_Polytope_Data", "Edge_Data", "simple_polytope_10.txt"), nodetype=int)
+
+def test_intermediates_are_computed_once():
+    """
+    Computing the full property list through one GraphContext computes each shared intermediate
+    exactly once.
+    """
+    G = _graph()
+    ctx = GraphContext(G)
+    props = compute_properties(G, context=ctx)
+    assert set(get_property_names()) <= set(props)
+    assert set(ctx.profile) >= {
+        "adjacency_matrix", "laplacian_matrix", "adjacency_spectrum", "laplacian_spectrum",
+        "distance_matrix", "eccentricities", "planar_embedding", "faces", "p_vector",
+        "is_simple_polytope", "cubic_order", "independence_number",
+    }
+    assert {key: entry["count"] for key, entry in ctx.profile.items()} == {key: 1 for key in ctx.profile}
+
+def test_sparse_intermediates_are_computed_once(monkeypatch):
+    G = _graph()
+    monkeypatch.setattr(spectral, "SPARSE_SPECTRAL_ORDER", G.number_of_nodes())
+    ctx = GraphContext(G)
+    compute_properties(G, context=ctx)
+    assert set(ctx.profile) >= {"sparse_adjacency_matrix", *spectral.SPARSE_SPECTRAL_PROPERTIES}
+    assert {key: entry["count"] for key, entry in ctx.profile.items()} == {key: 1 for key in ctx.profile}
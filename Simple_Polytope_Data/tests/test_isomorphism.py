@@ -0,0 +1,100 @@
+import os
+import random
+import shutil
+import networkx as nx
+from rich.console import Console
+
+from polytope_app import isomorphism, journal
+
+SOURCE_DIR = os.path.join(os.getcwd(), "Simple_Polytope_Data", "Edge_Data")
+STORED = ["simple_polytope_0.txt", "simple_polytope_1.txt", "simple_polytope_2.txt", "simple_polytope_10.txt"]
+
+def test_find_isomorphic_uses_stored_index(tmp_path, monkeypatch):
+    """
+    A relabeled copy of a stored polytope is found and a non-isomorphic cubic graph is not; lookups
+    neither read nor list the edge files.
+    """
+    monkeypatch.chdir(tmp_path)
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    os.makedirs(edge_dir)
+    for filename in STORED:
+        shutil.copy(os.path.join(SOURCE_DIR, filename), edge_dir)
+    isomorphism.update_isomorphism_index(workers=1)
+
+    def no_reads(filename):
+        raise AssertionError(f"{filename} was read")
+
+    monkeypatch.setattr(isomorphism, "edge_file_hash", no_reads)
+    monkeypatch.setattr(isomorphism, "_edge_file_stats", no_reads)
+    stored = nx.read_edgelist(os.path.join(edge_dir, "simple_polytope_10.txt"), nodetype=int)
+    labels = list(stored.nodes())
+    random.Random(0).shuffle(labels)
+    relabeled = nx.relabel_nodes(stored, dict(zip(stored.nodes(), labels)))
+    assert isomorphism.find_isomorphic(relabeled) == ["simple_polytope_10"]
+
+    other = nx.circular_ladder_graph(stored.number_of_nodes() // 2)
+    assert not nx.is_isomorphic(other, stored)
+    assert isomorphism.find_isomorphic(other) == []
+
+def test_index_follows_edge_data_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    os.makedirs(edge_dir)
+    for filename in STORED[:2]:
+        shutil.copy(os.path.join(SOURCE_DIR, filename), edge_dir)
+    isomorphism.update_isomorphism_index(workers=1)
+    tetrahedron = nx.complete_graph(4)
+    assert isomorphism.find_isomorphic(tetrahedron) == ["simple_polytope_0"]
+
+    os.remove(os.path.join(edge_dir, "simple_polytope_0.txt"))
+    shutil.copy(os.path.join(SOURCE_DIR, "simple_polytope_0.txt"), os.path.join(edge_dir, "simple_polytope_7.txt"))
+    assert isomorphism.find_isomorphic(tetrahedron) == ["simple_polytope_0"]
+    isomorphism.update_isomorphism_index(workers=1)
+    assert isomorphism.find_isomorphic(tetrahedron) == ["simple_polytope_7"]
+    assert sorted(isomorphism.load_isomorphism_index()["files"]) == ["simple_polytope_1.txt", "simple_polytope_7.txt"]
+
+def test_added_polytopes_are_appended(tmp_path, monkeypatch):
+    """
+    A polytope added with add_to_isomorphism_index is appended to the pending entries, without
+    rewriting the index, and is found by the next lookup without reading any edge file.
+    """
+    monkeypatch.chdir(tmp_path)
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    os.makedirs(edge_dir)
+    shutil.copy(os.path.join(SOURCE_DIR, STORED[1]), edge_dir)
+    isomorphism.update_isomorphism_index(workers=1)
+    saved = os.stat(isomorphism.INDEX_PATH).st_mtime_ns
+
+    shutil.copy(os.path.join(SOURCE_DIR, "simple_polytope_0.txt"), os.path.join(edge_dir, "simple_polytope_5.txt"))
+    isomorphism.add_to_isomorphism_index("simple_polytope_5.txt", nx.complete_graph(4))
+    assert os.stat(isomorphism.INDEX_PATH).st_mtime_ns == saved
+    assert os.path.exists(isomorphism.INDEX_PENDING_PATH)
+
+    def no_reads(filename):
+        raise AssertionError(f"{filename} was read")
+
+    monkeypatch.setattr(isomorphism, "edge_file_hash", no_reads)
+    assert isomorphism.find_isomorphic(nx.complete_graph(4)) == ["simple_polytope_5"]
+
+def test_undo_restores_saved_index(tmp_path, monkeypatch):
+    """
+    Saving the index inside a journal operation preserves the index and its pending entries, so
+    undoing the operation puts both back.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(journal, "_recovered", False)
+    monkeypatch.setattr(journal, "_session", None)
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    os.makedirs(edge_dir)
+    shutil.copy(os.path.join(SOURCE_DIR, STORED[1]), edge_dir)
+    isomorphism.update_isomorphism_index(workers=1)
+    shutil.copy(os.path.join(SOURCE_DIR, "simple_polytope_0.txt"), edge_dir)
+    isomorphism.add_to_isomorphism_index("simple_polytope_0.txt", nx.complete_graph(4))
+    before = {path: open(path).read() for path in (isomorphism.INDEX_PATH, isomorphism.INDEX_PENDING_PATH)}
+
+    with journal.operation("remove", source="simple_polytope_0", count=1):
+        os.remove(os.path.join(edge_dir, "simple_polytope_0.txt"))
+        isomorphism.update_isomorphism_index(workers=1)
+    assert not os.path.exists(isomorphism.INDEX_PENDING_PATH)
+    journal.undo_operation(Console(file=open(os.devnull, "w")))
+    assert {path: open(path).read() for path in before} == before
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+import networkx as nx
+import pandas as pd
+import pytest
+from rich.console import Console
+
+from polytope_app import edge_list, journal
+from polytope_app.database import drop_property
+from polytope_app.storage import CSV_PATH, insert_row, load_database, save_database, write_text_atomically
+
+PROPERTIES_PATH = os.path.join("Simple_Polytope_Data", "polytope_properties.txt")
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """
+    A database of two polytopes in a fresh directory, with a new journal.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(journal, "_recovered", False)
+    monkeypatch.setattr(journal, "_session", None)
+    os.makedirs(os.path.join("Simple_Polytope_Data", "Edge_Data"))
+    write_text_atomically(PROPERTIES_PATH, "order\ngirth\n")
+    save_database(pd.DataFrame({
+        "name": ["simple_polytope_0", "simple_polytope_1"],
+        "order": [4, 6],
+        "girth": [3, 3],
+    }))
+    return tmp_path
+
+def _console():
+    return Console(file=open(os.devnull, "w"))
+
+def _add(number, **columns):
+    name = f"simple_polytope_{number}"
+    with journal.operation("add", source=name, count=1):
+        write_text_atomically(os.path.join("Simple_Polytope_Data", "Edge_Data", name + ".txt"), "0 1\n")
+        insert_row({"name": name, **columns})
+
+def _contents(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def test_undo_last_addition_restores_files(data_dir):
+    """
+    Undoing the latest addition only puts back the files it touched, byte for byte.
+    """
+    before = _contents(CSV_PATH)
+    _add(2, order=8, girth=3)
+    assert len(load_database()) == 3
+    undone = journal.undo_operation(_console())
+    assert undone.kind == "add" and undone.files == 3
+    assert _contents(CSV_PATH) == before
+    assert list(load_database()["name"]) == ["simple_polytope_0", "simple_polytope_1"]
+    assert not os.path.exists(os.path.join("Simple_Polytope_Data", "Edge_Data", "simple_polytope_2.txt"))
+    assert [op.state for op in journal.list_operations()] == ["undone"]
+
+def test_undo_earlier_addition_applies_inverse(data_dir):
+    _add(2, order=8, girth=3)
+    _add(3, order=10, girth=3)
+    journal.undo_operation(_console(), 1)
+    assert list(load_database()["name"]) == ["simple_polytope_0", "simple_polytope_1", "simple_polytope_3"]
+    assert sorted(os.listdir(os.path.join("Simple_Polytope_Data", "Edge_Data"))) == ["simple_polytope_3.txt"]
+    operations = journal.list_operations()
+    assert [(op.kind, op.state) for op in operations] == [("add", "undone"), ("add", "committed"), ("undo", "committed")]
+
+    # Undoing the inverse brings the addition back.
+    journal.undo_operation(_console())
+    assert sorted(load_database()["name"]) == [f"simple_polytope_{i}" for i in range(4)]
+    assert journal.list_operations()[0].state == "committed"
+
+def test_undo_removed_property_out_of_order(data_dir):
+    """
+    A removed property is restored from the values recorded by drop_property, after later writes.
+    """
+    drop_property("order", _console())
+    _add(2, girth=4)
+    journal.undo_operation(_console(), 1)
+    with open(PROPERTIES_PATH) as f:
+        assert f.read() == "order\ngirth\n"
+    df = load_database()
+    assert list(df.columns) == ["name", "order", "girth"]
+    orders = df.set_index("name")["order"]
+    assert orders[["simple_polytope_0", "simple_polytope_1"]].tolist() == [4, 6]
+    assert pd.isna(orders["simple_polytope_2"])
+
+def test_exception_rolls_back_operation(data_dir):
+    before = _contents(CSV_PATH)
+    with pytest.raises(RuntimeError):
+        with journal.operation("add"):
+            insert_row({"name": "simple_polytope_2", "order": 8, "girth": 3})
+            raise RuntimeError
+    assert _contents(CSV_PATH) == before
+    assert len(load_database()) == 2
+    assert journal.list_operations()[0].state == "aborted"
+
+def test_recover_rolls_back_crashed_operation(data_dir):
+    """
+    An operation left open by a process that died is rolled back by the next process.
+    """
+    before = _contents(CSV_PATH)
+    crash = (
+        "import os\n"
+        "from polytope_app import journal\n"
+        "from polytope_app.storage import insert_row\n"
+        "with journal.operation('add'):\n"
+        "    insert_row({'name': 'simple_polytope_2', 'order': 8, 'girth': 3})\n"
+        "    os._exit(1)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    assert subprocess.run([sys.executable, "-c", crash], env=env).returncode == 1
+    assert _contents(CSV_PATH) != before
+    assert journal.list_operations()[0].state == "open"
+
+    journal.recover(_console())
+    assert _contents(CSV_PATH) == before
+    assert len(load_database()) == 2
+    assert journal.list_operations()[0].state == "aborted"
+
+def test_compaction_keeps_latest_operations(data_dir, monkeypatch):
+    for number in range(2, 7):
+        _add(number, order=2 * number + 4, girth=3)
+    assert journal.compact_journal(keep=2) == 3
+    assert [op.seq for op in journal.list_operations()] == [4, 5]
+    assert sorted(os.listdir(journal.JOURNAL_DIR)) == ["4", "5", "journal.jsonl"]
+    _add(7, order=18, girth=3)
+    assert journal.list_operations()[-1].seq == 6
+
+def test_failed_addition_is_rolled_back(data_dir, monkeypatch):
+    """
+    When the row cannot be written after the edge file was, save_new_polytope rolls the addition
+    back instead of committing it.
+    """
+    before = _contents(CSV_PATH)
+
+    def failing_insert(row):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(edge_list, "insert_row", failing_insert)
+    G = nx.complete_graph(4)
+    props = {"name": "simple_polytope_2", "order": 4, "girth": 3}
+    assert not edge_list.save_new_polytope(_console(), "simple_polytope_2.txt", list(G.edges()), props, G)
+    assert not os.path.exists(os.path.join("Simple_Polytope_Data", "Edge_Data", "simple_polytope_2.txt"))
+    assert _contents(CSV_PATH) == before
+    assert [op.state for op in journal.list_operations()] == ["aborted"]
@@ -0,0 +1,73 @@
+import os
+import pandas as pd
+from graffitiai import GraffitiAI
+
+from polytope_app import knowledge
+from polytope_app.budget import TIMED_OUT
+
+def test_knowledge_table_cache(tmp_path, monkeypatch):
+    """
+    The prepared table is rebuilt only when the database contents or the preparation version
+    change, and the cached table comes back with its column lists.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("Simple_Polytope_Data")
+    builds = []
+
+    def build():
+        table = pd.read_csv(knowledge.CSV_PATH)
+        graffiti = GraffitiAI(knowledge_table=table)
+        graffiti.boolean_columns = ["flag"]
+        builds.append(len(table))
+        return graffiti
+
+    monkeypatch.setattr(knowledge, "build_knowledge_graffiti", build)
+    pd.DataFrame({"order": [4, 6], "flag": [True, False]}).to_csv(knowledge.CSV_PATH, index=False)
+
+    first = knowledge.load_knowledge_graffiti()
+    cached = knowledge.load_knowledge_graffiti()
+    assert builds == [2]
+    assert cached.knowledge_table.equals(first.knowledge_table)
+    assert cached.numerical_columns == ["order"]
+    assert cached.boolean_columns == ["flag"]
+
+    pd.DataFrame({"order": [4, 6, 8], "flag": [True, False, True]}).to_csv(knowledge.CSV_PATH, index=False)
+    assert len(knowledge.load_knowledge_graffiti().knowledge_table) == 3
+    monkeypatch.setattr(knowledge, "KNOWLEDGE_TABLE_VERSION", knowledge.KNOWLEDGE_TABLE_VERSION + 1)
+    knowledge.load_knowledge_graffiti()
+    assert builds == [2, 3, 3]
+
+def test_p_vector_columns():
+    """
+    Every face size of some polytope gets a pₖ column and flag (p₃..p₇ always), padded with zeros.
+    """
+    columns = knowledge.p_vector_columns([[4], [2, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1], [0, 0, 12, 20]])
+    assert list(columns["p₃"]) == [4, 2, 0]
+    assert list(columns["p₆"]) == [0, 0, 20]
+    assert list(columns["p₁₄"]) == [0, 1, 0]
+    assert "p₈" not in columns
+    assert list(columns["(p₃ + ... + pₙ)"]) == [4, 6, 32]
+    assert list(columns["n"]) == [3, 14, 6]
+    assert list(columns["simple polytope graph with p₅ > 0"]) == [False, False, True]
+    assert list(columns["simple polytope graph with p₁₄ > 0"]) == [False, True, False]
+
+def test_timed_out_cells_keep_columns_numerical(monkeypatch):
+    """
+    A numeric property with TIMED_OUT cells is kept among the numerical columns, with NaN in those cells.
+    """
+    table = pd.DataFrame({
+        "name": ["simple_polytope_0", "simple_polytope_1", "simple_polytope_2"],
+        "order": [4, 6, 8],
+        "size": [6, 9, 12],
+        "p_vector": [[4], [2, 3], [0, 6]],
+        "adjacency_matrix": [None, None, None],
+        "simple_polytope_graph": [True, True, True],
+        "simple_polytope_graph_with_p6_greater_than_zero": [False, False, False],
+        "domination_number": [1, TIMED_OUT, 2],
+        "independence_number": [1, 2, TIMED_OUT],
+    })
+    monkeypatch.setattr(knowledge, "load_database", lambda: table)
+    graffiti = knowledge.build_knowledge_graffiti()
+    assert {"γ", "α"} <= set(graffiti.numerical_columns)
+    assert graffiti.knowledge_table["γ"].isna().tolist() == [False, True, False]
+    assert graffiti.knowledge_table["α"].tolist()[:2] == [1, 2]
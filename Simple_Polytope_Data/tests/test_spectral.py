@@ -0,0 +1,84 @@
+import os
+from collections import Counter
+import networkx as nx
+import numpy as np
+
+from polytope_app import spectral
+from polytope_app.invariants import CONTEXT_PROPERTIES, GraphContext
+from polytope_app.spectral import BATCHED_SPECTRAL_PROPERTIES, fill_spectral_columns, spectral_columns
+
+EDGE_DIR = os.path.join("Simple_Polytope_Data", "Edge_Data")
+SAMPLE = [f"simple_polytope_{number}.txt" for number in range(40)]
+
+def _graph(filename):
+    return nx.read_edgelist(os.path.join(EDGE_DIR, filename), nodetype=int)
+
+def test_batched_columns_match_graph_context(monkeypatch):
+    """
+    The batched per-order eigensolve gives the same values as the GraphContext of each graph, for a
+    mixed-order sample whose largest group is split into several batches.
+    """
+    graphs = [_graph(filename) for filename in SAMPLE]
+    orders = Counter(G.number_of_nodes() for G in graphs)
+    order, count = orders.most_common(1)[0]
+    assert len(orders) > 1 and count > 2
+    monkeypatch.setattr(spectral, "MAX_BATCH_BYTES", 2 * 8 * order * order)
+    solves = Counter()
+    batched_spectra = spectral.batched_spectra
+
+    def counting_spectra(adjacency):
+        solves[adjacency.shape[1]] += 1
+        return batched_spectra(adjacency)
+
+    monkeypatch.setattr(spectral, "batched_spectra", counting_spectra)
+    names = list(BATCHED_SPECTRAL_PROPERTIES)
+    contexts = [GraphContext(G) for G in graphs]
+    rows = [{"name": filename[:-4], "adjacency_matrix": ctx.adjacency_matrix.tolist()} for filename, ctx in zip(SAMPLE, contexts)]
+    columns = spectral_columns([row["adjacency_matrix"] for row in rows], names)
+    measurements = []
+    fill_spectral_columns(rows, names, measurements)
+    # Batches of two graphs, once for spectral_columns and once for fill_spectral_columns.
+    assert solves[order] == 2 * ((count + 1) // 2)
+    assert len(measurements) == len(rows) * len(names)
+
+    for i, (row, ctx) in enumerate(zip(rows, contexts)):
+        for name in names:
+            expected = CONTEXT_PROPERTIES[name](ctx)
+            if name == 'zero_adjacency_eigenvalues_count':
+                assert columns[name][i] == row[name] == expected, (row["name"], name)
+            else:
+                assert np.isclose(columns[name][i], expected, rtol=0, atol=1e-9), (row["name"], name)
+                assert row[name] == columns[name][i], (row["name"], name)
+
+def test_sparse_solver_matches_dense_spectra(monkeypatch):
+    """
+    With SPARSE_SPECTRAL_ORDER lowered, graphs at or above it get the four extreme eigenvalues from
+    the shift-invert solver, within SPARSE_TOLERANCE relative to the spectral radius bound 2D.
+    """
+    graphs = [_graph(f"simple_polytope_{number}.txt") for number in range(0, 442, 20)]
+    matrices = [GraphContext(G).adjacency_matrix.tolist() for G in graphs]
+    names = list(BATCHED_SPECTRAL_PROPERTIES)
+    dense = spectral_columns(matrices, names)
+
+    threshold = 40
+    monkeypatch.setattr(spectral, "SPARSE_SPECTRAL_ORDER", threshold)
+    solved = []
+    sparse_spectral_value = spectral.sparse_spectral_value
+
+    def counting_value(name, adjacency, tol=None):
+        solved.append(len(adjacency))
+        return sparse_spectral_value(name, adjacency, tol)
+
+    monkeypatch.setattr(spectral, "sparse_spectral_value", counting_value)
+    sparse = spectral_columns(matrices, names)
+    large = [i for i, G in enumerate(graphs) if G.number_of_nodes() >= threshold]
+    assert 0 < len(large) < len(graphs)
+    assert sorted(solved) == sorted(len(matrices[i]) for i in large for _ in spectral.SPARSE_SPECTRAL_PROPERTIES)
+
+    for i, G in enumerate(graphs):
+        bound = spectral.SPARSE_TOLERANCE * 2 * max(d for _, d in G.degree())
+        for name in names:
+            if i in large and name in spectral.SPARSE_SPECTRAL_PROPERTIES:
+                assert abs(sparse[name][i] - dense[name][i]) <= bound, (i, name)
+            else:
+                assert sparse[name][i] == dense[name][i], (i, name)
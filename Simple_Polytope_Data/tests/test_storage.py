@@ -0,0 +1,148 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from polytope_app import storage
+from polytope_app.budget import TIMED_OUT
+from polytope_app.manifest import MANIFEST_PENDING_PATH, load_manifest, record_manifest_entries, save_manifest
+from polytope_app.storage import (
+    CSV_PATH,
+    PENDING_PATH,
+    append_rows,
+    export_csv,
+    insert_row,
+    load_database,
+    save_database,
+)
+
+def _row(number, order):
+    return {
+        "name": f"simple_polytope_{number}",
+        "order": order,
+        "edgelist": [(i, (i + 1) % order) for i in range(order)],
+        "girth": order,
+    }
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """
+    A database of two rows in a fresh directory.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("Simple_Polytope_Data")
+    monkeypatch.setattr(storage, "_names_cache", None)
+    save_database(pd.DataFrame([_row(0, 4), _row(1, 6)]))
+    return tmp_path
+
+def _by_name(df):
+    return df.sort_values("name").reset_index(drop=True)
+
+def _assert_reads_back(rows, tmp_path):
+    """
+    load_database returns the expected rows, and the CSV kept up to date row by row reads the same
+    as a full export of them.
+    """
+    expected = pd.DataFrame(rows)
+    loaded = load_database()
+    assert os.path.exists(PENDING_PATH)
+    pd.testing.assert_frame_equal(_by_name(loaded), _by_name(expected), check_dtype=False)
+
+    exported = str(tmp_path / "export.csv")
+    export_csv(expected, path=exported)
+    pd.testing.assert_frame_equal(_by_name(pd.read_csv(CSV_PATH)), _by_name(pd.read_csv(exported)))
+
+def test_insert_row_reads_back(database, monkeypatch):
+    """
+    Inserted and replaced rows read back from the pending rows and the CSV; only the first insert
+    reads the stored names.
+    """
+    assert insert_row(_row(2, 8)) is False
+
+    def no_reads():
+        raise AssertionError("the stored names were read again")
+
+    monkeypatch.setattr(storage, "_read_stored_names", no_reads)
+    assert insert_row(_row(3, 10)) is False
+    assert insert_row(_row(1, 12)) is True
+    _assert_reads_back([_row(0, 4), _row(1, 12), _row(2, 8), _row(3, 10)], database)
+
+    save_database(load_database())
+    assert not os.path.exists(PENDING_PATH)
+    pd.testing.assert_frame_equal(
+        _by_name(load_database()),
+        _by_name(pd.DataFrame([_row(0, 4), _row(1, 12), _row(2, 8), _row(3, 10)])),
+        check_dtype=False,
+    )
+
+def test_append_rows_reads_back(database):
+    assert insert_row(_row(0, 5)) is True
+    assert append_rows((_row(number, 4 + number) for number in range(2, 7)), chunk_size=2) == 5
+    _assert_reads_back([_row(0, 5), _row(1, 6)] + [_row(number, 4 + number) for number in range(2, 7)], database)
+
+def test_manifest_entries_are_appended(database):
+    os.makedirs(os.path.join("Simple_Polytope_Data", "Edge_Data"))
+    for number in (0, 1):
+        with open(os.path.join("Simple_Polytope_Data", "Edge_Data", f"simple_polytope_{number}.txt"), "w") as f:
+            f.write("0 1\n")
+    save_manifest({"files": {"simple_polytope_0.txt": {"hash": "a"}}})
+    record_manifest_entries(["simple_polytope_1.txt"], ["order"])
+    record_manifest_entries(["simple_polytope_0.txt"], ["girth"])
+    manifest = load_manifest()
+    assert sorted(manifest["files"]) == ["simple_polytope_0.txt", "simple_polytope_1.txt"]
+    assert manifest["files"]["simple_polytope_0.txt"]["properties"] == ["girth"]
+
+    save_manifest(manifest)
+    assert not os.path.exists(MANIFEST_PENDING_PATH)
+    assert load_manifest() == manifest
+
+def test_save_and_load_round_trip(tmp_path, monkeypatch):
+    """
+    A frame with ragged edge lists, nested adjacency matrices, None, NaN, bool and TIMED_OUT cells,
+    plus a row still in the pending rows, loads back equal to what was saved, and its CSV export
+    reads the same as a direct export of the frame.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("Simple_Polytope_Data")
+    monkeypatch.setattr(storage, "_names_cache", None)
+    rows = [
+        {
+            "name": "simple_polytope_0", "order": 4, "edgelist": [(0, 1), (0, 2), (1, 2)],
+            "adjacency_matrix": [[0, 1, 1], [1, 0, 1], [1, 1, 0]], "girth": 3.0,
+            "is_bipartite": False, "is_hamiltonian": True, "chromatic_number": 3, "label": "tetrahedron",
+        },
+        {
+            "name": "simple_polytope_1", "order": 6, "edgelist": [(0, 1)],
+            "adjacency_matrix": [[0, 1], [1, 0]], "girth": np.nan,
+            "is_bipartite": True, "is_hamiltonian": None, "chromatic_number": TIMED_OUT, "label": None,
+        },
+        {
+            "name": "simple_polytope_2", "order": 8, "edgelist": None,
+            "adjacency_matrix": None, "girth": 4.0,
+            "is_bipartite": True, "is_hamiltonian": False, "chromatic_number": None, "label": TIMED_OUT,
+        },
+    ]
+    pending = {
+        "name": "simple_polytope_3", "order": 10, "edgelist": [(0, 1), (1, 2), (2, 3), (3, 0)],
+        "adjacency_matrix": [[0]], "girth": np.nan,
+        "is_bipartite": False, "is_hamiltonian": None, "chromatic_number": TIMED_OUT, "label": "prism",
+    }
+    save_database(pd.DataFrame(rows))
+    assert insert_row(pending) is False
+    assert os.path.exists(PENDING_PATH)
+
+    expected = pd.DataFrame(rows + [pending])
+    loaded = load_database()
+    pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+    assert loaded.loc[0, "edgelist"] == [(0, 1), (0, 2), (1, 2)]
+    assert loaded.loc[3, "edgelist"] == [(0, 1), (1, 2), (2, 3), (3, 0)]
+    assert loaded.loc[0, "adjacency_matrix"] == [[0, 1, 1], [1, 0, 1], [1, 1, 0]]
+    assert loaded.loc[1, "chromatic_number"] == TIMED_OUT
+
+    exported = str(tmp_path / "export.csv")
+    export_csv(expected, path=exported)
+    pd.testing.assert_frame_equal(pd.read_csv(CSV_PATH), pd.read_csv(exported))
+
+    save_database(loaded)
+    pd.testing.assert_frame_equal(load_database(), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(pd.read_csv(CSV_PATH), pd.read_csv(exported))
@@ -0,0 +1,89 @@
+import random
+import re
+import networkx as nx
+import graphcalc as gc
+import pytest
+
+from polytope_app.validation import validate_edge_arrays, validate_graphs, validate_simple_polytope
+
+def joined_at_removed_edges(G, H, bridges):
+    """
+    Removes an edge from each of two cubic graphs and joins them at the freed vertices, giving a
+    cubic graph with a 2-edge cut; with bridges=True the freed vertices are first merged in pairs
+    through a new vertex each, giving a cubic graph with a bridge.
+    """
+    G = nx.convert_node_labels_to_integers(G)
+    H = nx.convert_node_labels_to_integers(H, first_label=G.number_of_nodes())
+    union = nx.union(G, H)
+    (a, b), (c, d) = next(iter(G.edges())), next(iter(H.edges()))
+    union.remove_edges_from([(a, b), (c, d)])
+    if bridges:
+        x, y = union.number_of_nodes(), union.number_of_nodes() + 1
+        union.add_edges_from([(a, x), (b, x), (c, y), (d, y), (x, y)])
+    else:
+        union.add_edges_from([(a, c), (b, d)])
+    return union
+
+EXAMPLES = {
+    "tetrahedron": (nx.complete_graph(4), None),
+    "cube": (nx.hypercube_graph(3), None),
+    "prism": (nx.circular_ladder_graph(7), None),
+    "dodecahedron": (nx.dodecahedral_graph(), None),
+    "path": (nx.path_graph(5), "3-regular"),
+    "two tetrahedra": (nx.disjoint_union(nx.complete_graph(4), nx.complete_graph(4)), "connected"),
+    "petersen": (nx.petersen_graph(), "planar"),
+    "utility graph": (nx.complete_bipartite_graph(3, 3), "planar"),
+    "2-edge cut": (joined_at_removed_edges(nx.hypercube_graph(3), nx.hypercube_graph(3), False), "3-connected"),
+    "bridge": (joined_at_removed_edges(nx.complete_graph(4), nx.complete_graph(4), True), "3-connected"),
+}
+
+@pytest.mark.parametrize("name", sorted(EXAMPLES))
+def test_validator_matches_graphcalc(name):
+    """
+    The staged validator must accept exactly the graphs gc.simple_polytope_graph accepts, and
+    report the expected first failing stage.
+    """
+    G, stage = EXAMPLES[name]
+    result = validate_simple_polytope(G)
+    assert result.valid == bool(gc.simple_polytope_graph(G))
+    assert result.stage == stage
+    assert (result.reason is None) == result.valid
+
+def test_batch_validation_matches_single_graphs():
+    """
+    Validating a batch, as graphs or as edge lists, must reject the same graphs at the same
+    stages as validating each graph on its own.
+    """
+    graphs = [G for G, _ in EXAMPLES.values()] + [nx.random_regular_graph(3, 12, seed=seed) for seed in range(10)]
+    expected = [(result.valid, result.stage) for result in map(validate_simple_polytope, graphs)]
+    assert [(result.valid, result.stage) for result in validate_graphs(graphs, workers=1)] == expected
+    edge_lists = [list(nx.convert_node_labels_to_integers(G).edges()) for G in graphs]
+    assert [(result.valid, result.stage) for result in validate_graphs(edge_lists, workers=1)] == expected
+
+def test_edge_array_stages():
+    """
+    The vectorized counting stages reject self-loops and wrong degrees, and count repeated edges once.
+    """
+    results = validate_edge_arrays([
+        [(0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)],
+        [(0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3), (3, 2)],
+        [(0, 0), (0, 1)],
+        [(0, 1), (1, 2)],
+    ])
+    assert results[0] is None
+    assert results[1] is None
+    assert results[2].stage == "simple"
+    assert results[3].stage == "3-regular"
+
+@pytest.mark.parametrize("seed", range(5))
+def test_two_edge_cut_reports_a_vertex_cut(seed):
+    """
+    The reason given for a 2-edge cut names two vertices whose removal disconnects the graph.
+    """
+    G = joined_at_removed_edges(nx.circular_ladder_graph(4 + seed), nx.dodecahedral_graph(), False)
+    G = nx.relabel_nodes(G, dict(zip(G.nodes(), random.Random(seed).sample(list(G.nodes()), len(G)))))
+    result = validate_simple_polytope(G)
+    assert result.stage == "3-connected"
+    u, v = map(int, re.match(r"removing vertices (\d+) and (\d+) ", result.reason).groups())
+    assert u != v
+    assert not nx.is_connected(G.subgraph(set(G) - {u, v}))
@@ -0,0 +1,83 @@
+"""
+Benchmark of the exact cubic solvers of polytope_app.cubic against the graphcalc integer programs
+they replace, on every graph of Simple_Polytope_Data/Edge_Data. Every value is checked against
+graphcalc, and the times are summed by the frontier width of the vertex order, which is what
+decides MAX_FRONTIER_WIDTH.
+
+Run from the repository root:
+
+    python benchmarks/bench_cubic.py --max-states 200000
+"""
+
+import os
+import sys
+import time
+import argparse
+import networkx as nx
+import graphcalc as gc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polytope_app.cubic import (
+    cubic_domination_number,
+    cubic_independence_number,
+    cubic_total_domination_number,
+    frontier_order,
+)
+from polytope_app.database import list_edge_files
+from polytope_app.faces import faces_and_p_vector
+
+PROPERTIES = ("independence_number", "domination_number", "total_domination_number")
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-states", type=int, default=200000, help="state limit of the solvers")
+    parser.add_argument("--limit", type=int, default=None, help="only benchmark the first LIMIT edge files")
+    args = parser.parse_args()
+
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    filenames = list_edge_files()[:args.limit]
+    # width -> property -> [graphs, solver seconds, graphcalc seconds, gave up]
+    totals = {}
+    mismatches = []
+    for filename in filenames:
+        G = nx.read_edgelist(os.path.join(edge_dir, filename), nodetype=int)
+        order, ordering = timed(frontier_order, G)
+        p_vector, _ = faces_and_p_vector(G)
+        solvers = {
+            "independence_number": lambda: cubic_independence_number(G, p_vector, order, args.max_states),
+            "domination_number": lambda: cubic_domination_number(G, order, args.max_states),
+            "total_domination_number": lambda: cubic_total_domination_number(G, order, args.max_states),
+        }
+        for prop in PROPERTIES:
+            value, seconds = timed(solvers[prop])
+            expected, reference = timed(getattr(gc, prop), G)
+            entry = totals.setdefault(order.width, {}).setdefault(prop, [0, 0.0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += seconds + ordering / len(PROPERTIES)
+            entry[2] += reference
+            if value is None:
+                entry[3] += 1
+            elif value != expected:
+                mismatches.append((filename, prop, value, expected))
+
+    print(f"{'width':>6}  {'property':<24}{'graphs':>8}{'solver (s)':>12}{'graphcalc (s)':>15}{'gave up':>9}")
+    for width in sorted(totals):
+        for prop in PROPERTIES:
+            graphs, solver, reference, gave_up = totals[width][prop]
+            print(f"{width:>6}  {prop:<24}{graphs:>8}{solver:>12.3f}{reference:>15.3f}{gave_up:>9}")
+    for prop in PROPERTIES:
+        solver = sum(totals[width][prop][1] for width in totals)
+        reference = sum(totals[width][prop][2] for width in totals)
+        print(f"{'all':>6}  {prop:<24}{len(filenames):>8}{solver:>12.3f}{reference:>15.3f}")
+    for filename, prop, value, expected in mismatches:
+        print(f"MISMATCH {filename} {prop}: solver {value}, graphcalc {expected}")
+    print(f"{len(mismatches)} mismatches")
+
+if __name__ == "__main__":
+    main()
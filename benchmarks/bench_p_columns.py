@@ -0,0 +1,59 @@
+"""
+Benchmark of the knowledge-table columns derived from the p-vectors: the per-row .apply(lambda)
+passes used before (p₃..p₇, the face count and n) against polytope_app.knowledge.p_vector_columns,
+which builds every pₖ column, the sums, n and the pₖ > 0 flags from one padded array. The p-vectors
+are random, with lengths and counts like those of the database.
+
+Run from the repository root:
+
+    python benchmarks/bench_p_columns.py --rows 1000000
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polytope_app.knowledge import face_count_name, p_vector_columns
+
+def random_p_vectors(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, 12, size=rows)
+    return [rng.integers(0, 20, size=length).tolist() for length in lengths]
+
+def apply_columns(column):
+    """
+    The columns as they were computed before, one .apply pass over the column of arrays each.
+    """
+    columns = {face_count_name(k): column.apply(lambda x, j=k - 3: x[j] if len(x) > j else 0) for k in range(3, 8)}
+    columns['(p₃ + ... + pₙ)'] = column.apply(lambda x: sum(x))
+    columns['n'] = column.apply(lambda x: len(x) + 2)
+    columns.update((f'simple polytope graph with {face_count_name(k)} > 0', columns[face_count_name(k)] > 0) for k in range(3, 8))
+    return columns
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="number of p-vectors")
+    args = parser.parse_args()
+
+    p_vectors = random_p_vectors(args.rows)
+    # The knowledge table holds the p-vectors as arrays for add_statistics either way.
+    column = pd.Series(p_vectors).apply(np.array)
+    start = time.perf_counter()
+    before = apply_columns(column)
+    apply_time = time.perf_counter() - start
+    start = time.perf_counter()
+    after = p_vector_columns(p_vectors)
+    vectorized_time = time.perf_counter() - start
+
+    for name, values in before.items():
+        assert np.array_equal(np.asarray(values), after[name]), name
+    print(f"{args.rows} p-vectors: .apply passes {apply_time:.3f} s ({len(before)} columns), "
+          f"p_vector_columns {vectorized_time:.3f} s ({len(after)} columns)")
+
+if __name__ == "__main__":
+    main()
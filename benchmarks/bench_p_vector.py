@@ -0,0 +1,79 @@
+"""
+Benchmark of the p-vector computation: graphcalc's gc.p_vector (the path used before
+polytope_app.faces) against the half-edge face engine, on prisms and on truncated prisms.
+
+Run from the repository root:
+
+    python benchmarks/bench_p_vector.py --max-order 20000 --max-reference 2000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import networkx as nx
+import graphcalc as gc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polytope_app.faces import faces_and_p_vector
+
+def prism(order):
+    """
+    The graph of the prism over a polygon with order / 2 sides.
+    """
+    return nx.circular_ladder_graph(order // 2)
+
+def truncated_prism(order, seed=0):
+    """
+    A prism with randomly chosen vertices truncated (each replaced by a triangle) until the graph
+    has about order vertices. Every truncation keeps the graph a simple polytope graph.
+    """
+    rng = random.Random(seed)
+    G = prism(max(6, order // 4))
+    next_node = G.number_of_nodes()
+    nodes = list(G.nodes())
+    while G.number_of_nodes() + 2 <= order:
+        v = nodes.pop(rng.randrange(len(nodes)))
+        triangle = [next_node, next_node + 1, next_node + 2]
+        next_node += 3
+        for u, t in zip(list(G.neighbors(v)), triangle):
+            G.add_edge(u, t)
+        G.remove_node(v)
+        G.add_edges_from([(triangle[0], triangle[1]), (triangle[1], triangle[2]), (triangle[2], triangle[0])])
+        nodes.extend(triangle)
+    return G
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-order", type=int, default=20000, help="largest number of vertices")
+    parser.add_argument("--max-reference", type=int, default=2000, help="largest order timed with gc.p_vector")
+    args = parser.parse_args()
+
+    orders = []
+    order = 100
+    while order <= args.max_order:
+        orders.append(order)
+        order *= 2
+
+    print(f"{'family':<16}{'order':>8}{'planarity (s)':>16}{'engine (s)':>14}{'gc.p_vector (s)':>18}")
+    for family, build in (("prism", prism), ("truncated prism", truncated_prism)):
+        for order in orders:
+            G = build(order)
+            (is_planar, embedding), planarity = timed(nx.check_planarity, G)
+            (p_vector, _), engine = timed(faces_and_p_vector, G, embedding)
+            reference = "-"
+            if G.number_of_nodes() <= args.max_reference:
+                expected, seconds = timed(gc.p_vector, G)
+                assert expected == p_vector, f"p-vectors differ for {family} of order {order}"
+                reference = f"{seconds:.4f}"
+            print(f"{family:<16}{G.number_of_nodes():>8}{planarity:>16.4f}{engine:>14.4f}{reference:>18}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark of the interactive app's startup: the wall time from launching `python main.py` to the
+moment the main menu is shown, measured in fresh interpreters. The menu prompt is replaced by a
+stub that records the time and exits, and the session backup made at startup is removed again.
+
+Run from a directory holding Simple_Polytope_Data with a database (the repository root by
+default), optionally with the code of another checkout to compare two versions:
+
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --code ../old_checkout
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+# Executed in a fresh interpreter in the data directory, with the measured checkout on the path.
+CHILD = """
+import shutil, sys, time
+import questionary
+
+class MenuReached(Exception):
+    pass
+
+def select(*args, **kwargs):
+    raise MenuReached
+
+questionary.select = select
+import main
+try:
+    main.main_menu()
+except MenuReached:
+    print(f"TIME_TO_MENU {time.time():.6f}")
+finally:
+    from polytope_app import backup
+    if getattr(backup, "backup_folder", None):
+        shutil.rmtree(backup.backup_folder, ignore_errors=True)
+"""
+
+def time_to_menu(code, data):
+    start = time.time()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=data, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=code),
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith("TIME_TO_MENU "):
+            return float(line.split()[1]) - start
+    raise RuntimeError(f"The menu was not reached:\n{completed.stdout}\n{completed.stderr}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--code", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help="checkout whose main.py is launched (default: this one)")
+    parser.add_argument("--data", default=".", help="directory holding Simple_Polytope_Data (default: the current directory)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of launches")
+    args = parser.parse_args()
+
+    code, data = os.path.abspath(args.code), os.path.abspath(args.data)
+    times = [time_to_menu(code, data) for _ in range(args.repeat)]
+    print(f"Time to menu of {code} on {data} over {len(times)} launches:")
+    print(f"  median {statistics.median(times):.3f} s, min {min(times):.3f} s, max {max(times):.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -2,94 +2,29 @@ import sys
 import questionary
 import pyfiglet
 from rich.console import Console
-from polytope_app.backup import create_backup, reset_session
-from polytope_app import database, edge_list, conjecture, git_interface, utils
-from polytope_app.utils import view_conjectures, write_on_the_wall
-from graffitiai import GraffitiAI
+# The polytope_app submodules are imported on first use, so each option only loads what it needs.
+import polytope_app
+from polytope_app.backup import create_backup, reset_session, wait_for_snapshot
+from polytope_app.utils import custom_style
 
 console = Console()
 
 def main_menu():
-    # Automatically create a backup when the app starts.
+    # Roll back any operation a crash left unfinished, then snapshot the data in the background
+    # while the menu is shown.
+    polytope_app.journal.start_session(console)
     create_backup(console)
 
-    # Initialize the GraffitiAI object
-    graffiti = GraffitiAI()
-
-    # Load the database
-    graffiti.read_csv("Simple_Polytope_Data/simple_polytope_properties.csv")
-
-    # Rename the 'p_vector' column
-    graffiti.knowledge_table.rename(columns={'p_vector': '[p₃, p₄, ..., pₙ]'}, inplace=True)
-    # Add properties to the knowledge table.
-    graffiti.vectorize(['[p₃, p₄, ..., pₙ]'])
-    graffiti.add_statistics(['[p₃, p₄, ..., pₙ]'])
-    graffiti.knowledge_table.rename(columns={'order': 'V'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'size': 'E'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'simple_polytope_graph_with_p6_zero': 'simple polytope graph with p₆ = 0'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'simple_polytope_graph': 'simple polytope graph'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'mostly_zeros([p₃, p₄, ..., pₙ])': 'simple polytope graph with at least 70% of p₃, p₄, ..., pₙ equal to zero'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'first_index_half_cumsum([p₃, p₄, ..., pₙ])': 'min{k : p₃ + ... + pₖ ≥ ½ (p₃ + ... + pₙ)}'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'variance([p₃, p₄, ..., pₙ])': 'σ²(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'std_dev([p₃, p₄, ..., pₙ])': 'σ(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'max([p₃, p₄, ..., pₙ])': 'max(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'min([p₃, p₄, ..., pₙ])': 'min(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'mean([p₃, p₄, ..., pₙ])': 'μ(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'median_absolute_deviation([p₃, p₄, ..., pₙ])': 'MAD(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'count_even([p₃, p₄, ..., pₙ])': 'count_even(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'count_odd([p₃, p₄, ..., pₙ])': 'count_odd(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'count_zero([p₃, p₄, ..., pₙ])': 'count_zero(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'count_non_zero([p₃, p₄, ..., pₙ])': 'count_non_zero(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'unique_count([p₃, p₄, ..., pₙ])': '|{pₖ : 3 ≤ k ≤ n}|'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'range([p₃, p₄, ..., pₙ])': '(max{pₖ : 3 ≤ k ≤ n} - min{pₖ : 3 ≤ k ≤ n})'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'median([p₃, p₄, ..., pₙ])': 'median(p₃,..., pₙ)'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'zeros_clustered([p₃, p₄, ..., pₙ])': 'simple polytope graph with at least 50% of zero values in the p-vector clustered contiguously'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'domination_number': 'γ'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'independence_number': 'α'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'total_domination_number': 'γₜ'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'vertex_cover_number': 'β'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'matching_number': 'μ'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'diameter': 'diam'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'girth': 'g'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'radius': 'rad'}, inplace=True)
-    graffiti.knowledge_table.rename(columns={'zero_adjacency_eigenvalue_count': 'count_zero(λ₁, λ₂, ..., λₙ)'}, inplace=True)
-    graffiti.knowledge_table['p₃'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: x[0])
-    graffiti.knowledge_table['p₄'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: x[1] if len(x) > 1 else 0)
-    graffiti.knowledge_table['p₅'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: x[2] if len(x) > 2 else 0)
-    graffiti.knowledge_table['p₆'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: x[3] if len(x) > 3 else 0)
-    graffiti.knowledge_table['p₇'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: x[4] if len(x) > 4 else 0)
-    graffiti.knowledge_table['(p₃ + ... + pₙ)'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: sum(x))
-    graffiti.knowledge_table['n'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: len(x) + 2)
-    graffiti.knowledge_table['simple polytope graph with p₃ > 0'] = graffiti.knowledge_table['p₃'] > 0
-    graffiti.knowledge_table['simple polytope graph with p₄ > 0'] = graffiti.knowledge_table['p₄'] > 0
-    graffiti.knowledge_table['simple polytope graph with p₅ > 0'] = graffiti.knowledge_table['p₅'] > 0
-    graffiti.knowledge_table['simple polytope graph with p₆ > 0'] = graffiti.knowledge_table['p₆'] > 0
-    graffiti.knowledge_table['simple polytope graph with p₇ > 0'] = graffiti.knowledge_table['p₇'] > 0
-
-    # graffiti.knowledge_table['k with pk > 0'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: [k for k in range(3, len(x) + 3) if x[k - 3] > 0])
-
-    # fullerene's only have p5 and p6 faces. To check this, we check the length of the p-vector is 4 and
-    # the first two entries are zero and the last two entries are non-zero.
-    graffiti.knowledge_table['fullerene'] = (graffiti.knowledge_table['n'] == 6) & (graffiti.knowledge_table['p₃'] == 0) & (graffiti.knowledge_table['p₄'] == 0) & (graffiti.knowledge_table['p₅'] > 0) & (graffiti.knowledge_table['p₆'] > 0)
-
-
-
-    # drop the columns that are not needed
-    graffiti.drop_columns(['[p₃, p₄, ..., pₙ]', 'length([p₃, p₄, ..., pₙ])', 'adjacency_matrix', 'E', 'simple_polytope_graph_with_p6_greater_than_zero'])
-
-    graffiti.numerical_columns = graffiti.knowledge_table.select_dtypes(include=['number']).columns.tolist()
-    graffiti.boolean_columns = graffiti.knowledge_table.select_dtypes(include='bool').columns.tolist()
-
-    # Get numerical columns of the knowledge_table.
-    numerical_columns = graffiti.knowledge_table.select_dtypes(include=['number']).columns.tolist()
+    # The GraffitiAI knowledge table is only used by options 9 and 10, so it is prepared on first use.
+    graffiti = None
+    title_text = pyfiglet.figlet_format("Polytope AI", font="slant")
 
     while True:
-        title_text = pyfiglet.figlet_format("Polytope AI", font="slant")
         console.print(title_text, style="bold cyan")
         choice = questionary.select(
             "Please select an option:",
             choices=[
-                "1: Reset Session",
+                "1: Undo / Reset Session",
                 "2: Recompute Database",
                 "3: Update Database Polytopes",
                 "4: Display Properties",
@@ -101,7 +36,7 @@ def main_menu():
                 "10: View the Wall",
                 "11: Exit",
             ],
-            style=utils.custom_style,
+            style=custom_style,
         ).ask()
 
         # Extract the numeric option from the choice
@@ -111,37 +46,70 @@ def main_menu():
             console.print("[red]Invalid option format.[/red]")
             continue
 
+        # Nothing may be modified before the snapshot is complete.
+        wait_for_snapshot()
         if option == 1:
-            reset_session(console)
+            undo_choice = questionary.select(
+                "What would you like to undo?",
+                choices=[
+                    "Undo the last operation",
+                    "Undo an earlier operation from the journal",
+                    "Reset the whole session",
+                ],
+                style=custom_style,
+            ).ask()
+            if undo_choice.startswith("Undo the last"):
+                polytope_app.journal.undo_operation(console)
+            elif undo_choice.startswith("Undo an earlier"):
+                polytope_app.journal.undo_mode(console)
+            elif undo_choice.startswith("Reset"):
+                reset_session(console)
         elif option == 2:
-            database.recompute_csv_database(console)
+            polytope_app.database.recompute_csv_database(console)
         elif option == 3:
             entry_choice = questionary.select(
                 "How would you like to enter the edge list?",
                 choices=[
                     "Manual entry (one edge per line)",
                     "Paste entire edge list",
+                    "Bulk import from a directory or multi-graph file",
+                    "Grow the database by truncating vertices",
+                    "Audit database for isomorphic duplicates",
+                    "Pack or export the Edge_Data archive",
                 ],
-                style=utils.custom_style,
+                style=custom_style,
             ).ask()
             if entry_choice.startswith("Manual"):
-                edge_list.add_new_edge_list(console)
+                polytope_app.edge_list.add_new_edge_list(console)
             elif entry_choice.startswith("Paste"):
-                edge_list.add_new_edge_list_from_paste(console)
+                polytope_app.edge_list.add_new_edge_list_from_paste(console)
+            elif entry_choice.startswith("Bulk"):
+                polytope_app.bulk_import.bulk_import_mode(console)
+            elif entry_choice.startswith("Grow"):
+                polytope_app.generator.grow_database_mode(console)
+            elif entry_choice.startswith("Audit"):
+                polytope_app.isomorphism.audit_duplicates(console)
+            elif entry_choice.startswith("Pack"):
+                polytope_app.archive.archive_mode(console)
         elif option == 4:
-            database.display_properties_of_entry(console)
+            polytope_app.database.display_properties_of_entry(console)
         elif option == 5:
-            database.run_pytests(console)
+            polytope_app.database.run_pytests(console)
         elif option == 6:
-            database.add_new_function(console)
+            polytope_app.database.add_new_function(console)
         elif option == 7:
-            database.remove_property(console)
+            polytope_app.database.remove_property(console)
         elif option == 8:
-            git_interface.git_github_interface(console)
-        elif option == 9:
-            conjecture.conjecture_mode(graffiti, numerical_columns, console)
-        elif option == 10:
-            write_on_the_wall(graffiti, numerical_columns, search=True, console=console)
+            polytope_app.git_interface.git_github_interface(console)
+        elif option in (9, 10):
+            if graffiti is None:
+                console.print("[blue]Preparing the knowledge table...[/blue]")
+                graffiti = polytope_app.knowledge.load_knowledge_graffiti()
+            numerical_columns = graffiti.numerical_columns
+            if option == 9:
+                polytope_app.conjecture.conjecture_mode(graffiti, numerical_columns, console)
+            else:
+                polytope_app.utils.write_on_the_wall(graffiti, numerical_columns, search=True, console=console)
             # view_conjectures(graffiti, numerical_columns, console)
         elif option == 11:
             console.print("[bold red]Exiting. Goodbye![/bold red]")
@@ -150,4 +118,8 @@ def main_menu():
             console.print("[red]Invalid option. Please choose a valid option.[/red]")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Headless mode: run one subcommand (see polytope_app/cli.py) instead of the menu.
+        from polytope_app.cli import main
+        sys.exit(main(sys.argv[1:]))
     main_menu()
@@ -1,6 +1,50 @@
-from polytope_app.backup import *
-from polytope_app.conjecture import *
-from polytope_app.database import *
-from polytope_app.edge_list import *
-from polytope_app.git_interface import *
-from polytope_app.utils import *
+import importlib
+
+# The submodules are imported on first use (PEP 562), so that importing one of them, as the
+# command-line mode does, does not load the dependencies of all the others. Every public name of
+# a submodule is still available from the package.
+_SUBMODULES = (
+    'archive',
+    'backup',
+    'budget',
+    'bulk_import',
+    'cli',
+    'conjecture',
+    'csr_store',
+    'cubic',
+    'database',
+    'edge_list',
+    'faces',
+    'generator',
+    'git_interface',
+    'invariants',
+    'isomorphism',
+    'journal',
+    'knowledge',
+    'manifest',
+    'parallel',
+    'profiling',
+    'registry',
+    'spectral',
+    'storage',
+    'utils',
+    'validation',
+)
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name == '__all__':
+        return [
+            public
+            for submodule in _SUBMODULES
+            for public in getattr(importlib.import_module(f"{__name__}.{submodule}"), '__all__', ())
+        ]
+    for submodule in _SUBMODULES:
+        module = importlib.import_module(f"{__name__}.{submodule}")
+        if name in getattr(module, '__all__', ()):
+            return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
@@ -0,0 +1,184 @@
+# polytope_app/archive.py
+
+import os
+import numpy as np
+import networkx as nx
+from rich.prompt import Prompt
+
+from polytope_app.csr_store import edge_file_number
+from polytope_app.database import list_edge_files
+from polytope_app.storage import write_text_atomically
+
+__all__ = [
+    'ARCHIVE_PATH',
+    'EdgeArchive',
+    'open_archive',
+    'pack_edge_data',
+    'unpack_archive',
+    'archive_mode',
+]
+
+ARCHIVE_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_edges.pack")
+
+# File layout (all integers little-endian):
+#   header:  8-byte magic, then uint64 count, slots and index_offset
+#   body:    the edges of every graph in file order, as (u, v) pairs of the narrowest of uint8,
+#            uint16 and uint32 that holds its largest label, in the order of the lines of the edge file
+#   index:   int64 numbers[count], int64 offsets[count + 1] (byte offsets of each graph's edges),
+#            uint8 widths[count] (bytes per label), int64 positions[slots] (position of polytope N, or -1)
+MAGIC = b"PLYPACK1"
+HEADER = np.dtype([("magic", "S8"), ("count", "<u8"), ("slots", "<u8"), ("index_offset", "<u8")])
+# Label dtype for each width, in bytes.
+WIDTHS = {1: "u1", 2: "<u2", 4: "<u4"}
+
+def _label_width(edges, filename):
+    """
+    Returns the number of bytes per label needed to store edges, raising ValueError for labels that
+    are negative or do not fit in the widest label type.
+    """
+    if edges.size == 0:
+        return 1
+    if edges.min() < 0:
+        raise ValueError(f"{filename} has a negative vertex label.")
+    for width, dtype in WIDTHS.items():
+        if edges.max() <= np.iinfo(dtype).max:
+            return width
+    raise ValueError(f"{filename} has a vertex label above {np.iinfo(WIDTHS[4]).max}.")
+
+class EdgeArchive:
+    """
+    Read access to a packed edge archive. The edges are memory-mapped, so the edges of polytope N
+    are found in O(1) through the position index and returned as a zero-copy (E, 2) array view.
+    Iterating over the archive yields (N, edges) pairs in file order.
+    """
+
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER, count=1)[0]
+        if header["magic"] != MAGIC:
+            raise ValueError(f"{path} is not a polytope edge archive.")
+        count, slots, index_offset = int(header["count"]), int(header["slots"]), int(header["index_offset"])
+        with open(path, "rb") as f:
+            f.seek(index_offset)
+            self.numbers = np.fromfile(f, dtype="<i8", count=count)
+            self._offsets = np.fromfile(f, dtype="<i8", count=count + 1)
+            self._widths = np.fromfile(f, dtype="u1", count=count)
+            self._positions = np.fromfile(f, dtype="<i8", count=slots)
+        self._data = np.memmap(path, dtype="u1", mode="r", offset=0, shape=(max(index_offset, 1),))
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __contains__(self, number):
+        return 0 <= number < len(self._positions) and self._positions[number] >= 0
+
+    def _edges_at(self, position):
+        start, end = self._offsets[position], self._offsets[position + 1]
+        return self._data[start:end].view(WIDTHS[int(self._widths[position])]).reshape(-1, 2)
+
+    def edges(self, number):
+        """
+        Returns the edges of polytope number as an (E, 2) array, in the order of its edge file.
+        """
+        if number not in self:
+            raise KeyError(f"simple_polytope_{number} is not in the archive.")
+        return self._edges_at(self._positions[number])
+
+    def graph(self, number):
+        """
+        Returns polytope number as a networkx graph, built like nx.read_edgelist builds it from its edge file.
+        """
+        G = nx.Graph()
+        G.add_edges_from(self.edges(number).tolist())
+        return G
+
+    def __iter__(self):
+        for position, number in enumerate(self.numbers):
+            yield int(number), self._edges_at(position)
+
+def open_archive(path=ARCHIVE_PATH):
+    """
+    Opens the packed edge archive, or returns None if it does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+    return EdgeArchive(path)
+
+def pack_edge_data(path=ARCHIVE_PATH, edge_dir=None):
+    """
+    Packs every simple_polytope_N.txt file of Edge_Data (or of edge_dir) into a single archive file,
+    replacing it atomically, and returns the number of graphs packed. Files without a numerical tag
+    are skipped. Raises ValueError if a file has a vertex label that cannot be stored.
+    """
+    if edge_dir is None:
+        edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    numbers = []
+    chunks = []
+    widths = []
+    offsets = [HEADER.itemsize]
+    for filename in list_edge_files(edge_dir):
+        number = edge_file_number(filename)
+        if number is None:
+            continue
+        edges = np.loadtxt(os.path.join(edge_dir, filename), dtype=np.int64, ndmin=2).reshape(-1, 2)
+        width = _label_width(edges, filename)
+        chunk = edges.astype(WIDTHS[width]).tobytes()
+        numbers.append(number)
+        chunks.append(chunk)
+        widths.append(width)
+        offsets.append(offsets[-1] + len(chunk))
+
+    slots = max(numbers) + 1 if numbers else 0
+    positions = np.full(slots, -1, dtype="<i8")
+    positions[numbers] = np.arange(len(numbers))
+    header = np.array([(MAGIC, len(numbers), slots, offsets[-1])], dtype=HEADER)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.tobytes())
+        for chunk in chunks:
+            f.write(chunk)
+        f.write(np.asarray(numbers, dtype="<i8").tobytes())
+        f.write(np.asarray(offsets, dtype="<i8").tobytes())
+        f.write(np.asarray(widths, dtype="u1").tobytes())
+        f.write(positions.tobytes())
+    os.replace(tmp_path, path)
+    return len(numbers)
+
+def unpack_archive(path=ARCHIVE_PATH, edge_dir=None):
+    """
+    Writes every graph of the archive back to Edge_Data as simple_polytope_N.txt, in the per-file
+    layout (one 'source target' line per edge), and returns the number of files written.
+    """
+    if edge_dir is None:
+        edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    os.makedirs(edge_dir, exist_ok=True)
+    archive = EdgeArchive(path)
+    for number, edges in archive:
+        write_text_atomically(
+            os.path.join(edge_dir, f"simple_polytope_{number}.txt"),
+            "".join(f"{u} {v}\n" for u, v in edges.tolist()),
+        )
+    return len(archive)
+
+def archive_mode(console):
+    """
+    Prompts whether to pack Edge_Data into the archive or to export the archive back to Edge_Data.
+    """
+    choice = Prompt.ask(
+        "[bold cyan]Pack Edge_Data into the archive, or export the archive to Edge_Data?[/bold cyan]",
+        choices=["pack", "export"],
+        default="pack",
+    )
+    try:
+        if choice == "pack":
+            count = pack_edge_data()
+            console.print(f"[bold green]Packed {count} edge lists into {ARCHIVE_PATH}.[/bold green]")
+        else:
+            if not os.path.exists(ARCHIVE_PATH):
+                console.print(f"[red]Archive {ARCHIVE_PATH} not found.[/red]")
+                return
+            count = unpack_archive()
+            console.print(f"[bold green]Exported {count} edge lists to Edge_Data.[/bold green]")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
@@ -1,71 +1,136 @@
 import os
+import json
 import shutil
-import tempfile
+import threading
+import time
+
+from polytope_app.journal import file_key, link_or_copy, restore_file, undo_session
 
 __all__ = [
+    'SNAPSHOT_DIR',
+    'take_snapshot',
     'create_backup',
+    'wait_for_snapshot',
     'reset_session',
 ]
 
+DATA_DIR = "Simple_Polytope_Data"
+SNAPSHOT_DIR = os.path.join(DATA_DIR, ".snapshots")
+SNAPSHOT_MANIFEST = "snapshot.json"
+
+# The files next to Edge_Data that a session may modify, besides the edge files themselves.
+SNAPSHOT_FILES = (
+    "simple_polytope_properties.csv",
+    "simple_polytope_properties.npz",
+    "simple_polytope_properties.pending.jsonl",
+    "simple_polytope_manifest.json",
+    "simple_polytope_manifest.pending.jsonl",
+    "polytope_properties.txt",
+)
+
+# Number of session snapshots kept; older ones are deleted when a new one is taken.
+KEEP_SNAPSHOTS = 3
+
 backup_folder = None
+_snapshot_thread = None
 
-def create_backup(console):
+def _tracked_files():
     """
-    Creates backups of files/directories that might be modified during the session.
+    Yields the paths, relative to Simple_Polytope_Data, of the files a session may modify.
     """
-    global backup_folder
-    backup_folder = tempfile.mkdtemp(prefix="polytope_backup_")
-    console.print(f"[blue]Creating backup in {backup_folder}[/blue]")
+    edge_dir = os.path.join(DATA_DIR, "Edge_Data")
+    if os.path.isdir(edge_dir):
+        for entry in os.scandir(edge_dir):
+            if entry.is_file():
+                yield os.path.join("Edge_Data", entry.name)
+    for name in SNAPSHOT_FILES:
+        if os.path.isfile(os.path.join(DATA_DIR, name)):
+            yield name
+
+def _prune_snapshots(keep):
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return
+    names = sorted(os.listdir(SNAPSHOT_DIR))
+    for name in names[:-KEEP_SNAPSHOTS]:
+        path = os.path.join(SNAPSHOT_DIR, name)
+        if os.path.abspath(path) != os.path.abspath(keep):
+            shutil.rmtree(path, ignore_errors=True)
 
-    # Backup the Edge_Data directory.
-    edge_data_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
-    if os.path.isdir(edge_data_dir):
-        backup_edge_dir = os.path.join(backup_folder, "Edge_Data")
-        shutil.copytree(edge_data_dir, backup_edge_dir)
+def take_snapshot(folder):
+    """
+    Snapshots the tracked files into folder by hard-linking them, which takes no time or space for
+    files the session never changes. Every writer of the app either replaces files atomically (see
+    storage.write_text_atomically) or only appends to them (storage.insert_row), so the links keep
+    the contents of the start of the session, up to the recorded size. The size, modification time
+    and inode of every file are recorded in a manifest written last, so an interrupted snapshot has
+    no manifest. Older snapshots beyond the KEEP_SNAPSHOTS most recent are deleted.
+    """
+    os.makedirs(os.path.join(folder, "Edge_Data"), exist_ok=True)
+    files = {}
+    for relative in _tracked_files():
+        source = os.path.join(DATA_DIR, relative)
+        link_or_copy(source, os.path.join(folder, relative))
+        files[relative] = file_key(source)
+    tmp_path = os.path.join(folder, SNAPSHOT_MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"created": time.time(), "files": files}, f)
+    os.replace(tmp_path, os.path.join(folder, SNAPSHOT_MANIFEST))
+    _prune_snapshots(folder)
 
-    # Backup the CSV database file.
-    csv_file = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.csv")
-    if os.path.isfile(csv_file):
-        shutil.copy(csv_file, backup_folder)
+def create_backup(console):
+    """
+    Starts a snapshot of the files that might be modified during the session in
+    Simple_Polytope_Data/.snapshots, in a background thread so the menu is not blocked.
+    """
+    global backup_folder, _snapshot_thread
+    name = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    backup_folder = os.path.join(SNAPSHOT_DIR, name)
+    console.print(f"[blue]Creating backup in {backup_folder}[/blue]")
+    _snapshot_thread = threading.Thread(target=take_snapshot, args=(backup_folder,), name="snapshot")
+    _snapshot_thread.start()
 
-    # Backup the properties file.
-    properties_file = os.path.join("Simple_Polytope_Data", "polytope_properties.txt")
-    if os.path.isfile(properties_file):
-        shutil.copy(properties_file, backup_folder)
+def wait_for_snapshot():
+    """
+    Waits until the snapshot started by create_backup is complete. Call it before modifying the
+    tracked files.
+    """
+    if _snapshot_thread is not None:
+        _snapshot_thread.join()
 
 def reset_session(console):
     """
-    Restores the backed-up files/directories, deleting any changes or new files created.
+    Undoes the operations of the session recorded in the journal, newest first, which only touches
+    the files they wrote. Files changed outside a journaled operation (for example by a git pull)
+    are then restored from the session snapshot: only the files whose size, modification time or
+    inode differ from the snapshot manifest are restored, and files created during the session are
+    removed.
     """
-    global backup_folder
+    undone = undo_session(console)
     if backup_folder is None:
-        console.print("[red]No backup available. Cannot reset session.[/red]")
+        if not undone:
+            console.print("[red]No backup available. Cannot reset session.[/red]")
+        return
+    wait_for_snapshot()
+    manifest_path = os.path.join(backup_folder, SNAPSHOT_MANIFEST)
+    if not os.path.exists(manifest_path):
+        console.print("[red]The session snapshot is incomplete. Cannot reset session.[/red]")
         return
+    with open(manifest_path, "r") as f:
+        recorded = json.load(f)["files"]
 
     console.print("[yellow]Resetting session...[/yellow]")
+    current = {relative: file_key(os.path.join(DATA_DIR, relative)) for relative in _tracked_files()}
+    removed = 0
+    for relative in set(current) - set(recorded):
+        os.remove(os.path.join(DATA_DIR, relative))
+        removed += 1
+    restored = 0
+    for relative, key in recorded.items():
+        if current.get(relative) == key:
+            continue
+        if not restore_file(os.path.join(DATA_DIR, relative), os.path.join(backup_folder, relative), key):
+            console.print(f"[red]{relative} was modified in place, so its snapshot changed too; it was not restored.[/red]")
+            continue
+        restored += 1
 
-    # Restore the Edge_Data directory.
-    edge_data_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
-    backup_edge_dir = os.path.join(backup_folder, "Edge_Data")
-    if os.path.isdir(edge_data_dir):
-        shutil.rmtree(edge_data_dir)
-    if os.path.isdir(backup_edge_dir):
-        shutil.copytree(backup_edge_dir, edge_data_dir)
-
-    # Restore the CSV database file.
-    csv_file = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.csv")
-    backup_csv_file = os.path.join(backup_folder, "simple_polytope_properties.csv")
-    if os.path.isfile(csv_file):
-        os.remove(csv_file)
-    if os.path.isfile(backup_csv_file):
-        shutil.copy(backup_csv_file, csv_file)
-
-    # Restore the properties file.
-    properties_file = os.path.join("Simple_Polytope_Data", "polytope_properties.txt")
-    backup_properties_file = os.path.join(backup_folder, "polytope_properties.txt")
-    if os.path.isfile(properties_file):
-        os.remove(properties_file)
-    if os.path.isfile(backup_properties_file):
-        shutil.copy(backup_properties_file, properties_file)
-
-    console.print("[green]Session has been reset to its original state.[/green]")
+    console.print(f"[green]Session has been reset to its original state ({undone} operations undone, {restored} other files restored, {removed} removed).[/green]")
@@ -0,0 +1,85 @@
+# polytope_app/budget.py
+
+import os
+import signal
+import multiprocessing
+
+__all__ = [
+    'TIMED_OUT',
+    'ISOLATED_COSTS',
+    'is_timed_out',
+    'run_with_budget',
+]
+
+# Cell value recorded when a property did not finish within its time budget.
+# It is distinct from None, which means the property could not be computed.
+TIMED_OUT = "timed out"
+
+# Cost classes whose properties run in an isolated worker when a time budget is set.
+ISOLATED_COSTS = ('exponential', 'unknown')
+
+def is_timed_out(value):
+    return isinstance(value, str) and value == TIMED_OUT
+
+def _mp_context():
+    # Forking lets the worker inherit the property callable and graph context without pickling them.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else None)
+
+def _isolated_worker(compute, context, conn):
+    if hasattr(os, "setpgrp"):
+        # Own process group, so a timeout also kills solver subprocesses (e.g. CBC started by pulp).
+        os.setpgrp()
+    try:
+        known = context.cached_keys() if hasattr(context, "cached_keys") else set()
+        value = compute(context)
+        intermediates = context.export_intermediates(known) if hasattr(context, "export_intermediates") else {}
+        try:
+            conn.send((True, value, intermediates))
+        except Exception:
+            # An intermediate could not be pickled; the value alone is still worth returning.
+            conn.send((True, value, {}))
+    except Exception as e:
+        conn.send((False, repr(e), {}))
+    finally:
+        conn.close()
+
+def _kill(process):
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    process.kill()
+    process.join()
+
+def run_with_budget(compute, context, budget):
+    """
+    Runs compute(context) in a separate worker process and waits at most budget seconds.
+    Returns the computed value, None if the computation raised, or TIMED_OUT if the worker
+    had to be killed because the budget ran out. The intermediates the worker added to a
+    GraphContext are sent back and cached in context, so later properties reuse them.
+
+    The worker is forked, so call this from a process without other threads (such as a pool
+    worker, see parallel_map's use_pool): a forked child can deadlock on a lock held by another
+    thread, for example the console lock of a progress bar.
+    """
+    ctx = _mp_context()
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_isolated_worker, args=(compute, context, sender), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(budget):
+            _kill(process)
+            return TIMED_OUT
+        ok, value, intermediates = receiver.recv()
+    except EOFError:
+        # The worker died without reporting a result.
+        ok, value, intermediates = False, None, {}
+    finally:
+        receiver.close()
+    process.join()
+    if intermediates and hasattr(context, "adopt_intermediates"):
+        context.adopt_intermediates(intermediates)
+    return value if ok else None
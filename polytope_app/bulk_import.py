@@ -0,0 +1,294 @@
+# polytope_app/bulk_import.py
+
+import os
+import sys
+import json
+import tempfile
+from functools import partial
+from itertools import islice
+import networkx as nx
+from rich.prompt import FloatPrompt, IntPrompt, Prompt
+from rich.table import Table
+
+from polytope_app.database import compute_properties, get_property_names, list_edge_files
+from polytope_app.edge_list import parse_edge_list
+from polytope_app.isomorphism import (
+    find_isomorphic,
+    isomorphism_keys,
+    record_isomorphism_entries,
+    update_isomorphism_index,
+)
+from polytope_app.journal import annotate, operation
+from polytope_app.manifest import record_manifest_entries
+from polytope_app.parallel import default_worker_count, parallel_map
+from polytope_app.storage import append_rows, write_text_atomically
+from polytope_app.validation import validate_simple_polytope
+
+__all__ = [
+    'iter_graph_sources',
+    'import_graphs',
+    'bulk_import',
+    'bulk_import_mode',
+]
+
+GRAPH6_SUFFIXES = (".g6", ".s6")
+
+# Number of skipped graphs reported by name.
+REJECTED_EXAMPLES = 10
+
+# ------------------------------
+# Reading
+# ------------------------------
+
+def _read_edge_lines(lines):
+    edges = []
+    for line in lines:
+        parts = line.replace(",", " ").split()
+        if len(parts) != 2:
+            raise ValueError(f"Invalid edge '{line}'.")
+        edges.append((int(parts[0]), int(parts[1])))
+    return edges
+
+def _iter_text_graphs(path):
+    """
+    Yields the graphs of a text file holding several edge lists (standard input for '-'). Graphs
+    are either blocks of 'source target' lines separated by blank lines, or one Python-literal edge
+    list per line. Lines starting with '#' separate graphs as well.
+    """
+    if path == "-":
+        yield from _iter_text_lines(sys.stdin, "stdin")
+        return
+    with open(path, "r") as f:
+        yield from _iter_text_lines(f, os.path.basename(path))
+
+def _iter_text_lines(lines, label):
+    count = 0
+    block = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith(("[", "(")):
+            if block:
+                count += 1
+                yield f"{label}:{count}", block
+                block = []
+            count += 1
+            yield f"{label}:{count}", line
+        elif line and not line.startswith("#"):
+            block.append(line)
+        elif block:
+            count += 1
+            yield f"{label}:{count}", block
+            block = []
+    if block:
+        count += 1
+        yield f"{label}:{count}", block
+
+def _iter_graph6(path):
+    label = os.path.basename(path)
+    with open(path, "rb") as f:
+        for count, line in enumerate((line.strip() for line in f if line.strip()), start=1):
+            yield f"{label}:{count}", line
+
+def iter_graph_sources(path):
+    """
+    Lazily yields (source, data) pairs for every graph found at path, which is either a directory of
+    edge list files (one graph per .txt file) or a single file holding many graphs: graph6/sparse6
+    lines for .g6/.s6 files, otherwise edge lists as read by _iter_text_graphs ('-' reads them
+    from standard input). The data is turned
+    into an edge list by the import workers, so reading never holds more than one graph.
+    """
+    if os.path.isdir(path):
+        for filename in sorted(f for f in os.listdir(path) if f.endswith(".txt")):
+            with open(os.path.join(path, filename), "r") as f:
+                yield filename, [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    elif path.endswith(GRAPH6_SUFFIXES):
+        yield from _iter_graph6(path)
+    else:
+        yield from _iter_text_graphs(path)
+
+def _parse_graph(data):
+    if isinstance(data, bytes):
+        if data.startswith(b">>sparse6<<") or data.startswith(b":"):
+            return nx.from_sparse6_bytes(data)
+        return nx.from_graph6_bytes(data)
+    if isinstance(data, str):
+        edges = parse_edge_list(data)
+    elif data and not isinstance(data[0], str):
+        edges = data  # Already (source, target) pairs.
+    else:
+        edges = _read_edge_lines(data)
+    G = nx.Graph()
+    G.add_edges_from(edges)
+    return G
+
+# ------------------------------
+# Pipeline stages
+# ------------------------------
+
+def _validate_worker(item):
+    """
+    Parses and validates one graph and computes its isomorphism keys. Returns
+    (source, edges, keys, error), where error is None for a valid simple polytope graph.
+    """
+    source, data = item
+    try:
+        G = _parse_graph(data)
+    except Exception as e:
+        return source, None, None, f"unreadable: {e}"
+    try:
+        result = validate_simple_polytope(G)
+    except Exception as e:
+        return source, None, None, f"validation failed: {e}"
+    if not result.valid:
+        return source, None, None, f"not a simple polytope graph ({result.stage}: {result.reason})"
+    return source, [tuple(edge) for edge in G.edges()], isomorphism_keys(G), None
+
+def _properties_worker(edges, budget=None):
+    G = nx.Graph()
+    G.add_edges_from(edges)
+    return compute_properties(G, budget=budget)
+
+def _json_value(value):
+    # Values produced by graphcalc may be NumPy scalars or arrays.
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+def _next_edge_file_number():
+    numbers = [
+        int(f[len("simple_polytope_"):-len(".txt")])
+        for f in list_edge_files()
+        if f.startswith("simple_polytope_") and f[len("simple_polytope_"):-len(".txt")].isdigit()
+    ]
+    return max(numbers) + 1 if numbers else 0
+
+def bulk_import(path, console, workers=None, batch_size=2000, budget=None):
+    """
+    Imports every graph found at path (see iter_graph_sources) into the database with import_graphs.
+    """
+    return import_graphs(iter_graph_sources(path), console, workers=workers, batch_size=batch_size, budget=budget)
+
+def import_graphs(sources, console, workers=None, batch_size=2000, budget=None, title="Bulk import"):
+    """
+    Imports the graphs of an iterable of (source, data) pairs into the database. The data is
+    anything _parse_graph reads: graph6/sparse6 bytes, a literal edge list string, 'source target'
+    lines or (source, target) pairs. The iterable is consumed lazily, one batch at a time.
+
+    The graphs are streamed through the pipeline in batches of batch_size: parse and validate with
+    validate_simple_polytope, drop graphs isomorphic to a stored polytope or to an earlier graph of the
+    import, and compute the properties of the rest in a pool of worker processes. Accepted rows are
+    staged on disk, so memory stays bounded by the batch size. Once every batch is done, the graphs
+    are named in sequence, saved to Edge_Data and appended to the database in one batch write.
+    Returns a dict with the number of graphs read, invalid, duplicate and added.
+    """
+    index = update_isomorphism_index(workers=workers)
+    seen = {}
+    summary = {"read": 0, "invalid": 0, "duplicate": 0, "added": 0}
+    rejected = []
+    sources = iter(sources)
+
+    with tempfile.TemporaryDirectory(prefix="polytope_import_") as staging_dir:
+        staging_path = os.path.join(staging_dir, "rows.jsonl")
+        with open(staging_path, "w") as staging:
+            batch_number = 0
+            while True:
+                batch = list(islice(sources, batch_size))
+                if not batch:
+                    break
+                batch_number += 1
+                summary["read"] += len(batch)
+                checked = parallel_map(
+                    _validate_worker, batch, workers=workers,
+                    description=f"Validating batch {batch_number}...",
+                )
+                accepted = []
+                for source, edges, keys, error in checked:
+                    if error is not None:
+                        summary["invalid"] += 1
+                        if len(rejected) < REJECTED_EXAMPLES:
+                            rejected.append((source, error))
+                        continue
+                    matches = find_isomorphic(None, index, keys) or ([seen[keys]] if keys in seen else [])
+                    if matches:
+                        summary["duplicate"] += 1
+                        if len(rejected) < REJECTED_EXAMPLES:
+                            rejected.append((source, f"isomorphic to {', '.join(matches)}"))
+                        continue
+                    seen[keys] = source
+                    accepted.append((source, edges, keys))
+                if not accepted:
+                    continue
+                rows = parallel_map(
+                    partial(_properties_worker, budget=budget),
+                    [edges for _, edges, _ in accepted],
+                    workers=workers,
+                    description=f"Computing properties for batch {batch_number}...",
+                    use_pool=bool(budget),
+                )
+                for (source, edges, keys), props in zip(accepted, rows):
+                    staging.write(json.dumps({"edges": edges, "keys": keys, "props": props}, default=_json_value) + "\n")
+
+        # Commit: name the graphs, write their edge files and append all rows at once, as one
+        # journal operation that can be undone.
+        with operation("add", source=title, count=0):
+            edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+            first_number = _next_edge_file_number()
+            filenames = []
+            entries = []
+            with open(staging_path, "r") as staging:
+                for offset, line in enumerate(staging):
+                    record = json.loads(line)
+                    filename = f"simple_polytope_{first_number + offset}.txt"
+                    write_text_atomically(
+                        os.path.join(edge_dir, filename), "".join(f"{u} {v}\n" for u, v in record["edges"]),
+                    )
+                    filenames.append(filename)
+                    entries.append((filename, *record["keys"]))
+
+            def staged_rows():
+                with open(staging_path, "r") as staging:
+                    for filename, line in zip(filenames, staging):
+                        props = json.loads(line)["props"]
+                        props["edgelist"] = [tuple(edge) for edge in props["edgelist"]]
+                        props["name"] = filename[:-4]
+                        yield props
+
+            if filenames:
+                summary["added"] = append_rows(staged_rows())
+                annotate(count=summary["added"])
+                record_manifest_entries(filenames, get_property_names())
+                record_isomorphism_entries(entries)
+
+    _print_summary(summary, rejected, filenames, console, title)
+    return summary
+
+def _print_summary(summary, rejected, filenames, console, title):
+    table = Table(title=title)
+    table.add_column("Graphs read", justify="right")
+    table.add_column("Invalid", justify="right")
+    table.add_column("Duplicates", justify="right")
+    table.add_column("Added", justify="right")
+    table.add_row(*(str(summary[key]) for key in ("read", "invalid", "duplicate", "added")))
+    console.print(table)
+    if rejected:
+        console.print(f"[yellow]Skipped {summary['invalid'] + summary['duplicate']} graphs, for example:[/yellow]")
+        for source, reason in rejected:
+            console.print(f"  [yellow]{source}: {reason}[/yellow]")
+    if filenames:
+        console.print(f"[bold green]Added {filenames[0][:-4]} to {filenames[-1][:-4]} to the database.[/bold green]")
+
+def bulk_import_mode(console):
+    """
+    Prompts for a directory of edge list files or a multi-graph file and imports it with bulk_import.
+    """
+    path = Prompt.ask("[bold cyan]Path to a directory of edge lists or a multi-graph file[/bold cyan]").strip()
+    if not os.path.exists(path):
+        console.print(f"[red]Path '{path}' does not exist.[/red]")
+        return
+    workers = IntPrompt.ask(
+        "[bold cyan]Number of worker processes[/bold cyan]",
+        default=default_worker_count(),
+    )
+    budget = FloatPrompt.ask(
+        "[bold cyan]Time budget in seconds for each NP-hard property (0 for no limit)[/bold cyan]",
+        default=0.0,
+    )
+    bulk_import(path, console, workers=workers, budget=budget or None)
@@ -0,0 +1,281 @@
+# polytope_app/cli.py
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from itertools import chain
+from rich.console import Console
+
+__all__ = [
+    'build_parser',
+    'main',
+]
+
+TEST_DIR = os.path.join("Simple_Polytope_Data", "tests")
+
+# Columns left out of query results unless they are asked for by name.
+LARGE_COLUMNS = ('edgelist', 'adjacency_matrix')
+
+# ------------------------------
+# Subcommands
+# ------------------------------
+# Each subcommand returns (status, result), where status is 'ok', 'failed' or 'error' and result is
+# a JSON-serializable value. The library functions report None when they gave up.
+
+def _outcome(result):
+    return ("ok", result) if result is not None else ("error", None)
+
+def _workers(args):
+    from polytope_app.parallel import default_worker_count
+    return args.workers or default_worker_count()
+
+def _recompute(args, console):
+    from polytope_app.database import recompute_csv_database, retry_timed_out_properties
+    if args.mode == "retry":
+        budget = 600.0 if args.budget is None else args.budget
+        return _outcome(retry_timed_out_properties(console, budget=budget, workers=_workers(args)))
+    return _outcome(recompute_csv_database(
+        console, workers=_workers(args), incremental=args.mode == "incremental", profile=args.profile,
+        budget=args.budget or 0.0, assume_yes=True,
+    ))
+
+def _import_sources(sources, args, console, title):
+    from polytope_app.bulk_import import import_graphs
+    return _outcome(import_graphs(
+        sources, console, workers=_workers(args), batch_size=args.batch_size, budget=args.budget or None,
+        title=title,
+    ))
+
+def _add(args, console):
+    from polytope_app.bulk_import import iter_graph_sources
+    if args.edge_lists:
+        sources = ((f"argument {i}", text) for i, text in enumerate(args.edge_lists, start=1))
+    else:
+        sources = iter_graph_sources("-")
+    return _import_sources(sources, args, console, "Add polytopes")
+
+def _import(args, console):
+    from polytope_app.bulk_import import iter_graph_sources
+    sources = chain.from_iterable(iter_graph_sources(path) for path in args.paths)
+    return _import_sources(sources, args, console, "Bulk import")
+
+def _add_property(args, console):
+    from polytope_app.database import register_new_function, update_csv_with_new_function
+    from polytope_app.journal import operation
+    with operation("add-property", property=args.name.strip()):
+        if not register_new_function(args.name.strip(), console):
+            return "error", None
+        rows = update_csv_with_new_function(args.name.strip(), console, profile=args.profile, workers=_workers(args))
+    return _outcome(None if rows is None else {"property": args.name.strip(), "rows": rows})
+
+def _remove_property(args, console):
+    from polytope_app.database import drop_property
+    return _outcome({"property": args.name} if drop_property(args.name, console) else None)
+
+def _query(args, console):
+    from polytope_app.storage import load_database
+    df = load_database()
+    if df is None:
+        console.print("[red]Database not found. Please run a full recompute first.[/red]")
+        return "error", None
+    if args.name:
+        df = df[df['name'].isin(args.name)]
+    if args.where:
+        df = df.query(args.where)
+    if args.columns:
+        columns = [column.strip() for column in args.columns.split(",")]
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            console.print(f"[red]Unknown columns: {', '.join(missing)}[/red]")
+            return "error", None
+    else:
+        columns = [column for column in df.columns if column not in LARGE_COLUMNS]
+    matches = len(df)
+    if args.limit:
+        df = df.head(args.limit)
+    # to_json turns NaN into null and NumPy values into plain JSON.
+    return "ok", {"matches": matches, "rows": json.loads(df[columns].to_json(orient="records"))}
+
+def _undo(args, console):
+    from polytope_app.journal import undo_operation
+    undone = undo_operation(console, args.operation)
+    return _outcome(None if undone is None else undone._asdict())
+
+def _history(args, console):
+    from polytope_app.journal import list_operations
+    return "ok", [operation._asdict() for operation in list_operations(limit=args.limit)]
+
+def _test(args, console):
+    import re
+    command = [sys.executable, "-m", "pytest", "-q", TEST_DIR]
+    if args.k:
+        command += ["-k", args.k]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    lines = completed.stdout.replace("[PROGRESS]", "").splitlines()
+    summary = next((line for line in reversed(lines) if re.search(r"\d+ (passed|failed|error)", line)), "")
+    result = {
+        "returncode": completed.returncode,
+        "counts": {word: int(count) for count, word in re.findall(r"(\d+) (\w+)", summary)},
+        "failures": [line.split(" ", 1)[1] for line in lines if line.startswith(("FAILED ", "ERROR "))],
+    }
+    return ("ok" if completed.returncode == 0 else "failed"), result
+
+def _conjecture(args, console):
+    from polytope_app.conjecture import run_conjecture_searches
+    from polytope_app.knowledge import load_knowledge_graffiti
+    from polytope_app.utils import convert_hypothesis
+    graffiti = load_knowledge_graffiti()
+    if args.target not in graffiti.numerical_columns:
+        console.print(f"[red]'{args.target}' is not a numerical column of the knowledge table.[/red]")
+        return "error", None
+    if args.complexity:
+        graffiti.set_complexity(avoid_columns=[args.target], max_complexity=args.complexity)
+    run_conjecture_searches(graffiti, args.target, args.searches)
+    found = graffiti.conjectures.get(args.target, {})
+    conjectures = {
+        kind: [
+            {
+                "statement": f"For any {convert_hypothesis(conj.hypothesis)}, {conj._set_conclusion()}.",
+                "touch": int(conj.touch),
+            }
+            for conj in found.get(kind, [])[:args.limit]
+        ]
+        for kind in ("equals", "upper", "lower")
+    }
+    return "ok", {"target": args.target, "conjectures": conjectures}
+
+# ------------------------------
+# Parser
+# ------------------------------
+
+def _add_pool_options(parser, budget_help):
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU core)")
+    parser.add_argument("--budget", type=float, default=None, help=budget_help)
+
+def _add_import_options(parser):
+    _add_pool_options(parser, "time budget in seconds for each NP-hard property (default: no limit)")
+    parser.add_argument("--batch-size", type=int, default=2000, help="graphs validated and computed per batch")
+
+def build_parser():
+    """
+    Returns the argument parser of the command-line mode. Every subcommand records the handler that
+    runs it and the modules it needs, which are the only ones imported.
+    """
+    parser = argparse.ArgumentParser(
+        prog="polytope",
+        description="Non-interactive polytope database commands. Results are written to standard output "
+                    "as one JSON object; progress and messages go to standard error.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    recompute = subparsers.add_parser("recompute", help="recompute the database from Edge_Data")
+    recompute.add_argument("--mode", choices=["incremental", "full", "retry"], default="incremental",
+                           help="only changed edge files, every edge file, or only the timed-out cells")
+    recompute.add_argument("--yes", action="store_true", help="confirm a full recompute")
+    recompute.add_argument("--profile", action="store_true", help="record per-property timings")
+    _add_pool_options(recompute, "time budget in seconds for each NP-hard property (default: no limit, 600 for retry)")
+    recompute.set_defaults(handler=_recompute, modules=("polytope_app.database",))
+
+    add = subparsers.add_parser("add", help="add polytopes given as edge lists")
+    add.add_argument("edge_lists", nargs="*", metavar="EDGE_LIST",
+                     help="Python-literal edge list such as '[(0, 1), (0, 2), ...]' (default: read edge lists from standard input)")
+    _add_import_options(add)
+    add.set_defaults(handler=_add, modules=("polytope_app.bulk_import",))
+
+    bulk = subparsers.add_parser("import", help="import directories of edge list files or multi-graph files")
+    bulk.add_argument("paths", nargs="+", metavar="PATH")
+    _add_import_options(bulk)
+    bulk.set_defaults(handler=_import, modules=("polytope_app.bulk_import",))
+
+    add_property = subparsers.add_parser("add-property", help="add a property and compute it for every polytope")
+    add_property.add_argument("name", help="graphcalc or networkx function name")
+    add_property.add_argument("--profile", action="store_true", help="record per-polytope timings")
+    add_property.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU core)")
+    add_property.set_defaults(handler=_add_property, modules=("polytope_app.database",))
+
+    remove_property = subparsers.add_parser("remove-property", help="remove a property and its column")
+    remove_property.add_argument("name")
+    remove_property.set_defaults(handler=_remove_property, modules=("polytope_app.database",))
+
+    query = subparsers.add_parser("query", help="print rows of the database")
+    query.add_argument("--name", action="append", help="polytope name such as simple_polytope_7 (repeatable)")
+    query.add_argument("--where", help="pandas query expression, for example 'order > 20 and girth == 5'")
+    query.add_argument("--columns", help="comma-separated columns (default: all but the edge list and adjacency matrix)")
+    query.add_argument("--limit", type=int, default=None, help="largest number of rows to print")
+    query.set_defaults(handler=_query, modules=("polytope_app.storage",))
+
+    undo = subparsers.add_parser("undo", help="undo an operation recorded in the journal")
+    undo.add_argument("operation", type=int, nargs="?", default=None,
+                      help="sequence number of the operation (default: the last one not undone)")
+    undo.set_defaults(handler=_undo, modules=("polytope_app.journal",))
+
+    history = subparsers.add_parser("history", help="list the operations recorded in the journal")
+    history.add_argument("--limit", type=int, default=20, help="number of operations listed, newest last")
+    history.set_defaults(handler=_history, modules=("polytope_app.journal",))
+
+    test = subparsers.add_parser("test", help="run the test suite")
+    test.add_argument("-k", help="only run tests matching the pytest expression")
+    test.set_defaults(handler=_test, modules=())
+
+    conjecture = subparsers.add_parser("conjecture", help="conjecture bounds on a numerical property")
+    conjecture.add_argument("target", help="numerical column of the knowledge table, for example 'α'")
+    conjecture.add_argument("--searches", type=int, default=1, help="number of search stages")
+    conjecture.add_argument("--complexity", type=int, choices=[1, 2, 3], default=None,
+                            help="precompute derived invariants up to this complexity")
+    conjecture.add_argument("--limit", type=int, default=10, help="conjectures printed per kind")
+    conjecture.set_defaults(handler=_conjecture, modules=("polytope_app.knowledge", "polytope_app.conjecture"))
+    return parser
+
+def _json_value(value):
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+def main(argv=None):
+    """
+    Runs one subcommand and writes {"command", "status", "result", "timings"} as JSON to standard
+    output, with the seconds spent importing what the subcommand needs and running it. Everything
+    else the subcommand prints goes to standard error. Returns the exit code: 0 on success, the
+    pytest exit code for failed tests and 1 on errors.
+    """
+    start = time.perf_counter()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "recompute" and args.mode == "full" and not args.yes:
+        parser.error("a full recompute overwrites the whole database; pass --yes to confirm")
+    if args.command == "import":
+        missing = [path for path in args.paths if path != "-" and not os.path.exists(path)]
+        if missing:
+            parser.error(f"path does not exist: {', '.join(missing)}")
+
+    output = sys.stdout
+    console = Console(stderr=True)
+    report = {"command": args.command}
+    with contextlib.redirect_stdout(sys.stderr):
+        loaded = time.perf_counter()
+        try:
+            for module in args.modules:
+                importlib.import_module(module)
+            loaded = time.perf_counter()
+            status, result = args.handler(args, console)
+        except Exception as e:
+            status, result = "error", None
+            report["error"] = f"{type(e).__name__}: {e}"
+    finished = time.perf_counter()
+
+    report.update(status=status, result=result, timings={
+        "import": round(loaded - start, 4),
+        "run": round(finished - loaded, 4),
+        "total": round(finished - start, 4),
+    })
+    json.dump(report, output, default=_json_value, ensure_ascii=False)
+    output.write("\n")
+    if status == "failed":
+        return result["returncode"]
+    return 0 if status == "ok" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
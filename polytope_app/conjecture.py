@@ -8,9 +8,15 @@ import questionary
 from polytope_app.utils import custom_style, keyword_map, write_on_the_wall
 
 __all__ = [
+    'SEARCH_SCHEDULE',
+    'run_conjecture_searches',
     'conjecture_mode',
 ]
 
+# The (complexity, coefficient bound) pairs of the GraffitiAI runs making up one search stage. The
+# coefficients of each run are bounded by -bound and bound, for the lower and upper bounds alike.
+SEARCH_SCHEDULE = ((1, 3), (1, 2), (1, 1), (2, 3), (2, 2), (2, 1), (3, 3), (3, 2), (3, 1))
+
 
 def probability_distribution(target, df, num_features=4):
     import random
@@ -53,6 +59,31 @@ def probability_distribution(target, df, num_features=4):
         k=num_features,
     )))
 
+def run_conjecture_searches(graffiti, target, num_searches, boolean_properties=None):
+    """
+    Runs num_searches search stages of SEARCH_SCHEDULE conjecturing on the target invariant under the
+    boolean hypotheses (graffiti.boolean_columns by default). Each run draws its other invariants
+    with probability_distribution. The conjectures accumulate in graffiti.conjectures.
+    """
+    if boolean_properties is None:
+        boolean_properties = graffiti.boolean_columns
+    for stage in range(num_searches):
+        print(f"Searching stage {stage + 1} of {num_searches} search processes....")
+        for complexity, bound in SEARCH_SCHEDULE:
+            other_invariants = probability_distribution(target, graffiti.knowledge_table)
+            graffiti.conjecture(
+                target_invariants=[target],
+                hypothesis=boolean_properties,
+                other_invariants=other_invariants,
+                complexity_range=(complexity, complexity),
+                lower_b_max=bound,
+                lower_b_min=-bound,
+                upper_b_max=bound,
+                upper_b_min=-bound,
+                W_lower_bound=None,
+                W_upper_bound=None,
+            )
+
 def conjecture_mode(graffiti, numerical_columns, console):
     """
     Runs the Graffiti AI in conjecture mode, allowing the user to enter a graph
@@ -109,164 +140,7 @@ def conjecture_mode(graffiti, numerical_columns, console):
                 ).ask()
                 num_searches = int(num_searches)
 
-                for _ in range(num_searches):
-                    print(f"Searching stage {_ + 1} of {num_searches} search processes....")
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(1, 1),
-                        lower_b_max=3,
-                        lower_b_min=-3,
-                        upper_b_max=3,
-                        upper_b_min=-3,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(1, 1),
-                        lower_b_max=2,
-                        lower_b_min=-2,
-                        upper_b_max=2,
-                        upper_b_min=-2,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(1, 1),
-                        lower_b_max=1,
-                        lower_b_min=-1,
-                        upper_b_max=1,
-                        upper_b_min=-1,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    # other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    # graffiti.conjecture(
-                    #     target_invariants=target_property,
-                    #     hypothesis=boolean_properties,
-                    #     other_invariants = other_invariants,
-                    #     complexity_range=(1, 1),
-                    #     lower_b_max=None,
-                    #     lower_b_min=None,
-                    #     upper_b_max=None,
-                    #     upper_b_min=None,
-                    #     W_lower_bound=None,
-                    #     W_upper_bound=None,
-                    # )
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(2, 2),
-                        lower_b_max=3,
-                        lower_b_min=-3,
-                        upper_b_max=3,
-                        upper_b_min=-3,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(2, 2),
-                        lower_b_max=2,
-                        lower_b_min=-2,
-                        upper_b_max=2,
-                        upper_b_min=-2,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(2, 2),
-                        lower_b_max=1,
-                        lower_b_min=-1,
-                        upper_b_max=1,
-                        upper_b_min=-1,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    # other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    # graffiti.conjecture(
-                    #     target_invariants=target_property,
-                    #     hypothesis=boolean_properties,
-                    #     other_invariants = other_invariants,
-                    #     complexity_range=(1, 2),
-                    #     lower_b_max=None,
-                    #     lower_b_min=None,
-                    #     upper_b_max=None,
-                    #     upper_b_min=None,
-                    #     W_lower_bound=None,
-                    #     W_upper_bound=None,
-                    # )
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(3, 3),
-                        lower_b_max=3,
-                        lower_b_min=-3,
-                        upper_b_max=3,
-                        upper_b_min=-3,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(3, 3),
-                        lower_b_max=2,
-                        lower_b_min=-2,
-                        upper_b_max=2,
-                        upper_b_min=-2,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    graffiti.conjecture(
-                        target_invariants=target_property,
-                        hypothesis=boolean_properties,
-                        other_invariants = other_invariants,
-                        complexity_range=(3, 3),
-                        lower_b_max=1,
-                        lower_b_min=-1,
-                        upper_b_max=1,
-                        upper_b_min=-1,
-                        W_lower_bound=None,
-                        W_upper_bound=None,
-                    )
-                    # other_invariants = probability_distribution(target_property[0], graffiti.knowledge_table)
-                    # graffiti.conjecture(
-                    #     target_invariants=target_property,
-                    #     hypothesis=boolean_properties,
-                    #     other_invariants = other_invariants,
-                    #     complexity_range=(1, 3),
-                    #     lower_b_max=None,
-                    #     lower_b_min=None,
-                    #     upper_b_max=None,
-                    #     upper_b_min=None,
-                    #     W_lower_bound=None,
-                    #     W_upper_bound=None,
-                    # )
+                run_conjecture_searches(graffiti, target_property[0], num_searches, boolean_properties)
                 console.print("[bold cyan]Conjecture complete![/bold cyan]")
                 # Display the conjecture results using write on the wall with search = True
                 # write_on_the_wall(graffiti, target_invariants=target_property, search=True)
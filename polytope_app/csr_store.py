@@ -0,0 +1,247 @@
+# polytope_app/csr_store.py
+
+import os
+import json
+import hashlib
+import numpy as np
+import networkx as nx
+
+__all__ = [
+    'CSR_STORE_PATH',
+    'CSRStore',
+    'edge_file_number',
+    'edge_data_fingerprint',
+    'build_csr_store',
+    'load_csr_store',
+    'read_polytope_graph',
+]
+
+CSR_STORE_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_csr.bin")
+
+# File layout: an 8-byte magic, a uint64 length and a JSON header giving the Edge_Data fingerprint
+# and the offset, dtype and shape of each array, followed by the arrays (8-byte aligned):
+#   numbers[G]      polytope number of each graph        positions[slots]  graph of polytope N, or -1
+#   node_ptr[G+1]   rows of graph g in indptr/labels     labels[V]         node label of each row
+#   indptr[V+1]     CSR offsets into indices             indices[2E]       neighbors, as local rows
+#   edge_ptr[G+1]   edges of graph g in edges            edges[E, 2]       edge file order, as labels
+#   stamps[G, 2]    size and modification time (ns) of the edge file of graph g when it was read
+MAGIC = b"PLYCSR02"
+
+def _edge_dir():
+    return os.path.join("Simple_Polytope_Data", "Edge_Data")
+
+def edge_file_number(filename):
+    """
+    Returns the numerical tag N of a simple_polytope_N.txt file name, or None if it has none.
+    """
+    num_str = filename[len("simple_polytope_"):-len(".txt")]
+    if filename.startswith("simple_polytope_") and num_str.isdigit():
+        return int(num_str)
+    return None
+
+def edge_data_fingerprint(edge_dir=None):
+    """
+    Returns a digest of the names, sizes and modification times of the edge list files in Edge_Data.
+    It changes whenever a file is added, removed or rewritten, without reading any file.
+    """
+    edge_dir = edge_dir or _edge_dir()
+    entries = sorted(
+        (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+        for entry in os.scandir(edge_dir)
+        if entry.name.endswith(".txt")
+    )
+    return hashlib.sha256(json.dumps(entries).encode()).hexdigest()
+
+class CSRStore:
+    """
+    Read access to the memory-mapped CSR store. Neighbor lists and edge lists are returned as
+    zero-copy views of the mapped file, and polytope N is found in O(1) through the position index.
+    """
+
+    def __init__(self, path=CSR_STORE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(8) != MAGIC:
+                raise ValueError(f"{path} is not a polytope CSR store.")
+            length = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+            header = json.loads(f.read(length))
+        self.fingerprint = header["fingerprint"]
+        for name, (offset, dtype, shape) in header["arrays"].items():
+            if int(np.prod(shape)) == 0:
+                array = np.zeros(shape, dtype=dtype)
+            else:
+                array = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape))
+            setattr(self, name, array)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __contains__(self, number):
+        return 0 <= number < len(self.positions) and self.positions[number] >= 0
+
+    def _position(self, number):
+        if number not in self:
+            raise KeyError(f"simple_polytope_{number} is not in the CSR store.")
+        return int(self.positions[number])
+
+    def csr(self, number):
+        """
+        Returns (indptr, indices, labels) for polytope number: the neighbors of local node i are
+        indices[indptr[i]:indptr[i + 1]] and labels maps local nodes to their labels in the edge file.
+        indices and labels are views of the mapped file; indptr is rebased to start at 0.
+        """
+        g = self._position(number)
+        first, last = self.node_ptr[g], self.node_ptr[g + 1]
+        indptr = self.indptr[first:last + 1]
+        return indptr - indptr[0], self.indices[indptr[0]:indptr[-1]], self.labels[first:last]
+
+    def adjacency(self, number):
+        """
+        Returns the adjacency matrix of polytope number as a SciPy CSR matrix over the local nodes.
+        """
+        from scipy.sparse import csr_matrix
+
+        indptr, indices, labels = self.csr(number)
+        data = np.ones(len(indices), dtype=np.int8)
+        return csr_matrix((data, indices, indptr), shape=(len(labels), len(labels)))
+
+    def edges(self, number):
+        """
+        Returns the edges of polytope number as an (E, 2) view, in the order of its edge file.
+        """
+        g = self._position(number)
+        return self.edges_all[self.edge_ptr[g]:self.edge_ptr[g + 1]]
+
+    def graph(self, number):
+        """
+        Returns polytope number as a networkx graph, identical to the one nx.read_edgelist builds
+        from its edge file (same nodes, edges and edge order).
+        """
+        G = nx.Graph()
+        G.add_edges_from(self.edges(number).tolist())
+        return G
+
+    def __iter__(self):
+        for number in self.numbers:
+            yield int(number)
+
+    def is_current(self, number, path):
+        """
+        Returns True if polytope number is in the store and its edge file at path still has the size
+        and modification time it had when the store was built. Costs a single stat call.
+        """
+        if number not in self:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        size, mtime_ns = self.stamps[self._position(number)]
+        return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+def build_csr_store(path=CSR_STORE_PATH, edge_dir=None):
+    """
+    Reads every simple_polytope_N.txt file of Edge_Data once and writes the CSR store, replacing
+    it atomically. Returns the opened store.
+    """
+    edge_dir = edge_dir or _edge_dir()
+    fingerprint = edge_data_fingerprint(edge_dir)
+    filenames = sorted(
+        (number, f) for f in os.listdir(edge_dir)
+        if f.endswith(".txt") and (number := edge_file_number(f)) is not None
+    )
+    numbers, labels, indptr, indices, edges, stamps = [], [], [0], [], [], []
+    node_ptr, edge_ptr = [0], [0]
+    for number, filename in filenames:
+        file_path = os.path.join(edge_dir, filename)
+        stat = os.stat(file_path)
+        file_edges = np.loadtxt(file_path, dtype=np.int64, ndmin=2).reshape(-1, 2)
+        nodes, local = np.unique(file_edges, return_inverse=True)
+        local = local.reshape(-1, 2)
+        # Both directions of every edge, grouped by source row.
+        sources = np.concatenate([local[:, 0], local[:, 1]])
+        targets = np.concatenate([local[:, 1], local[:, 0]])
+        order = np.lexsort((targets, sources))
+        counts = np.bincount(sources, minlength=len(nodes))
+        numbers.append(number)
+        stamps.append((stat.st_size, stat.st_mtime_ns))
+        labels.append(nodes)
+        indptr.extend((indptr[-1] + np.cumsum(counts)).tolist())
+        indices.append(targets[order])
+        edges.append(file_edges)
+        node_ptr.append(node_ptr[-1] + len(nodes))
+        edge_ptr.append(edge_ptr[-1] + len(file_edges))
+
+    slots = max(numbers) + 1 if numbers else 0
+    positions = np.full(slots, -1, dtype=np.int64)
+    positions[numbers] = np.arange(len(numbers))
+    arrays = {
+        "numbers": np.asarray(numbers, dtype=np.int64),
+        "positions": positions,
+        "node_ptr": np.asarray(node_ptr, dtype=np.int64),
+        "labels": np.concatenate(labels) if labels else np.zeros(0, dtype=np.int64),
+        "indptr": np.asarray(indptr, dtype=np.int64),
+        "indices": np.concatenate(indices).astype(np.int32) if indices else np.zeros(0, dtype=np.int32),
+        "edge_ptr": np.asarray(edge_ptr, dtype=np.int64),
+        "edges_all": np.concatenate(edges) if edges else np.zeros((0, 2), dtype=np.int64),
+        "stamps": np.asarray(stamps, dtype=np.int64).reshape(-1, 2),
+    }
+
+    # The header is sized first with placeholder offsets, then the arrays are laid out after it.
+    layout = {name: [0, array.dtype.str, list(array.shape)] for name, array in arrays.items()}
+    header_length = len(json.dumps({"fingerprint": fingerprint, "arrays": layout}))
+    offset = 16 + header_length + 16 * len(arrays)
+    offset += -offset % 8
+    for name, array in arrays.items():
+        layout[name][0] = offset
+        offset += array.nbytes
+        offset += -offset % 8
+    header = json.dumps({"fingerprint": fingerprint, "arrays": layout}).encode()
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).astype("<u8").tobytes())
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (layout[name][0] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, path)
+    return CSRStore(path)
+
+_store = None
+
+def load_csr_store(path=CSR_STORE_PATH, edge_dir=None):
+    """
+    Returns the CSR store, rebuilding it first if it is missing or Edge_Data changed since it was built.
+    The opened store is kept for later calls in the same process. This scans Edge_Data, so call it
+    once per operation; read_polytope_graph reuses the kept store and only checks the file it reads.
+    """
+    global _store
+    fingerprint = edge_data_fingerprint(edge_dir)
+    if _store is not None and _store.path == path and _store.fingerprint == fingerprint:
+        return _store
+    store = None
+    if os.path.exists(path):
+        try:
+            store = CSRStore(path)
+        except (OSError, ValueError):
+            store = None
+    if store is None or store.fingerprint != fingerprint:
+        store = build_csr_store(path, edge_dir)
+    _store = store
+    return store
+
+def read_polytope_graph(filename):
+    """
+    Returns the graph stored in Edge_Data as filename, taken from the CSR store kept by
+    load_csr_store (which is loaded first if this process has none) when the file has a numerical
+    tag and is unchanged since the store was built, and read with nx.read_edgelist otherwise.
+    """
+    path = os.path.join(_edge_dir(), filename)
+    number = edge_file_number(filename)
+    if number is not None:
+        store = _store if _store is not None else load_csr_store()
+        if store.is_current(number, path):
+            return store.graph(number)
+    return nx.read_edgelist(path, nodetype=int)
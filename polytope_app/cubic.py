@@ -0,0 +1,286 @@
+# polytope_app/cubic.py
+
+from collections import namedtuple
+from networkx.utils import reverse_cuthill_mckee_ordering
+
+__all__ = [
+    'MAX_FRONTIER_STATES',
+    'MAX_FRONTIER_WIDTH',
+    'FrontierOrder',
+    'is_cubic',
+    'frontier_order',
+    'cubic_independence_number',
+    'cubic_vertex_cover_number',
+    'cubic_domination_number',
+    'cubic_total_domination_number',
+]
+
+# The exact solvers give up (returning None) once more partial solutions than this are alive at
+# one step, so graphs with a wide frontier fall back to the integer programs of graphcalc.
+MAX_FRONTIER_STATES = 200_000
+
+# Widest vertex order for which GraphContext uses each solver; wider graphs go straight to the
+# integer programs of graphcalc, which benchmarks/bench_cubic.py shows to be faster there.
+MAX_FRONTIER_WIDTH = {
+    'independence_number': 16,
+    'domination_number': 10,
+    'total_domination_number': 7,
+}
+
+# Number of starting points tried when ordering the vertices.
+ORDER_STARTS = 4
+
+# The vertices of a graph numbered along a narrow frontier order: neighbors[i] is the bitset of the
+# neighbors of vertex i, and width is the largest number of decided vertices with undecided neighbors.
+FrontierOrder = namedtuple('FrontierOrder', ['neighbors', 'width'])
+
+def _popcount(bits):
+    # int.bit_count needs Python 3.10.
+    return bin(bits).count("1")
+
+def is_cubic(graph):
+    """
+    Returns True if every vertex of the (non-empty) graph has degree 3.
+    """
+    return graph.number_of_nodes() > 0 and all(degree == 3 for _, degree in graph.degree())
+
+def _frontier_order(adjacency, start):
+    """
+    Orders the vertices greedily from start so that few decided vertices have undecided
+    neighbors: each step decides the candidate that shrinks (or least grows) that frontier.
+    Returns (order, width), where width is the largest frontier met.
+    """
+    n = len(adjacency)
+    remaining = [len(neighbors) for neighbors in adjacency]
+    decided = [False] * n
+    order = []
+    frontier = set()
+    candidates = {start}
+    width = 0
+    while len(order) < n:
+        if not candidates:
+            candidates = {next(v for v in range(n) if not decided[v])}
+        v = min(candidates, key=lambda v: (
+            (remaining[v] > 0) - sum(1 for u in adjacency[v] if u in frontier and remaining[u] == 1),
+            -sum(decided[u] for u in adjacency[v]),
+            v,
+        ))
+        order.append(v)
+        decided[v] = True
+        candidates.discard(v)
+        for u in adjacency[v]:
+            remaining[u] -= 1
+            if remaining[u] == 0:
+                frontier.discard(u)
+            if not decided[u]:
+                candidates.add(u)
+        if remaining[v] > 0:
+            frontier.add(v)
+        width = max(width, len(frontier))
+    return order, width
+
+def frontier_order(graph):
+    """
+    Numbers the vertices along a narrow frontier order, the best of a few starting points spread
+    over a reverse Cuthill-McKee order, and returns it as a FrontierOrder of integer bitsets.
+    """
+    labels = list(graph.nodes())
+    index = {v: i for i, v in enumerate(labels)}
+    adjacency = [[index[u] for u in graph[v]] for v in labels]
+    spread = [index[v] for v in reverse_cuthill_mckee_ordering(graph)]
+    starts = spread[::max(1, -(-len(spread) // ORDER_STARTS))]
+    order, width = min((_frontier_order(adjacency, start) for start in starts), key=lambda result: result[1])
+    position = {v: i for i, v in enumerate(order)}
+    neighbors = [0] * len(order)
+    for v, adjacent in enumerate(adjacency):
+        for u in adjacent:
+            neighbors[position[v]] |= 1 << position[u]
+    return FrontierOrder(neighbors, width)
+
+def _face_independence_bound(p_vector):
+    # Every vertex of a simple polytope lies on exactly three faces, and a k-gon holds at most
+    # floor(k / 2) vertices of an independent set.
+    return sum(count * ((k + 3) // 2) for k, count in enumerate(p_vector)) // 3
+
+# ------------------------------
+# Independence number
+# ------------------------------
+
+def _suffix_matching_bounds(neighbors):
+    """
+    Returns bounds[i] >= the independence number of the subgraph induced by vertices i, i + 1, ...:
+    the number of those vertices minus the edges of a greedy matching lying inside them, since
+    an independent set holds at most one end of every matched edge.
+    """
+    n = len(neighbors)
+    matched = 0
+    pairs = 0
+    bounds = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        if not matched >> i & 1:
+            free = neighbors[i] >> (i + 1) << (i + 1) & ~matched
+            if free:
+                matched |= 1 << i | free & -free
+                pairs += 1
+        bounds[i] = n - i - pairs
+    return bounds
+
+def _greedy_independent_set_size(neighbors):
+    blocked = 0
+    size = 0
+    for i, adjacent in enumerate(neighbors):
+        if not blocked >> i & 1:
+            blocked |= adjacent
+            size += 1
+    return size
+
+def cubic_independence_number(graph, p_vector=None, order=None, max_states=None):
+    """
+    Exact independence number of a cubic graph by bitset branch-and-bound.
+
+    The vertices are decided one at a time along a frontier_order. A partial solution is
+    the bitset of later vertices blocked by the chosen ones, and partial solutions with the same
+    bitset are merged keeping the largest. The branching rules of degree-3 search apply to the
+    remaining graph: a vertex with at most one free neighbor, or two adjacent free neighbors, is
+    always taken. Partial solutions that cannot beat a greedy independent set under the matching
+    bound of the remaining vertices are pruned, and the search is skipped when the greedy set
+    already meets the matching bound (or, given the p-vector, the face bound).
+    The p-vector may only be given for simple polytope graphs, and a precomputed frontier_order
+    may be passed as order. Returns None if the search exceeds max_states partial solutions.
+    """
+    max_states = MAX_FRONTIER_STATES if max_states is None else max_states
+    neighbors = (order or frontier_order(graph)).neighbors
+    n = len(neighbors)
+    bounds = _suffix_matching_bounds(neighbors)
+    best = _greedy_independent_set_size(neighbors)
+    upper = bounds[0] if n else 0
+    if p_vector is not None:
+        upper = min(upper, _face_independence_bound(p_vector))
+    if best >= upper:
+        return best
+
+    states = {0: 0}
+    for i in range(n):
+        bit = 1 << i
+        later = neighbors[i] >> (i + 1) << (i + 1)
+        suffix = ((1 << n) - 1) >> (i + 1) << (i + 1)
+        next_states = {}
+
+        def keep(blocked, count):
+            if count + min(bounds[i + 1], _popcount(suffix & ~blocked)) < best:
+                return
+            if next_states.get(blocked, -1) < count:
+                next_states[blocked] = count
+
+        for blocked, count in states.items():
+            rest = blocked & ~bit
+            if blocked & bit:
+                keep(rest, count)
+                continue
+            free = later & ~blocked
+            keep(rest | free, count + 1)
+            degree = _popcount(free)
+            if degree >= 3 or (degree == 2 and not neighbors[free.bit_length() - 1] & free):
+                keep(rest, count)
+        if len(next_states) > max_states:
+            return None
+        states = next_states
+    return max(states.values(), default=best)
+
+def cubic_vertex_cover_number(graph, p_vector=None, order=None, max_states=None):
+    """
+    Exact vertex cover number of a cubic graph, the complement of its independence number.
+    Returns None if cubic_independence_number gives up.
+    """
+    alpha = cubic_independence_number(graph, p_vector, order, max_states)
+    return None if alpha is None else graph.number_of_nodes() - alpha
+
+# ------------------------------
+# Domination numbers
+# ------------------------------
+
+def _bounded_cover_search(covers, due, reach, target, max_states):
+    """
+    Decides the vertices one at a time, keeping for every bitset of covered vertices that still
+    matter the fewest vertices taken. A vertex is checked as soon as every vertex that could cover
+    it has been decided, a vertex that covers nothing new is never taken, and partial solutions
+    whose uncovered vertices need more than target vertices in all (each covering at most reach)
+    are pruned. Returns the minimum if it is at most target, target + 1 if it is larger, or None
+    if more than max_states partial solutions are alive at one step.
+    """
+    n = len(covers)
+    pending = (1 << n) - 1
+    states = {0: 0}
+    for i in range(n):
+        pending &= ~due[i]
+        next_states = {}
+
+        def keep(covered, count):
+            if covered & due[i] != due[i]:
+                return
+            covered &= pending
+            if count + -(-_popcount(pending & ~covered) // reach) > target:
+                return
+            if next_states.get(covered, n + 1) > count:
+                next_states[covered] = count
+
+        for covered, count in states.items():
+            keep(covered, count)
+            if covers[i] & ~covered & (pending | due[i]):
+                keep(covered | covers[i], count + 1)
+        if not next_states:
+            return target + 1
+        if len(next_states) > max_states:
+            return None
+        states = next_states
+    return min(states.values())
+
+def _domination_search(neighbors, closed, max_states):
+    """
+    Minimum number of vertices whose (closed or open) neighborhoods cover every vertex, or None if
+    the search gives up. Searches with a growing target, from the counting bound (every vertex
+    covers at most max degree + closed vertices) up to a greedy solution: a low target prunes
+    almost every partial solution, so the failed searches below the optimum are cheap.
+    """
+    n = len(neighbors)
+    covers = [adjacent | (1 << i if closed else 0) for i, adjacent in enumerate(neighbors)]
+    if any(cover == 0 for cover in covers):
+        return None
+    reach = max(_popcount(cover) for cover in covers)
+
+    # due[i]: vertices whose last possible coverer is vertex i.
+    due = [0] * n
+    for u, cover in enumerate(covers):
+        due[cover.bit_length() - 1] |= 1 << u
+
+    # Greedy solution: take vertex i whenever a vertex due at i is still uncovered.
+    covered = 0
+    best = 0
+    for i in range(n):
+        if due[i] & ~covered:
+            covered |= covers[i]
+            best += 1
+
+    for target in range(-(-n // reach), best):
+        value = _bounded_cover_search(covers, due, reach, target, max_states)
+        if value is None or value <= target:
+            return value
+    return best
+
+def cubic_domination_number(graph, order=None, max_states=None):
+    """
+    Exact domination number of a cubic graph by bitset branch-and-bound, pruned with the bound
+    that every vertex dominates at most four. Returns None if the search exceeds max_states
+    partial solutions.
+    """
+    max_states = MAX_FRONTIER_STATES if max_states is None else max_states
+    return _domination_search((order or frontier_order(graph)).neighbors, True, max_states)
+
+def cubic_total_domination_number(graph, order=None, max_states=None):
+    """
+    Exact total domination number of a cubic graph by bitset branch-and-bound, pruned with the
+    bound that every vertex totally dominates at most three. Returns None if the search exceeds
+    max_states partial solutions or the graph has an isolated vertex.
+    """
+    max_states = MAX_FRONTIER_STATES if max_states is None else max_states
+    return _domination_search((order or frontier_order(graph)).neighbors, False, max_states)
@@ -3,27 +3,56 @@
 import os
 import ast
 import re
+from functools import partial
+import numpy as np
 import pandas as pd
 import networkx as nx
-from rich.prompt import Prompt
+from rich.console import Console
+from rich.prompt import FloatPrompt, IntPrompt, Prompt
 from rich.panel import Panel
 from rich.progress import Progress
-from rich.progress import track
 import subprocess
-import graphcalc as gc
+from polytope_app.budget import is_timed_out
+from polytope_app.csr_store import edge_file_number, load_csr_store, read_polytope_graph
+from polytope_app.invariants import GraphContext
+from polytope_app.journal import annotate, operation
+from polytope_app.manifest import (
+    edge_file_hash,
+    is_entry_current,
+    load_manifest,
+    manifest_entry,
+    refresh_manifest_properties,
+    save_manifest,
+)
+from polytope_app.parallel import default_worker_count, parallel_map
+from polytope_app.profiling import measure_property, print_profile_summary, write_measurements
+from polytope_app.registry import evaluate_property, get_property_registry, resolve_property
+from polytope_app.spectral import BATCHED_SPECTRAL_PROPERTIES, fill_spectral_columns
+from polytope_app.storage import (
+    CSV_PATH,
+    database_exists,
+    load_database,
+    load_list_column,
+    save_database,
+    write_text_atomically,
+)
 # from polytope_app import utils
 
 __all__ = [
     'get_property_names',
+    'list_edge_files',
     'compute_properties',
     'compute_properties_from_edge_file',
     'recompute_csv_database',
     'compute_new_property_from_csv_row',
+    'retry_timed_out_properties',
     'update_csv_with_new_function',
     'append_new_function_to_properties_file',
+    'register_new_function',
     'add_new_function',
     'display_properties_of_entry',
     'remove_property',
+    'drop_property',
     'run_pytests',
 ]
 
@@ -33,152 +62,429 @@ def get_property_names():
         properties = [line.strip() for line in f if line.strip()]
     return properties
 
-def compute_properties(graph):
-    property_names = get_property_names()
-    props = {"edgelist": list(graph.edges()), "adjacency_matrix": gc.adjacency_matrix(graph).tolist()}
-    for prop in property_names:
-        try:
-            result = getattr(gc, prop)(graph)
-        except Exception:
-            try:
-                result = getattr(nx, prop)(graph)
-            except Exception:
-                result = None
-        props[prop] = result
+def edge_file_sort_key(filename):
+    """
+    Sort key placing simple_polytope_N.txt files in order of their numerical tag N.
+    Files without a numerical tag are placed last, in name order.
+    """
+    number = edge_file_number(filename)
+    if number is not None:
+        return (0, number, filename)
+    return (1, 0, filename)
+
+def list_edge_files(edge_dir=None):
+    """
+    Returns the names of all .txt edge list files in Edge_Data (or in edge_dir), sorted by numerical tag.
+    """
+    if edge_dir is None:
+        edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    files = [f for f in os.listdir(edge_dir) if f.endswith(".txt")]
+    return sorted(files, key=edge_file_sort_key)
+
+def compute_properties(graph, context=None, measurements=None, track_memory=False, budget=None, skip=()):
+    """
+    Computes every property listed in polytope_properties.txt for the given graph.
+    Each property is dispatched through the property registry, which resolves names once.
+    Properties that share expensive intermediates (spectra, distances, the planar embedding, faces)
+    are evaluated through a GraphContext so each intermediate is computed once per graph.
+    Pass a context to inspect its profile afterwards. If a measurements list is given, a timing
+    record (and optionally peak memory) is appended to it for every property.
+    With a time budget in seconds, NP-hard properties run in isolated workers and are recorded
+    as TIMED_OUT when they exceed it. Properties named in skip are left as None, to be filled in
+    later (for example by the batched spectral engine).
+    """
+    registry = get_property_registry(get_property_names())
+    if context is None:
+        context = GraphContext(graph)
+    props = {"edgelist": list(graph.edges()), "adjacency_matrix": context.adjacency_matrix.tolist()}
+    for prop, spec in registry.items():
+        if prop in skip:
+            props[prop] = None
+        elif measurements is None:
+            props[prop] = evaluate_property(spec, context, budget)
+        else:
+            props[prop], record = measure_property(spec, context, track_memory, budget)
+            measurements.append(record)
     return props
 
-def compute_properties_from_edge_file(name, console):
-    file_path = os.path.join("Simple_Polytope_Data", "Edge_Data", name)
+def compute_properties_from_edge_file(name, console, measurements=None, track_memory=False, budget=None, skip=()):
     try:
-        G = nx.read_edgelist(file_path, nodetype=int)
+        G = read_polytope_graph(name)
     except Exception as e:
-        console.print(f"[red]Error reading {file_path}: {e}[/red]")
+        console.print(f"[red]Error reading {os.path.join('Simple_Polytope_Data', 'Edge_Data', name)}: {e}[/red]")
         return {}
     if G.number_of_nodes() == 0:
         return {}
-    props = compute_properties(G)
+    graph_measurements = [] if measurements is not None else None
+    props = compute_properties(G, measurements=graph_measurements, track_memory=track_memory, budget=budget, skip=skip)
     props['name'] = name[:-4]  # Remove the .txt extension.
+    if measurements is not None:
+        for record in graph_measurements:
+            record.update(name=props['name'], order=G.number_of_nodes())
+        measurements.extend(graph_measurements)
     return props
 
+_worker_console = None
 
-def recompute_csv_database(console):
+def _compute_properties_worker(name, profile=False, track_memory=False, budget=None, skip=()):
     """
-    Recomputes the entire CSV database from all edge list files.
+    Worker entry point for the process pool used by recompute_csv_database.
+    Each worker process prints its own errors since the caller's console cannot be shared.
+    When profiling, returns the row together with its per-property measurements.
     """
-    confirm = Prompt.ask(
-        "[bold yellow]WARNING: This will recompute the entire CSV database and overwrite any existing file. Proceed? (y/n)[/bold yellow]",
-        choices=["y", "n"],
-        default="n",
-    )
-    if confirm != 'y':
-        console.print("[red]Operation cancelled.[/red]")
-        return
+    global _worker_console
+    if _worker_console is None:
+        _worker_console = Console()
+    if not profile:
+        return compute_properties_from_edge_file(name, _worker_console, budget=budget, skip=skip)
+    measurements = []
+    props = compute_properties_from_edge_file(name, _worker_console, measurements, track_memory, budget, skip)
+    return props, measurements
+
+def recompute_csv_database(console, workers=None, incremental=None, profile=None, track_memory=False, budget=None, assume_yes=False):
+    """
+    Recomputes the database from the edge list files and saves it in the binary format,
+    exporting simple_polytope_properties.csv alongside.
+
+    A full recompute processes every edge file. An incremental recompute uses the manifest stored next
+    to the CSV to recompute only the rows whose edge file, property list or graphcalc version changed,
+    reusing every other row unchanged. The edge files are spread across a pool of worker processes
+    (one per CPU core unless workers is given) and the records are written in order of their numerical tag.
+    With profile set, per-property timings are recorded, summarized and written to the profiles folder.
+    With a time budget in seconds (0 for none), NP-hard properties that exceed it are recorded as
+    TIMED_OUT; choosing the 'retry' mode recomputes only those cells with a larger budget.
+    Options left as None are prompted for, and assume_yes skips the confirmation of a full recompute.
+    Returns a dict with the number of records, recomputed rows and timed-out cells, or None if
+    nothing was saved.
+    """
+    if incremental is None:
+        mode = Prompt.ask(
+            "[bold cyan]Recompute mode: only changed edge files, the entire database, or retry timed-out cells?[/bold cyan]",
+            choices=["incremental", "full", "retry"],
+            default="incremental",
+        )
+        if mode == "retry":
+            return retry_timed_out_properties(console, budget=budget, workers=workers)
+        incremental = mode == "incremental"
+    if incremental and not database_exists():
+        console.print("[yellow]Database not found. Falling back to a full recompute.[/yellow]")
+        incremental = False
+    if not incremental and not assume_yes:
+        confirm = Prompt.ask(
+            "[bold yellow]WARNING: This will recompute the entire CSV database and overwrite any existing file. Proceed? (y/n)[/bold yellow]",
+            choices=["y", "n"],
+            default="n",
+        )
+        if confirm != 'y':
+            console.print("[red]Operation cancelled.[/red]")
+            return
+
     property_names = get_property_names()
-    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
-    files = [f for f in os.listdir(edge_dir) if f.endswith(".txt")]
-    all_data = []
-    for filename in track(files, description="Processing edge files..."):
-        props = compute_properties_from_edge_file(filename, property_names)
-        all_data.append(props)
+    files = list_edge_files()
+    hashes = {filename: edge_file_hash(filename) for filename in files}
+    manifest = load_manifest()
+
+    existing_rows = {}
+    if incremental:
+        try:
+            existing_df = load_database()
+            existing_rows = {row['name']: row for row in existing_df.to_dict('records')}
+        except Exception as e:
+            console.print(f"[red]Error reading database: {e}[/red]")
+            return
+    stale = [
+        f for f in files
+        if not (f[:-4] in existing_rows and is_entry_current(manifest, f, hashes[f], property_names))
+    ]
+    if incremental:
+        removed = len(set(existing_rows) - {f[:-4] for f in files})
+        console.print(f"[cyan]{len(stale)} of {len(files)} rows need recomputing; {removed} rows have no edge file.[/cyan]")
+        if not stale and not removed:
+            console.print("[bold green]Database is already up to date.[/bold green]")
+            timed_out = int(existing_df.map(is_timed_out).to_numpy().sum())
+            return {"records": len(existing_rows), "recomputed": 0, "timed_out": timed_out}
+
+    if stale and workers is None:
+        workers = IntPrompt.ask(
+            "[bold cyan]Number of worker processes[/bold cyan]",
+            default=default_worker_count(),
+        )
+    if stale and budget is None:
+        budget = FloatPrompt.ask(
+            "[bold cyan]Time budget in seconds for each NP-hard property (0 for no limit)[/bold cyan]",
+            default=0.0,
+        )
+    if stale and profile is None:
+        profile = Prompt.ask(
+            "[bold cyan]Record per-property timings? (y/n)[/bold cyan]",
+            choices=["y", "n"],
+            default="n",
+        ) == "y"
+    if stale:
+        # Build or refresh the CSR store once here, so the workers only read it.
+        load_csr_store()
+    # Spectral properties are left to one batched eigensolve per graph order after the pool is done.
+    spectral = [prop for prop in property_names if prop in BATCHED_SPECTRAL_PROPERTIES]
+    computed = parallel_map(
+        partial(
+            _compute_properties_worker,
+            profile=bool(profile), track_memory=track_memory, budget=budget or None, skip=tuple(spectral),
+        ),
+        stale,
+        workers=workers,
+        description="Processing edge files...",
+        use_pool=bool(budget),
+    )
+    measurements = None
+    if profile:
+        measurements = [record for _, records in computed for record in records]
+        computed = [props for props, _ in computed]
+    fill_spectral_columns(computed, spectral, measurements)
+    computed_rows = dict(zip(stale, computed))
+    all_data = [computed_rows[f] if f in computed_rows else existing_rows[f[:-4]] for f in files]
+
     df = pd.DataFrame(all_data)
-    output_csv = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.csv")
-    df.to_csv(output_csv, index=False)
-    console.print(f"\n[bold green]CSV file '{output_csv}' saved with {len(df)} records.[/bold green]")
+    with operation("recompute", mode="incremental" if incremental else "full"):
+        save_database(df)
+        manifest["files"] = {f: manifest_entry(f, property_names, hashes[f]) for f in files}
+        save_manifest(manifest)
+    console.print(f"\n[bold green]Database saved and exported to '{CSV_PATH}' with {len(df)} records ({len(stale)} recomputed).[/bold green]")
+    if profile:
+        print_profile_summary(measurements, console)
+        console.print(f"[cyan]Raw measurements written to {write_measurements(measurements, 'recompute')}[/cyan]")
+    timed_out = int(df.map(is_timed_out).to_numpy().sum())
+    if timed_out:
+        console.print(f"[yellow]{timed_out} cells timed out. Use the 'retry' mode with a larger budget to fill them in.[/yellow]")
+    return {"records": len(df), "recomputed": len(stale), "timed_out": timed_out}
+
+def _retry_properties_worker(item, budget=None):
+    """
+    Worker entry point for retry_timed_out_properties: recomputes the listed properties of one polytope.
+    """
+    edges, property_names = item
+    G = nx.Graph()
+    G.add_edges_from(edges)
+    context = GraphContext(G)
+    return [evaluate_property(resolve_property(prop), context, budget) for prop in property_names]
+
+def retry_timed_out_properties(console, budget=None, workers=None):
+    """
+    Recomputes only the cells of the database recorded as TIMED_OUT, using a (larger) time budget,
+    and leaves every other cell unchanged. Returns a dict with the number of cells retried and of
+    cells still timed out, or None if the database is missing.
+    """
+    if not database_exists():
+        console.print("[red]Database not found. Please run a full recompute first.[/red]")
+        return
+    df = load_database()
+    property_names = [prop for prop in get_property_names() if prop in df.columns]
+    timed_out = df[property_names].map(is_timed_out)
+    rows = [index for index in df.index if timed_out.loc[index].any()]
+    if not rows:
+        console.print("[bold green]No timed-out cells to retry.[/bold green]")
+        return {"retried": 0, "timed_out": 0}
+    console.print(f"[cyan]{int(timed_out.to_numpy().sum())} timed-out cells in {len(rows)} rows.[/cyan]")
+    if budget is None:
+        budget = FloatPrompt.ask(
+            "[bold cyan]New time budget in seconds for each NP-hard property (0 for no limit)[/bold cyan]",
+            default=600.0,
+        )
+    if workers is None:
+        workers = IntPrompt.ask(
+            "[bold cyan]Number of worker processes[/bold cyan]",
+            default=default_worker_count(),
+        )
+    items = [
+        (df.at[index, 'edgelist'], [prop for prop in property_names if timed_out.at[index, prop]])
+        for index in rows
+    ]
+    results = parallel_map(
+        partial(_retry_properties_worker, budget=budget or None),
+        items,
+        workers=workers,
+        description="Retrying timed-out properties...",
+        use_pool=bool(budget),
+    )
+    for index, (_, props), values in zip(rows, items, results):
+        for prop, value in zip(props, values):
+            df.at[index, prop] = value
+    with operation("recompute", mode="retry"):
+        save_database(df)
+    remaining = int(df[property_names].map(is_timed_out).to_numpy().sum())
+    console.print(f"[bold green]Database updated. {remaining} cells are still timed out.[/bold green]")
+    return {"retried": sum(len(props) for _, props in items), "timed_out": remaining}
 
 # ------------------------------
 # New Helper Functions for Efficiency
 # ------------------------------
 
-def compute_new_property_from_csv_row(row, new_func, console):
+def compute_new_property_from_csv_row(row, new_func, console, measurements=None):
     """
-    Given a row from the CSV file, extracts the 'edgelist' column,
-    converts it to a list of edges, builds a graph, and computes the property
-    specified by new_func.
+    Given a row of the database, extracts the 'edgelist' column (a list of edges, or its
+    Python-literal string form), builds a graph, and computes the property specified by new_func.
+    If a measurements list is given, the timing record of the computation is appended to it.
     """
-    edgelist_str = row.get('edgelist', None)
-    if not edgelist_str:
-        return None
-    try:
-        edges = ast.literal_eval(edgelist_str)
-    except Exception as e:
-        console.print(f"[red]Error evaluating edgelist for polytope '{row.get('name', 'unknown')}': {e}[/red]")
-        return None
-    if not edges:
+    edges = row.get('edgelist', None)
+    if isinstance(edges, str):
+        try:
+            edges = ast.literal_eval(edges)
+        except Exception as e:
+            console.print(f"[red]Error evaluating edgelist for polytope '{row.get('name', 'unknown')}': {e}[/red]")
+            return None
+    if edges is None or len(edges) == 0:
         return None
     G = nx.Graph()
     G.add_edges_from(edges)
-    try:
-        result = getattr(gc, new_func)(G)
-    except Exception:
-        try:
-            result = getattr(nx, new_func)(G)
-        except Exception:
-            result = None
+    spec = get_property_registry([new_func])[new_func]
+    if measurements is None:
+        return evaluate_property(spec, GraphContext(G))
+    result, record = measure_property(spec, GraphContext(G))
+    record.update(name=row.get('name', 'unknown'), order=G.number_of_nodes())
+    measurements.append(record)
     return result
 
-def update_csv_with_new_function(new_func, console):
+def _backfill_chunk_worker(chunk, new_func, profile=False):
+    """
+    Worker entry point for update_csv_with_new_function: computes new_func for a chunk of
+    (name, edges) pairs, where edges is an array of shape (E, 2). Returns the values in chunk order,
+    together with their measurements when profiling.
     """
-    Loads the existing CSV database, computes the new function's value for each polytope
-    using the edgelist stored in the CSV, adds these values as a new column, and saves the CSV.
+    spec = get_property_registry([new_func])[new_func]
+    values = []
+    measurements = []
+    for name, edges in chunk:
+        if edges is None or len(edges) == 0:
+            values.append(None)
+            continue
+        G = nx.Graph()
+        G.add_edges_from(edges.tolist())
+        if not profile:
+            values.append(evaluate_property(spec, GraphContext(G)))
+            continue
+        value, record = measure_property(spec, GraphContext(G))
+        record.update(name=name, order=G.number_of_nodes())
+        measurements.append(record)
+        values.append(value)
+    return (values, measurements) if profile else values
+
+def update_csv_with_new_function(new_func, console, profile=False, workers=None):
     """
-    csv_path = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.csv")
-    if not os.path.exists(csv_path):
-        console.print("[red]CSV database file not found. Please run a full recompute first.[/red]")
+    Loads the existing database, computes the new function's value for each polytope
+    using the stored edgelist, adds these values as a new column, and saves the database
+    (re-exporting the CSV) once at the end.
+
+    The edge lists are read in bulk from the binary columnar file (or from the loaded CSV if the
+    binary file is stale) and the polytopes are split into interleaved chunks, so that large and
+    small graphs are mixed, which are computed by a pool of worker processes (one per CPU core
+    unless workers is given). Spectral properties are instead computed from the stored adjacency
+    matrices by the batched eigensolver. With profile set, the time taken per polytope is recorded,
+    summarized and written to the profiles folder. Returns the number of rows updated, or None if the
+    database could not be read or written.
+    """
+    if not database_exists():
+        console.print("[red]Database not found. Please run a full recompute first.[/red]")
         return
     try:
-        df = pd.read_csv(csv_path)
+        df = load_database()
+        edge_arrays = load_list_column('edgelist')
     except Exception as e:
-        console.print(f"[red]Error reading CSV file: {e}[/red]")
+        console.print(f"[red]Error reading database: {e}[/red]")
         return
-    for index, row in df.iterrows():
-        value = compute_new_property_from_csv_row(row, new_func)
-        df.at[index, new_func] = value
+    measurements = []
+    if new_func in BATCHED_SPECTRAL_PROPERTIES:
+        # Spectral properties come from one batched eigensolve per graph order of the stored matrices.
+        rows = df[['name', 'adjacency_matrix']].to_dict('records')
+        fill_spectral_columns(rows, [new_func], measurements if profile else None)
+        df[new_func] = [row[new_func] for row in rows]
+    else:
+        if edge_arrays is None:
+            edge_arrays = [None if not isinstance(edges, list) else np.asarray(edges) for edges in df['edgelist']]
+        if workers is None:
+            workers = default_worker_count()
+        n_chunks = max(1, min(len(df), workers * 4))
+        chunk_rows = [list(range(start, len(df), n_chunks)) for start in range(n_chunks)]
+        chunks = [[(df.at[i, 'name'], edge_arrays[i]) for i in rows] for rows in chunk_rows]
+        results = parallel_map(
+            partial(_backfill_chunk_worker, new_func=new_func, profile=profile),
+            chunks,
+            workers=workers,
+            description=f"Computing '{new_func}'...",
+            chunksize=1,
+        )
+        values = [None] * len(df)
+        for rows, result in zip(chunk_rows, results):
+            if profile:
+                result, chunk_measurements = result
+                measurements.extend(chunk_measurements)
+            for i, value in zip(rows, result):
+                values[i] = value
+        df[new_func] = values
     try:
-        df.to_csv(csv_path, index=False)
-        console.print(f"[green]CSV database updated with new function '{new_func}'.[/green]")
+        save_database(df)
+        refresh_manifest_properties(get_property_names())
+        console.print(f"[green]Database updated with new function '{new_func}'.[/green]")
     except Exception as e:
-        console.print(f"[red]Error writing CSV file: {e}[/red]")
+        console.print(f"[red]Error writing database: {e}[/red]")
+        return
+    if profile:
+        print_profile_summary(measurements, console)
+        console.print(f"[cyan]Raw measurements written to {write_measurements(measurements, new_func)}[/cyan]")
+    return len(df)
 
 def append_new_function_to_properties_file(properties_file, new_func):
     """
     Appends new_func to the properties_file, ensuring that it is placed on its own line.
+    The file is rewritten with write_text_atomically rather than appended to in place.
     """
-    # Open the file in binary mode for reading/writing.
-    with open(properties_file, "rb+") as f:
-        f.seek(0, os.SEEK_END)
-        if f.tell() > 0:
-            # Go back one character.
-            f.seek(-1, os.SEEK_END)
-            last_char = f.read(1)
-            if last_char != b'\n':
-                f.write(b'\n')
-        # Now write the new function name followed by a newline.
-        f.write((new_func + "\n").encode())
+    with open(properties_file, "r") as f:
+        text = f.read()
+    if text and not text.endswith("\n"):
+        text += "\n"
+    write_text_atomically(properties_file, text + new_func + "\n")
 
-def add_new_function(console):
+def register_new_function(new_func, console):
     """
-    Prompts the user to enter the name of a new function (e.g. 'fullerene') to compute on each polytope.
-    The function name is appended to polytope_properties.txt (on its own line), and then the CSV database is updated
-    by computing the new property for each polytope using the existing 'edgelist' column.
+    Appends new_func to polytope_properties.txt unless it is empty or already listed, warning if it
+    resolves to no graphcalc or networkx function. Returns True if it was added.
     """
     properties_file = os.path.join("Simple_Polytope_Data", "polytope_properties.txt")
-    new_func = Prompt.ask("[bold cyan]Enter the name of the new function to add (e.g. 'fullerene')[/bold cyan]").strip()
     if not new_func:
         console.print("[red]No function name entered. Aborting.[/red]")
-        return
+        return False
     properties = get_property_names()
     if new_func in properties:
         console.print(f"[yellow]The function '{new_func}' already exists in polytope_properties.txt[/yellow]")
-        return
+        return False
+    if resolve_property(new_func).source == 'unresolved':
+        console.print(f"[yellow]Warning: '{new_func}' was not found in graphcalc or networkx; its column will be empty.[/yellow]")
     try:
         append_new_function_to_properties_file(properties_file, new_func)
         console.print(f"[green]Function '{new_func}' added successfully to polytope_properties.txt[/green]")
     except Exception as e:
         console.print(f"[red]Error updating properties file: {e}[/red]")
-        return
+        return False
+    return True
+
+def add_new_function(console):
+    """
+    Prompts the user to enter the name of a new function (e.g. 'fullerene') to compute on each polytope.
+    The function name is appended to polytope_properties.txt (on its own line), and then the CSV database is updated
+    by computing the new property for each polytope using the existing 'edgelist' column.
+    """
+    new_func = Prompt.ask("[bold cyan]Enter the name of the new function to add (e.g. 'fullerene')[/bold cyan]").strip()
+    # The properties file and the new column are written as one journal operation.
+    with operation("add-property", property=new_func):
+        if not register_new_function(new_func, console):
+            return
+
+        profile = Prompt.ask(
+            "[bold cyan]Record per-polytope timings? (y/n)[/bold cyan]",
+            choices=["y", "n"],
+            default="n",
+        ) == "y"
 
-    # Instead of recomputing the entire database, update only the new function in the existing CSV.
-    update_csv_with_new_function(new_func)
+        # Instead of recomputing the entire database, update only the new function in the existing CSV.
+        update_csv_with_new_function(new_func, console, profile=profile)
 
 def display_properties_of_entry(console):
     """
@@ -186,22 +492,14 @@ def display_properties_of_entry(console):
     prompts the user to select one by entering the numerical tag,
     computes the properties for that file, and then shows the computed properties.
     """
-    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
-    files = [f for f in os.listdir(edge_dir) if f.endswith(".txt")]
-    if not files:
-        console.print("[red]No edge list files found.[/red]")
+    try:
+        store = load_csr_store()
+    except Exception as e:
+        console.print(f"[red]Error reading edge list files: {e}[/red]")
         return
 
     # Build a dictionary mapping the numerical tag to the filename.
-    file_dict = {}
-    for f in files:
-        if f.startswith("simple_polytope_") and f.endswith(".txt"):
-            try:
-                num_str = f[len("simple_polytope_"):-len(".txt")]
-                num = int(num_str)
-                file_dict[num] = f
-            except ValueError:
-                console.print(f"[yellow]Skipping file with invalid number: {f}[/yellow]")
+    file_dict = {num: f"simple_polytope_{num}.txt" for num in store}
 
     if not file_dict:
         console.print("[red]No valid edge list files found.[/red]")
@@ -224,8 +522,7 @@ def display_properties_of_entry(console):
         return
 
     selected_file = file_dict[selected_num]
-    property_names = get_property_names()
-    props = compute_properties_from_edge_file(selected_file, property_names)
+    props = compute_properties_from_edge_file(selected_file, console)
     console.print(Panel(f"Computed properties for [bold green]{selected_file}[/bold green]:", style="magenta"))
     for key, value in props.items():
         if key not in ['name', 'edgelist', 'adjacency_matrix'] and value is not None:
@@ -236,10 +533,9 @@ def remove_property(console):
     Lists current properties from polytope_properties.txt, lets the user select one to remove,
     then confirms the removal. If the user cancels (by typing "restart" at the selection prompt
     or answering 'n' at the confirmation prompt), the function returns without making changes.
-    If confirmed, the function removes that property from the file and, if present,
-    drops the corresponding column from the CSV file.
+    If confirmed, drop_property removes that property from the file and, if present,
+    drops the corresponding column from the database and its CSV export.
     """
-    properties_file = os.path.join("Simple_Polytope_Data", "polytope_properties.txt")
     properties = get_property_names()
     if not properties:
         console.print("[red]No properties found in polytope_properties.txt[/red]")
@@ -276,37 +572,53 @@ def remove_property(console):
     if confirm.lower() != "y":
         console.print("[yellow]Removal cancelled. Returning to main menu.[/yellow]")
         return
+    drop_property(prop_to_remove, console)
 
-    # Remove the property from the text file.
-    try:
-        with open(properties_file, "r") as f:
-            lines = f.readlines()
-        with open(properties_file, "w") as f:
-            for line in lines:
-                if line.strip() != prop_to_remove:
-                    if not line.endswith("\n"):
-                        line += "\n"
-                    f.write(line)
-        console.print(f"[green]Property '{prop_to_remove}' removed from {properties_file}.[/green]")
-    except Exception as e:
-        console.print(f"[red]Error updating properties file: {e}[/red]")
-        return
-
-    # Remove the column from the CSV database.
-    csv_path = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.csv")
-    if not os.path.exists(csv_path):
-        console.print("[yellow]CSV database not found. No column to remove.[/yellow]")
-        return
-    try:
-        df = pd.read_csv(csv_path)
-        if prop_to_remove in df.columns:
-            df.drop(columns=[prop_to_remove], inplace=True)
-            df.to_csv(csv_path, index=False)
-            console.print(f"[green]Column '{prop_to_remove}' removed from CSV database.[/green]")
-        else:
-            console.print(f"[yellow]Column '{prop_to_remove}' not found in CSV database.[/yellow]")
-    except Exception as e:
-        console.print(f"[red]Error updating CSV file: {e}[/red]")
+def drop_property(prop_to_remove, console):
+    """
+    Removes prop_to_remove from polytope_properties.txt and, if present, drops its column from the
+    database and its CSV export. Returns True if the property was listed and removed.
+    """
+    # Recorded as a journal operation, with the position and values of the property so that it can
+    # be restored by undoing it.
+    with operation("remove-property", property=prop_to_remove):
+        properties_file = os.path.join("Simple_Polytope_Data", "polytope_properties.txt")
+        if prop_to_remove not in get_property_names():
+            console.print(f"[red]Property '{prop_to_remove}' is not in {properties_file}.[/red]")
+            return False
+        annotate(position=get_property_names().index(prop_to_remove))
+
+        # Remove the property from the text file.
+        try:
+            with open(properties_file, "r") as f:
+                lines = f.readlines()
+            write_text_atomically(properties_file, "".join(
+                line if line.endswith("\n") else line + "\n"
+                for line in lines
+                if line.strip() != prop_to_remove
+            ))
+            console.print(f"[green]Property '{prop_to_remove}' removed from {properties_file}.[/green]")
+        except Exception as e:
+            console.print(f"[red]Error updating properties file: {e}[/red]")
+            return False
+
+        # Remove the column from the database.
+        if not database_exists():
+            console.print("[yellow]Database not found. No column to remove.[/yellow]")
+            return True
+        try:
+            df = load_database()
+            if prop_to_remove in df.columns:
+                annotate(column=df.columns.get_loc(prop_to_remove), values=dict(zip(df['name'], df[prop_to_remove])))
+                df.drop(columns=[prop_to_remove], inplace=True)
+                save_database(df)
+                refresh_manifest_properties(get_property_names())
+                console.print(f"[green]Column '{prop_to_remove}' removed from the database.[/green]")
+            else:
+                console.print(f"[yellow]Column '{prop_to_remove}' not found in the database.[/yellow]")
+        except Exception as e:
+            console.print(f"[red]Error updating database: {e}[/red]")
+        return True
 
 
 def run_pytests(console):
@@ -2,15 +2,18 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 import os
 import networkx as nx
-import pandas as pd
-import graphcalc as gc
 import ast
 import re
 
-from polytope_app.database import compute_properties
+from polytope_app.database import compute_properties, get_property_names
+from polytope_app.isomorphism import add_to_isomorphism_index, find_isomorphic, load_isomorphism_index
+from polytope_app.journal import operation
+from polytope_app.manifest import record_manifest_entries
+from polytope_app.storage import insert_row, write_text_atomically
+from polytope_app.validation import validate_simple_polytope
 
 
-__all__ = ['parse_edge_list', 'add_new_edge_list', 'add_new_edge_list_from_paste']
+__all__ = ['parse_edge_list', 'confirm_not_duplicate', 'save_new_polytope', 'add_new_edge_list', 'add_new_edge_list_from_paste']
 
 def parse_edge_list(input_str):
     # Try to use ast.literal_eval after ensuring the input is wrapped as a list
@@ -39,6 +42,50 @@ def parse_edge_list(input_str):
     # If no valid edge is found, raise an error
     raise ValueError("Could not parse edge list from the provided input.")
 
+def confirm_not_duplicate(G, console, index=None):
+    """
+    Looks the graph up in the isomorphism index of the stored polytopes (the stored index is loaded
+    unless one is passed in). If an isomorphic polytope is already present, reports its name and asks
+    whether to add the graph anyway. Returns True if the graph should be added.
+    """
+    try:
+        if index is None:
+            index = load_isomorphism_index()
+        matches = find_isomorphic(G, index)
+    except Exception as e:
+        console.print(f"[yellow]Could not check for isomorphic polytopes: {e}[/yellow]")
+        return True
+    if not matches:
+        return True
+    console.print(f"[yellow]This polytope is isomorphic to {', '.join(matches)}, which is already in the database.[/yellow]")
+    return Prompt.ask("[bold yellow]Add it anyway? (y/n)[/bold yellow]", choices=["y", "n"], default="n") == "y"
+
+def save_new_polytope(console, file_name, edges, props, G):
+    """
+    Saves a new polytope: writes its edge file to Edge_Data as file_name, appends its row without
+    loading the database and records it in the manifest and the isomorphism index, all as one
+    journal operation, which can be undone. If any write fails, the operation is rolled back so no
+    part of the polytope is left behind. Returns True if it was saved.
+    """
+    file_path = os.path.join("Simple_Polytope_Data", "Edge_Data", file_name)
+    polytope_name = file_name[:-4]  # Remove .txt extension.
+    target = "file"
+    try:
+        with operation("add", source=polytope_name, count=1):
+            write_text_atomically(file_path, "".join(f"{u} {v}\n" for u, v in edges))
+            target = "database"
+            replaced = insert_row(props)
+            record_manifest_entries([file_name], get_property_names())
+            add_to_isomorphism_index(file_name, G)
+    except Exception as e:
+        console.print(f"[red]Error writing {target}: {e}. No changes were made.[/red]")
+        return False
+    console.print(f"[green]New edge list saved to {file_path}.[/green]")
+    if replaced:
+        console.print(f"[yellow]Polytope '{polytope_name}' already existed in the database. The record was overwritten.[/yellow]")
+    console.print(f"[bold green]Database updated with '{polytope_name}'.[/bold green]")
+    return True
+
 def add_new_edge_list(console):
     """
     Prompts the user to input a new edge list interactively and then updates the CSV database.
@@ -58,7 +105,6 @@ def add_new_edge_list(console):
             pass
     next_number = max(numbers) + 1 if numbers else 0
     new_file_name = f"simple_polytope_{next_number}.txt"
-    new_file_path = os.path.join(edge_dir, new_file_name)
 
     console.print(Panel(f"[bold green]New edge list will be saved as: {new_file_name}[/bold green]", style="blue"))
     console.print("[bold cyan]Enter edges one per line in the format 'source target' or 'source, target'.[/bold cyan]")
@@ -98,14 +144,16 @@ def add_new_edge_list(console):
     try:
         G = nx.Graph()
         G.add_edges_from(edges)
-        # Use graphcalc to check that the graph is a simple polytope graph.
-        spg = gc.simple_polytope_graph(G)
+        # Run the staged simple polytope checks, cheapest first.
+        result = validate_simple_polytope(G)
     except Exception as e:
         console.print(f"[red]Error computing simple polytope graph: {e}[/red]")
         return
-    # If the returned result is not truthy, the edge list is not valid.
-    if not spg:
-        console.print("[red]The entered edge list does not form a valid simple polytope graph. Please check your input and try again.[/red]")
+    # Report the first check that failed.
+    if not result.valid:
+        console.print(f"[red]The entered edge list does not form a valid simple polytope graph ({result.stage} check failed: {result.reason}). Please check your input and try again.[/red]")
+        return
+    if not confirm_not_duplicate(G, console):
         return
 
     # Compute properties for the new edge list.
@@ -123,39 +171,7 @@ def add_new_edge_list(console):
         console.print("[red]Aborting update. No edge list was saved and no changes were made to the CSV database.[/red]")
         return
 
-    # Save the edge list to a file
-    try:
-        with open(new_file_path, "w") as f:
-            for u, v in edges:
-                f.write(f"{u} {v}\n")
-        console.print(f"[green]New edge list saved to {new_file_path}.[/green]")
-    except Exception as e:
-        console.print(f"[red]Error writing file: {e}[/red]")
-        return
-
-    # Update the CSV database.
-    csv_path = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.csv")
-    if os.path.exists(csv_path):
-        try:
-            df = pd.read_csv(csv_path)
-        except Exception as e:
-            console.print(f"[red]Error reading CSV file: {e}[/red]")
-            df = pd.DataFrame()
-    else:
-        df = pd.DataFrame()
-
-    polytope_name = new_file_name[:-4]  # Remove .txt extension.
-    if 'name' in df.columns and polytope_name in df['name'].values:
-        console.print(f"[yellow]Polytope '{polytope_name}' already exists in the CSV database. Overwriting the record.[/yellow]")
-        df = df[df['name'] != polytope_name]
-
-    # df = df.append(new_props, ignore_index=True)
-    df = pd.concat([df, pd.DataFrame([new_props])], ignore_index=True)
-    try:
-        df.to_csv(csv_path, index=False)
-        console.print(f"[bold green]CSV database updated. It now contains {len(df)} records.[/bold green]")
-    except Exception as e:
-        console.print(f"[red]Error writing CSV file: {e}[/red]")
+    save_new_polytope(console, new_file_name, edges, new_props, G)
 
 def add_new_edge_list_from_paste(console):
     """
@@ -183,7 +199,6 @@ def add_new_edge_list_from_paste(console):
             pass
     next_number = max(numbers) + 1 if numbers else 0
     new_file_name = f"simple_polytope_{next_number}.txt"
-    new_file_path = os.path.join(edge_dir, new_file_name)
 
     console.print(Panel(f"[bold green]New edge list will be saved as: {new_file_name}[/bold green]", style="blue"))
     console.print("[bold cyan]Paste your entire edge list in any of the following formats:[/bold cyan]")
@@ -214,13 +229,15 @@ def add_new_edge_list_from_paste(console):
     try:
         G = nx.Graph()
         G.add_edges_from(edges)
-        # Validate that the graph is a simple polytope graph using your custom checker.
-        spg = gc.simple_polytope_graph(G)
+        # Validate that the graph is a simple polytope graph with the staged checks.
+        result = validate_simple_polytope(G)
     except Exception as e:
         console.print(f"[red]Error computing simple polytope graph: {e}[/red]")
         return
-    if not spg:
-        console.print("[red]The entered edge list does not form a valid simple polytope graph. Please check your input and try again.[/red]")
+    if not result.valid:
+        console.print(f"[red]The entered edge list does not form a valid simple polytope graph ({result.stage} check failed: {result.reason}). Please check your input and try again.[/red]")
+        return
+    if not confirm_not_duplicate(G, console):
         return
 
     # Compute properties for the new edge list.
@@ -237,37 +254,4 @@ def add_new_edge_list_from_paste(console):
         console.print("[red]Aborting update. No edge list was saved and no changes were made to the CSV database.[/red]")
         return
 
-    # Save the edge list to a file.
-    try:
-        with open(new_file_path, "w") as f:
-            for u, v in edges:
-                f.write(f"{u} {v}\n")
-        console.print(f"[green]New edge list saved to {new_file_path}.[/green]")
-    except Exception as e:
-        console.print(f"[red]Error writing file: {e}[/red]")
-        return
-
-    # -----------------------------
-    # UPDATE THE CSV DATABASE
-    # -----------------------------
-    csv_path = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.csv")
-    if os.path.exists(csv_path):
-        try:
-            df = pd.read_csv(csv_path)
-        except Exception as e:
-            console.print(f"[red]Error reading CSV file: {e}[/red]")
-            df = pd.DataFrame()
-    else:
-        df = pd.DataFrame()
-
-    polytope_name = new_file_name[:-4]  # Remove .txt extension.
-    if 'name' in df.columns and polytope_name in df['name'].values:
-        console.print(f"[yellow]Polytope '{polytope_name}' already exists in the CSV database. Overwriting the record.[/yellow]")
-        df = df[df['name'] != polytope_name]
-
-    df = pd.concat([df, pd.DataFrame([new_props])], ignore_index=True)
-    try:
-        df.to_csv(csv_path, index=False)
-        console.print(f"[bold green]CSV database updated. It now contains {len(df)} records.[/bold green]")
-    except Exception as e:
-        console.print(f"[red]Error writing CSV file: {e}[/red]")
+    save_new_polytope(console, new_file_name, edges, new_props, G)
@@ -0,0 +1,89 @@
+# polytope_app/faces.py
+
+import numpy as np
+import networkx as nx
+
+__all__ = [
+    'HalfEdges',
+    'half_edges',
+    'enumerate_faces',
+    'p_vector_from_faces',
+    'faces_and_p_vector',
+]
+
+class HalfEdges:
+    """
+    The rotation system of a planar embedding as arrays over its 2E half-edges.
+    Half-edge i goes from tail[i] to head[i]; twin[i] is the reverse half-edge and next[i] is the
+    half-edge following i around the face on its left (the order used by PlanarEmbedding.traverse_face).
+    """
+
+    def __init__(self, tail, head, twin, next):
+        self.tail = tail
+        self.head = head
+        self.twin = twin
+        self.next = next
+
+    def __len__(self):
+        return len(self.tail)
+
+def half_edges(embedding):
+    """
+    Builds the HalfEdges of a networkx PlanarEmbedding in O(E), numbering the half-edges in the
+    order of embedding.edges().
+    """
+    darts = list(embedding.edges())
+    index = {dart: i for i, dart in enumerate(darts)}
+    tail = np.fromiter((v for v, _ in darts), dtype=object, count=len(darts))
+    head = np.fromiter((w for _, w in darts), dtype=object, count=len(darts))
+    twin = np.fromiter((index[(w, v)] for v, w in darts), dtype=np.int64, count=len(darts))
+    # The face walk continues from (v, w) with (w, u), where u is the neighbor of w counterclockwise from v.
+    adjacency = embedding.succ
+    next = np.fromiter((index[(w, adjacency[w][v]["ccw"])] for v, w in darts), dtype=np.int64, count=len(darts))
+    return HalfEdges(tail, head, twin, next)
+
+def enumerate_faces(embedding, structure=None):
+    """
+    Walks every half-edge of the embedding exactly once and returns (faces, face_of): the faces as
+    vertex lists, in the same order and orientation as repeated PlanarEmbedding.traverse_face calls
+    give them, and an array mapping each half-edge to the index of its face. Runs in O(E).
+    """
+    if structure is None:
+        structure = half_edges(embedding)
+    next = structure.next.tolist()
+    tail = structure.tail.tolist()
+    face_of = [-1] * len(next)
+    faces = []
+    for start in range(len(next)):
+        if face_of[start] >= 0:
+            continue
+        face_id = len(faces)
+        face = []
+        dart = start
+        while face_of[dart] < 0:
+            face_of[dart] = face_id
+            face.append(tail[dart])
+            dart = next[dart]
+        faces.append(face)
+    return faces, np.asarray(face_of, dtype=np.int64)
+
+def p_vector_from_faces(faces):
+    """
+    Returns the p-vector [p3, p4, ..., pk] counting the faces of each length, where k is the longest face.
+    """
+    if not faces:
+        return []
+    counts = np.bincount([len(face) for face in faces])
+    return counts[3:].tolist()
+
+def faces_and_p_vector(graph, embedding=None):
+    """
+    Returns (p_vector, faces) of a planar graph from one walk over its half-edges.
+    Raises ValueError if the graph is not planar.
+    """
+    if embedding is None:
+        is_planar, embedding = nx.check_planarity(graph)
+        if not is_planar:
+            raise ValueError("The input graph is not planar.")
+    faces, _ = enumerate_faces(embedding)
+    return p_vector_from_faces(faces), faces
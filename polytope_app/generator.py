@@ -0,0 +1,142 @@
+# polytope_app/generator.py
+
+import networkx as nx
+from rich.prompt import FloatPrompt, IntPrompt
+
+from polytope_app.bulk_import import import_graphs
+from polytope_app.csr_store import read_polytope_graph
+from polytope_app.database import list_edge_files
+from polytope_app.isomorphism import find_isomorphic, isomorphism_keys, update_isomorphism_index
+from polytope_app.parallel import default_worker_count, parallel_map
+
+__all__ = [
+    'truncate_vertex',
+    'iter_truncations',
+    'grow_database',
+    'grow_database_mode',
+]
+
+# Number of parent polytopes truncated per pool call.
+TRUNCATION_BATCH_SIZE = 200
+
+# Default number of new polytopes a growth run stops after. The number of polytopes of each order
+# grows exponentially, and the expansion keeps every yielded polytope in its frontier and its set of
+# canonical forms, so this cap is also what bounds its memory.
+DEFAULT_MAX_NEW = 10000
+
+def truncate_vertex(graph, vertex):
+    """
+    Returns a copy of the cubic graph with vertex truncated (the shallow chop of
+    Old/Graph_Operations/vertex_shallow_chop.py): the vertex is replaced by a triangle whose corners
+    each take over one of its edges. The first corner keeps the label of vertex and the other two get
+    the next free integer labels. Truncating a vertex of a simple polytope gives a simple polytope
+    with two more vertices and one more (triangular) face.
+    """
+    H = graph.copy()
+    neighbors = list(H.neighbors(vertex))
+    label = max(H.nodes()) + 1
+    corners = [vertex] + list(range(label, label + len(neighbors) - 1))
+    for corner, w in zip(corners[1:], neighbors[1:]):
+        H.remove_edge(vertex, w)
+        H.add_edge(corner, w)
+    H.add_edges_from(zip(corners, corners[1:] + corners[:1]))
+    return H
+
+def _truncation_worker(edges):
+    """
+    Truncates every vertex of the graph in turn and returns (vertex, edges, keys) for each
+    distinct child, keeping the first vertex of every class of isomorphic children.
+    """
+    G = nx.Graph()
+    G.add_edges_from(edges)
+    children = []
+    seen = set()
+    for v in sorted(G.nodes()):
+        child = truncate_vertex(G, v)
+        keys = isomorphism_keys(child)
+        if keys not in seen:
+            seen.add(keys)
+            children.append((v, [tuple(edge) for edge in child.edges()], keys))
+    return children
+
+def _order(edges):
+    # A cubic graph has 3V/2 edges.
+    return 2 * len(edges) // 3
+
+def _seed_polytopes():
+    for filename in list_edge_files():
+        yield filename[:-4], [tuple(edge) for edge in read_polytope_graph(filename).edges()]
+
+def iter_truncations(seeds, max_order, max_new=DEFAULT_MAX_NEW, index=None, workers=None):
+    """
+    Runs a breadth-first expansion from seeds, an iterable of (source, edges) pairs, by truncating
+    one vertex at a time, and lazily yields (source, edges) for every new polytope with at most
+    max_order vertices. The children of each level are computed in a pool of worker processes, in
+    batches of TRUNCATION_BATCH_SIZE parents. A child is new if its canonical form is neither in the
+    isomorphism index nor among the polytopes generated before it. Stops after max_new polytopes,
+    which must be a positive number: the frontier and the canonical forms seen so far hold only
+    yielded polytopes, so they never grow beyond it. The source of a child is the source of its
+    parent followed by '/t' and the truncated vertex.
+    """
+    if max_new is None or max_new < 1:
+        raise ValueError("max_new must be a positive number of polytopes.")
+    if index is None:
+        index = update_isomorphism_index(workers=workers)
+    seen = set()
+    produced = 0
+    frontier = [(source, edges) for source, edges in seeds if _order(edges) + 2 <= max_order]
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for start in range(0, len(frontier), TRUNCATION_BATCH_SIZE):
+            batch = frontier[start:start + TRUNCATION_BATCH_SIZE]
+            results = parallel_map(
+                _truncation_worker, [edges for _, edges in batch], workers=workers,
+                description=f"Truncating level {level} ({start + len(batch)}/{len(frontier)})...",
+            )
+            for (source, _), children in zip(batch, results):
+                for vertex, edges, keys in children:
+                    if keys in seen or find_isomorphic(None, index, keys):
+                        continue
+                    seen.add(keys)
+                    child = f"{source}/t{vertex}"
+                    yield child, edges
+                    produced += 1
+                    if produced >= max_new:
+                        return
+                    if _order(edges) + 2 <= max_order:
+                        next_frontier.append((child, edges))
+        frontier = next_frontier
+
+def grow_database(console, max_order, max_new=DEFAULT_MAX_NEW, workers=None, budget=None, batch_size=2000):
+    """
+    Grows the database by truncation: every polytope in Edge_Data seeds iter_truncations, and at
+    most max_new new polytopes are streamed into the database by import_graphs as they are generated.
+    Returns the import summary.
+    """
+    index = update_isomorphism_index(workers=workers)
+    generated = iter_truncations(_seed_polytopes(), max_order, max_new=max_new, index=index, workers=workers)
+    return import_graphs(
+        generated, console, workers=workers, batch_size=batch_size, budget=budget,
+        title="Truncation growth",
+    )
+
+def grow_database_mode(console):
+    """
+    Prompts for the order limit, output budget, worker count and property time budget and runs grow_database.
+    """
+    max_order = IntPrompt.ask("[bold cyan]Largest order of the generated polytopes[/bold cyan]", default=30)
+    max_new = IntPrompt.ask("[bold cyan]Largest number of polytopes to add[/bold cyan]", default=100)
+    if max_new < 1:
+        console.print("[red]The number of polytopes to add must be positive.[/red]")
+        return
+    workers = IntPrompt.ask(
+        "[bold cyan]Number of worker processes[/bold cyan]",
+        default=default_worker_count(),
+    )
+    budget = FloatPrompt.ask(
+        "[bold cyan]Time budget in seconds for each NP-hard property (0 for no limit)[/bold cyan]",
+        default=0.0,
+    )
+    grow_database(console, max_order, max_new=max_new, workers=workers, budget=budget or None)
@@ -0,0 +1,225 @@
+# polytope_app/invariants.py
+
+import time
+import numpy as np
+import networkx as nx
+import graphcalc as gc
+
+from polytope_app.cubic import (
+    MAX_FRONTIER_WIDTH,
+    cubic_domination_number,
+    cubic_independence_number,
+    cubic_total_domination_number,
+    frontier_order,
+    is_cubic,
+)
+from polytope_app.faces import enumerate_faces, p_vector_from_faces
+from polytope_app.spectral import sparse_spectral_value, use_sparse_solver
+from polytope_app.validation import validate_simple_polytope
+
+__all__ = [
+    'GraphContext',
+    'CONTEXT_PROPERTIES',
+]
+
+class GraphContext:
+    """
+    Per-graph computation context.
+
+    Expensive intermediates (spectra, the distance matrix, the planar embedding, the face list, ...)
+    are computed on first use and cached, so every property that needs one shares the same result.
+    The profile attribute records how many times each intermediate was computed and how long it took.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.profile = {}
+        self._cache = {}
+
+    def _intermediate(self, key, compute):
+        if key not in self._cache:
+            start = time.perf_counter()
+            self._cache[key] = compute()
+            entry = self.profile.setdefault(key, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += time.perf_counter() - start
+        return self._cache[key]
+
+    def cached_keys(self):
+        """
+        Returns the names of the intermediates computed so far.
+        """
+        return set(self._cache)
+
+    def export_intermediates(self, known=()):
+        """
+        Returns the intermediates computed so far, except those named in known, as a dict of name ->
+        (value, profile entry), for example to send them back from a worker process.
+        """
+        return {
+            key: (value, self.profile.get(key))
+            for key, value in self._cache.items()
+            if key not in known
+        }
+
+    def adopt_intermediates(self, intermediates):
+        """
+        Caches the intermediates returned by export_intermediates in another process, with their
+        profile entries, unless they were already computed here.
+        """
+        for key, (value, entry) in intermediates.items():
+            if key not in self._cache:
+                self._cache[key] = value
+                if entry is not None:
+                    self.profile[key] = dict(entry)
+
+    @property
+    def adjacency_matrix(self):
+        return self._intermediate("adjacency_matrix", lambda: gc.adjacency_matrix(self.graph))
+
+    @property
+    def sparse_adjacency_matrix(self):
+        return self._intermediate(
+            "sparse_adjacency_matrix",
+            lambda: nx.to_scipy_sparse_array(self.graph, dtype=float, format="csr"),
+        )
+
+    @property
+    def laplacian_matrix(self):
+        def compute():
+            A = self.adjacency_matrix
+            return np.diag(np.sum(A, axis=1)) - A
+        return self._intermediate("laplacian_matrix", compute)
+
+    @property
+    def adjacency_spectrum(self):
+        # Adjacency matrices are symmetric, so eigvalsh applies; it returns the eigenvalues sorted.
+        return self._intermediate("adjacency_spectrum", lambda: np.linalg.eigvalsh(self.adjacency_matrix))
+
+    @property
+    def laplacian_spectrum(self):
+        return self._intermediate("laplacian_spectrum", lambda: np.linalg.eigvalsh(self.laplacian_matrix))
+
+    @property
+    def distance_matrix(self):
+        def compute():
+            nodes = list(self.graph.nodes())
+            index = {v: i for i, v in enumerate(nodes)}
+            D = np.full((len(nodes), len(nodes)), np.inf)
+            for source, lengths in nx.all_pairs_shortest_path_length(self.graph):
+                row = D[index[source]]
+                for target, length in lengths.items():
+                    row[index[target]] = length
+            return D
+        return self._intermediate("distance_matrix", compute)
+
+    @property
+    def eccentricities(self):
+        def compute():
+            D = self.distance_matrix
+            if D.size == 0 or np.isinf(D).any():
+                raise nx.NetworkXError("Found infinite path length because the graph is not connected")
+            return D.max(axis=1).astype(int)
+        return self._intermediate("eccentricities", compute)
+
+    @property
+    def planar_embedding(self):
+        """
+        The pair (is_planar, embedding) returned by nx.check_planarity.
+        """
+        return self._intermediate("planar_embedding", lambda: nx.check_planarity(self.graph))
+
+    @property
+    def faces(self):
+        def compute():
+            is_planar, embedding = self.planar_embedding
+            if not is_planar:
+                raise ValueError("The input graph is not planar.")
+            faces, _ = enumerate_faces(embedding)
+            return faces
+        return self._intermediate("faces", compute)
+
+    @property
+    def p_vector(self):
+        return self._intermediate("p_vector", lambda: p_vector_from_faces(self.faces))
+
+    @property
+    def is_simple_polytope(self):
+        """
+        Same test as gc.simple_polytope_graph, by the staged validator reusing the cached planarity check.
+        """
+        def compute():
+            return validate_simple_polytope(self.graph, self.planar_embedding).valid
+        return self._intermediate("is_simple_polytope", compute)
+
+    @property
+    def cubic_order(self):
+        """
+        The vertices as bitsets along a narrow frontier order, shared by the exact cubic solvers,
+        or None if the graph is not cubic.
+        """
+        return self._intermediate("cubic_order", lambda: frontier_order(self.graph) if is_cubic(self.graph) else None)
+
+    def exact_cubic(self, name, solve, fallback):
+        """
+        Returns the property name as solve(graph, order) from the bitset solvers of
+        polytope_app.cubic when the graph is cubic with a frontier order no wider than
+        MAX_FRONTIER_WIDTH[name], and as fallback(graph) (the graphcalc integer program)
+        otherwise or when the solver gives up.
+        """
+        order = self.cubic_order
+        if order is not None and order.width <= MAX_FRONTIER_WIDTH[name]:
+            value = solve(self.graph, order)
+            if value is not None:
+                return value
+        return fallback(self.graph)
+
+    @property
+    def independence_number(self):
+        def compute():
+            def solve(G, order):
+                # The face bound holds for simple polytope graphs only.
+                p_vector = self.p_vector if self.is_simple_polytope else None
+                return cubic_independence_number(G, p_vector, order)
+            return self.exact_cubic('independence_number', solve, gc.independence_number)
+        return self._intermediate("independence_number", compute)
+
+    def extreme_eigenvalue(self, name, dense):
+        """
+        Returns the spectral property name, taken from the dense spectra by dense(self), or from the
+        sparse iterative solver for graphs large enough for use_sparse_solver.
+        """
+        if use_sparse_solver(self.graph.number_of_nodes()):
+            return self._intermediate(name, lambda: sparse_spectral_value(name, self.sparse_adjacency_matrix))
+        return dense(self)
+
+    def p_gons(self, p):
+        vector = self.p_vector
+        return vector[p - 3] if p - 3 < len(vector) else 0
+
+
+# Properties computed from the shared intermediates of a GraphContext. Each entry mirrors the
+# graphcalc function of the same name.
+CONTEXT_PROPERTIES = {
+    'simple_polytope_graph': lambda ctx: ctx.is_simple_polytope,
+    'simple_polytope_graph_with_p6_zero': lambda ctx: ctx.is_simple_polytope and ctx.p_gons(6) == 0,
+    'simple_polytope_graph_with_p6_greater_than_zero': lambda ctx: ctx.is_simple_polytope and ctx.p_gons(6) > 0,
+    'p_vector': lambda ctx: list(ctx.p_vector),
+    'diameter': lambda ctx: int(ctx.eccentricities.max()),
+    'radius': lambda ctx: int(ctx.eccentricities.min()),
+    'algebraic_connectivity': lambda ctx: ctx.extreme_eigenvalue(
+        'algebraic_connectivity', lambda ctx: ctx.laplacian_spectrum[1]),
+    'largest_laplacian_eigenvalue': lambda ctx: ctx.extreme_eigenvalue(
+        'largest_laplacian_eigenvalue', lambda ctx: max(abs(ctx.laplacian_spectrum))),
+    'second_largest_adjacency_eigenvalue': lambda ctx: ctx.extreme_eigenvalue(
+        'second_largest_adjacency_eigenvalue', lambda ctx: ctx.adjacency_spectrum[-2]),
+    'smallest_adjacency_eigenvalue': lambda ctx: ctx.extreme_eigenvalue(
+        'smallest_adjacency_eigenvalue', lambda ctx: ctx.adjacency_spectrum[0]),
+    'independence_number': lambda ctx: ctx.independence_number,
+    'vertex_cover_number': lambda ctx: ctx.graph.number_of_nodes() - ctx.independence_number,
+    'domination_number': lambda ctx: ctx.exact_cubic(
+        'domination_number', cubic_domination_number, gc.domination_number),
+    'total_domination_number': lambda ctx: ctx.exact_cubic(
+        'total_domination_number', cubic_total_domination_number, gc.total_domination_number),
+    'zero_adjacency_eigenvalues_count': lambda ctx: int(np.count_nonzero(np.isclose(ctx.adjacency_spectrum, 0))),
+}
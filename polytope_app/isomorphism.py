@@ -0,0 +1,327 @@
+# polytope_app/isomorphism.py
+
+import os
+import json
+import hashlib
+from collections import Counter
+import networkx as nx
+from rich.table import Table
+
+from polytope_app.database import edge_file_sort_key
+from polytope_app.journal import preserve
+from polytope_app.manifest import edge_file_hash
+from polytope_app.parallel import parallel_map
+from polytope_app.storage import append_line
+
+__all__ = [
+    'invariant_key',
+    'canonical_code',
+    'canonical_digest',
+    'isomorphism_keys',
+    'load_isomorphism_index',
+    'save_isomorphism_index',
+    'update_isomorphism_index',
+    'add_to_isomorphism_index',
+    'record_isomorphism_entries',
+    'find_isomorphic',
+    'audit_duplicates',
+]
+
+INDEX_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_isomorphism_index.json")
+# Entries recorded since the index was last saved, one JSON list [filename, key, digest, file stats] per line.
+INDEX_PENDING_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_isomorphism_index.pending.jsonl")
+
+INDEX_VERSION = 2
+
+# ------------------------------
+# Canonical forms
+# ------------------------------
+
+def _rotation_system(graph):
+    """
+    Returns the clockwise rotation system of a planar graph as a dict vertex -> list of neighbors,
+    or None if the graph is not planar.
+    """
+    is_planar, embedding = nx.check_planarity(graph)
+    if not is_planar:
+        return None
+    return {v: list(embedding.neighbors_cw_order(v)) for v in embedding.nodes()}
+
+def _dart_face_sizes(rotation):
+    """
+    Returns a dict mapping every dart (u, v) to the length of the face it bounds. The face of (u, v)
+    continues with (v, w), where w follows u clockwise around v.
+    """
+    position = {v: {w: i for i, w in enumerate(nbrs)} for v, nbrs in rotation.items()}
+    sizes = {}
+    for u, nbrs in rotation.items():
+        for v in nbrs:
+            if (u, v) in sizes:
+                continue
+            face = []
+            dart = (u, v)
+            while dart not in sizes and dart not in face:
+                face.append(dart)
+                a, b = dart
+                around = rotation[b]
+                dart = (b, around[(position[b][a] + 1) % len(around)])
+            for dart in face:
+                sizes[dart] = len(face)
+    return sizes
+
+def _face_counts(dart_sizes):
+    # Each face of length k is bounded by k darts.
+    return {k: c // k for k, c in sorted(Counter(dart_sizes.values()).items())}
+
+def invariant_key(graph, rotation=None):
+    """
+    Returns a cheap isomorphism invariant used to bucket candidates before comparing canonical codes:
+    the order, the size and, for planar graphs, the number of faces of each length (the p-vector).
+    """
+    if rotation is None:
+        rotation = _rotation_system(graph)
+    key = f"{graph.number_of_nodes()}:{graph.number_of_edges()}"
+    if rotation is None:
+        return key + ":nonplanar"
+    counts = _face_counts(_dart_face_sizes(rotation))
+    return key + ":" + ",".join(f"{k}x{c}" for k, c in counts.items())
+
+def _code_from_dart(rotation, position, start, first, mirror):
+    """
+    Numbers the vertices breadth first from the dart (start, first), listing the neighbors of each
+    vertex in rotation order beginning with the neighbor it was reached from, and returns the
+    sequence of neighbor numbers (with 0 closing each vertex).
+    """
+    labels = {start: 1}
+    entry = {start: first}
+    queue = [start]
+    code = []
+    step = -1 if mirror else 1
+    for v in queue:
+        around = rotation[v]
+        i = position[v][entry[v]]
+        for k in range(len(around)):
+            w = around[(i + step * k) % len(around)]
+            if w not in labels:
+                labels[w] = len(labels) + 1
+                entry[w] = v
+                queue.append(w)
+            code.append(labels[w])
+        code.append(0)
+    return code
+
+def canonical_code(graph, rotation=None):
+    """
+    Returns a canonical code of a 3-connected planar graph, such as a simple polytope graph.
+
+    By Whitney's theorem such a graph has a unique embedding up to reflection, so the smallest code
+    obtained by numbering the vertices from every dart in both orientations of the embedding is the
+    same for isomorphic graphs and different for non-isomorphic ones (Weinberg's method). Only the
+    darts bounding faces of the rarest length are used as starting points, which is an isomorphism
+    invariant choice; the worst case is O(E^2) time. Returns None for non-planar graphs.
+    """
+    if rotation is None:
+        rotation = _rotation_system(graph)
+    if rotation is None:
+        return None
+    dart_sizes = _dart_face_sizes(rotation)
+    if not dart_sizes:
+        return ()
+    rarest = min(_face_counts(dart_sizes).items(), key=lambda item: (item[1], item[0]))[0]
+    position = {v: {w: i for i, w in enumerate(nbrs)} for v, nbrs in rotation.items()}
+    best = None
+    for (u, v), size in dart_sizes.items():
+        # Reflecting the embedding turns the face of (u, v) into the face of (v, u).
+        for mirror in (False, True):
+            if (dart_sizes[(v, u)] if mirror else size) != rarest:
+                continue
+            code = _code_from_dart(rotation, position, u, v, mirror)
+            if best is None or code < best:
+                best = code
+    return tuple(best)
+
+def canonical_digest(graph, rotation=None):
+    """
+    Returns the SHA-256 hex digest of the canonical code, or None for non-planar graphs.
+    """
+    code = canonical_code(graph, rotation)
+    if code is None:
+        return None
+    return hashlib.sha256(",".join(map(str, code)).encode()).hexdigest()
+
+def isomorphism_keys(graph):
+    """
+    Returns the (invariant key, canonical digest) pair under which the graph is indexed.
+    """
+    rotation = _rotation_system(graph)
+    return invariant_key(graph, rotation), canonical_digest(graph, rotation)
+
+# ------------------------------
+# Persistent index
+# ------------------------------
+
+def load_isomorphism_index():
+    """
+    Loads the isomorphism index stored next to the database. The index maps invariant key ->
+    canonical digest -> names of the stored polytopes with that canonical form, and records the
+    size, modification time and content hash of every indexed edge file. The entries recorded since
+    it was saved are applied on top. Returns an empty index if the file is missing or unreadable.
+    """
+    index = {"version": INDEX_VERSION, "buckets": {}, "files": {}}
+    if os.path.exists(INDEX_PATH):
+        try:
+            with open(INDEX_PATH, "r") as f:
+                stored = json.load(f)
+            if stored.get("version") == INDEX_VERSION:
+                index = stored
+        except (OSError, ValueError):
+            pass
+    if os.path.exists(INDEX_PENDING_PATH):
+        with open(INDEX_PENDING_PATH, "r") as f:
+            for line in f:
+                if line.strip():
+                    filename, key, digest, stats = json.loads(line)
+                    if filename in index["files"]:
+                        _discard(index, filename[:-4])
+                    _insert(index, filename[:-4], key, digest)
+                    index["files"][filename] = stats
+    return index
+
+def save_isomorphism_index(index):
+    """
+    Writes the index atomically. The recorded entries are now part of it, so their file is removed.
+    Inside a journal operation, the previous versions of both files are preserved first.
+    """
+    preserve(INDEX_PATH, INDEX_PENDING_PATH)
+    tmp_path = INDEX_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, INDEX_PATH)
+    if os.path.exists(INDEX_PENDING_PATH):
+        os.remove(INDEX_PENDING_PATH)
+
+def _insert(index, name, key, digest):
+    if digest is None:
+        # Not planar, so not a polytope graph; there is no canonical form to index it by.
+        return
+    names = index["buckets"].setdefault(key, {}).setdefault(digest, [])
+    if name not in names:
+        names.append(name)
+
+def _discard(index, name):
+    for key in list(index["buckets"]):
+        bucket = index["buckets"][key]
+        for digest in list(bucket):
+            if name in bucket[digest]:
+                bucket[digest].remove(name)
+            if not bucket[digest]:
+                del bucket[digest]
+        if not bucket:
+            del index["buckets"][key]
+
+def _index_worker(filename):
+    file_path = os.path.join("Simple_Polytope_Data", "Edge_Data", filename)
+    G = nx.read_edgelist(file_path, nodetype=int)
+    return isomorphism_keys(G)
+
+def _edge_file_stats():
+    edge_dir = os.path.join("Simple_Polytope_Data", "Edge_Data")
+    return {
+        entry.name: [entry.stat().st_size, entry.stat().st_mtime_ns]
+        for entry in os.scandir(edge_dir)
+        if entry.name.endswith(".txt")
+    }
+
+def update_isomorphism_index(workers=None):
+    """
+    Brings the index in line with the edge files in Edge_Data: files that are new or whose contents
+    changed are (re)indexed using a pool of worker processes, and files that were removed are dropped.
+    Changes are found from a listing of the sizes and modification times, so only files whose
+    listing entry changed are read (and hashed, to skip files that were rewritten unchanged).
+    Saves the index if it changed and returns it.
+    """
+    index = load_isomorphism_index()
+    stats = _edge_file_stats()
+    removed = set(index["files"]) - set(stats)
+    for filename in removed:
+        _discard(index, filename[:-4])
+        del index["files"][filename]
+    touched = [
+        filename for filename in sorted(stats, key=edge_file_sort_key)
+        if index["files"].get(filename, [None, None])[:2] != stats[filename]
+    ]
+    hashes = {filename: edge_file_hash(filename) for filename in touched}
+    stale = [filename for filename in touched if index["files"].get(filename, [None] * 3)[2] != hashes[filename]]
+    if stale:
+        results = parallel_map(_index_worker, stale, workers=workers, description="Indexing polytopes...")
+        for filename, (key, digest) in zip(stale, results):
+            _discard(index, filename[:-4])
+            _insert(index, filename[:-4], key, digest)
+    for filename in touched:
+        index["files"][filename] = stats[filename] + [hashes[filename]]
+    if touched or removed or not os.path.exists(INDEX_PATH):
+        save_isomorphism_index(index)
+    return index
+
+def add_to_isomorphism_index(filename, graph):
+    """
+    Adds the graph just saved as filename in Edge_Data to the index.
+    """
+    key, digest = isomorphism_keys(graph)
+    record_isomorphism_entries([(filename, key, digest)])
+
+def record_isomorphism_entries(entries):
+    """
+    Records (filename, key, digest) entries for edge files just saved in Edge_Data, with keys
+    computed by isomorphism_keys, by appending them to the pending entries in one write, without
+    reading or rewriting the index.
+    """
+    lines = []
+    for filename, key, digest in entries:
+        stat = os.stat(os.path.join("Simple_Polytope_Data", "Edge_Data", filename))
+        lines.append(json.dumps([filename, key, digest, [stat.st_size, stat.st_mtime_ns, edge_file_hash(filename)]]) + "\n")
+    if lines:
+        append_line(INDEX_PENDING_PATH, "".join(lines))
+
+def find_isomorphic(graph, index=None, keys=None):
+    """
+    Returns the names of the stored polytopes isomorphic to graph (an empty list if there are none).
+    The canonical code is only computed when a stored polytope shares the graph's invariant key,
+    unless the keys returned by isomorphism_keys are passed in. Callers making several lookups load
+    the index once and pass it in; without one, the stored index is loaded as it is. Neither is
+    resynced with Edge_Data here: update_isomorphism_index (run by audit_duplicates, bulk imports
+    and the generator) picks up edge files changed outside the app.
+    """
+    if index is None:
+        index = load_isomorphism_index()
+    if keys is not None:
+        key, digest = keys
+        return list(index["buckets"].get(key, {}).get(digest, []))
+    rotation = _rotation_system(graph)
+    bucket = index["buckets"].get(invariant_key(graph, rotation))
+    if not bucket:
+        return []
+    return list(bucket.get(canonical_digest(graph, rotation), []))
+
+def audit_duplicates(console, workers=None):
+    """
+    Indexes every edge file in Edge_Data and reports the groups of stored polytopes that are
+    isomorphic to each other. Returns the groups as lists of names.
+    """
+    index = update_isomorphism_index(workers=workers)
+    groups = [
+        sorted(names, key=lambda name: edge_file_sort_key(name + ".txt"))
+        for bucket in index["buckets"].values()
+        for names in bucket.values()
+        if len(names) > 1
+    ]
+    if not groups:
+        console.print(f"[bold green]No isomorphic duplicates among {len(index['files'])} polytopes.[/bold green]")
+        return groups
+    table = Table(title="Isomorphic duplicates")
+    table.add_column("Polytopes")
+    for names in sorted(groups, key=lambda names: edge_file_sort_key(names[0] + ".txt")):
+        table.add_row(", ".join(names))
+    console.print(table)
+    console.print(f"[yellow]{len(groups)} groups of isomorphic polytopes found.[/yellow]")
+    return groups
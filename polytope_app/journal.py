@@ -0,0 +1,468 @@
+# polytope_app/journal.py
+
+import os
+import json
+import shutil
+import time
+import contextlib
+from collections import namedtuple
+from rich.prompt import IntPrompt
+from rich.table import Table
+
+__all__ = [
+    'JOURNAL_PATH',
+    'JournalOperation',
+    'file_key',
+    'link_or_copy',
+    'restore_file',
+    'operation',
+    'preserve',
+    'annotate',
+    'recover',
+    'compact_journal',
+    'start_session',
+    'list_operations',
+    'undo_operation',
+    'undo_session',
+    'undo_mode',
+]
+
+DATA_DIR = "Simple_Polytope_Data"
+JOURNAL_DIR = os.path.join(DATA_DIR, ".journal")
+# Append-only log of operations, one JSON record per line. The files an operation touches are
+# preserved by hard-linking them into JOURNAL_DIR/<seq> before they are first written.
+JOURNAL_PATH = os.path.join(JOURNAL_DIR, "journal.jsonl")
+
+# Number of operations kept by compaction besides those of the current session.
+KEEP_OPERATIONS = 20
+
+JournalOperation = namedtuple("JournalOperation", ["seq", "kind", "details", "session", "time", "state", "files"])
+
+_active = None
+_session = None
+_recovered = False
+
+# ------------------------------
+# Preserved files
+# ------------------------------
+
+def file_key(path):
+    """
+    Returns [size, mtime_ns, inode] of path, which tells whether the file was replaced or written since.
+    """
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+def link_or_copy(source, target):
+    # Hard links cost nothing for unchanged files; copies are only made where links are unsupported.
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def _preserved_intact(preserved_path, key):
+    size, mtime_ns = file_key(preserved_path)[:2]
+    return size > key[0] or (size == key[0] and mtime_ns == key[1])
+
+def restore_file(live_path, preserved_path, key):
+    """
+    Puts back the contents live_path had when it was hard-linked to preserved_path, given the file_key
+    recorded then. Every writer of the app either replaces files atomically or only appends rows to
+    them (storage.insert_row), so the link still holds those contents, possibly followed by appended
+    rows, which are truncated away. Returns False, leaving live_path alone, if the preserved file was
+    otherwise modified in place.
+    """
+    if not _preserved_intact(preserved_path, key):
+        return False
+    if file_key(preserved_path)[0] > key[0]:
+        os.truncate(preserved_path, key[0])
+        os.utime(preserved_path, ns=(key[1], key[1]))
+    if not os.path.exists(live_path) or file_key(live_path)[2] != key[2]:
+        tmp_path = live_path + ".restore"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        link_or_copy(preserved_path, tmp_path)
+        os.replace(tmp_path, live_path)
+    return True
+
+# ------------------------------
+# Journal records
+# ------------------------------
+
+def _json_value(value):
+    # Property values may be NumPy scalars or arrays.
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+def _write_record(record):
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+    line = json.dumps(record, default=_json_value) + "\n"
+    # A single write in append mode, so a crash leaves at most a torn last line.
+    fd = os.open(JOURNAL_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+def _read_records():
+    if not os.path.exists(JOURNAL_PATH):
+        return []
+    records = []
+    with open(JOURNAL_PATH, "r") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # The torn last line of a write interrupted by a crash.
+                continue
+    return records
+
+def _read_operations():
+    """
+    Replays the journal and returns (operations, last_seq), where operations maps each sequence
+    number to a dict with the kind, details, session, pid, time, the file_key of every touched file
+    before (None if it did not exist) and after the operation, and its state: 'open', 'committed',
+    'aborted' or 'undone'.
+    """
+    operations = {}
+    last_seq = 0
+    for record in _read_records():
+        seq = record["seq"]
+        last_seq = max(last_seq, seq)
+        op = operations.get(seq)
+        if record["type"] == "begin":
+            operations[seq] = {
+                "seq": seq, "kind": record["kind"], "details": record["details"], "session": record["session"],
+                "pid": record["pid"], "time": record["time"], "before": {}, "after": None, "state": "open",
+            }
+        elif op is None:
+            continue
+        elif record["type"] == "preserve":
+            op["before"].update(record["files"])
+        elif record["type"] == "commit":
+            op.update(after=record["files"], state="committed")
+            op["details"].update(record["details"])
+            if op["kind"] == "undo" and op["details"]["target"] in operations:
+                operations[op["details"]["target"]]["state"] = "undone"
+        elif record["type"] == "abort":
+            op["state"] = "aborted"
+        elif record["type"] == "undo":
+            op["state"] = "undone"
+            # Undoing an undo brings its target back.
+            if op["kind"] == "undo" and op["details"]["target"] in operations:
+                operations[op["details"]["target"]]["state"] = "committed"
+    return operations, last_seq
+
+def _current_key(relative):
+    path = os.path.join(DATA_DIR, relative)
+    return file_key(path) if os.path.exists(path) else None
+
+# ------------------------------
+# Recording operations
+# ------------------------------
+
+@contextlib.contextmanager
+def operation(kind, **details):
+    """
+    Records the file writes made in the block as one journal operation of the given kind. The
+    storage writers call preserve before they first write a file, which hard-links its current
+    version into the journal; the operation is only written to the journal once it touches a file.
+    When the block ends, the state of every touched file is committed. If it raises, the touched
+    files are put back as they were and the operation is aborted. Operations started inside the
+    block are part of the outer one.
+    """
+    global _active
+    if _active is not None:
+        yield _active
+        return
+    recover()
+    _active = {"seq": None, "kind": kind, "details": details, "before": {}}
+    try:
+        yield _active
+    except BaseException:
+        if _active["seq"] is not None:
+            _roll_back(_active)
+            _write_record({"type": "abort", "seq": _active["seq"]})
+        raise
+    else:
+        if _active["seq"] is not None:
+            after = {relative: _current_key(relative) for relative in _active["before"]}
+            _write_record({"type": "commit", "seq": _active["seq"], "details": _active["details"], "files": after})
+    finally:
+        _active = None
+
+def preserve(*paths):
+    """
+    Preserves the current version of each path inside Simple_Polytope_Data before it is written
+    by the active operation, unless it was already preserved. Does nothing outside an operation.
+    """
+    if _active is None:
+        return
+    files = {}
+    for path in paths:
+        relative = os.path.relpath(path, DATA_DIR)
+        if relative.startswith(os.pardir) or relative in _active["before"]:
+            continue
+        if _active["seq"] is None:
+            _active["seq"] = _read_operations()[1] + 1
+            _write_record({
+                "type": "begin", "seq": _active["seq"], "kind": _active["kind"], "details": _active["details"],
+                "session": _session, "pid": os.getpid(), "time": time.time(),
+            })
+        key = None
+        if os.path.exists(path):
+            preserved_path = os.path.join(JOURNAL_DIR, str(_active["seq"]), relative)
+            os.makedirs(os.path.dirname(preserved_path), exist_ok=True)
+            link_or_copy(path, preserved_path)
+            key = file_key(path)
+        files[relative] = _active["before"][relative] = key
+    if files:
+        _write_record({"type": "preserve", "seq": _active["seq"], "files": files})
+
+def annotate(**details):
+    """
+    Adds details to the active operation, recorded when it commits. Does nothing outside an operation.
+    """
+    if _active is not None:
+        _active["details"].update(details)
+
+def _roll_back(op):
+    """
+    Puts every file touched by op back as it was before op and removes the files it created,
+    together with any temporary file left by a write it interrupted. Returns the number of files
+    put back and removed.
+    """
+    changed = 0
+    for relative, key in op["before"].items():
+        live_path = os.path.join(DATA_DIR, relative)
+        if os.path.exists(live_path + ".tmp"):
+            os.remove(live_path + ".tmp")
+        if key is None:
+            if os.path.exists(live_path):
+                os.remove(live_path)
+                changed += 1
+        elif _current_key(relative) != key:
+            changed += restore_file(live_path, os.path.join(JOURNAL_DIR, str(op["seq"]), relative), key)
+    return changed
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def recover(console=None):
+    """
+    Rolls back the operations that were left open by a process that crashed or was killed, so that
+    no half-finished write survives, and compacts the journal when it holds more than twice
+    KEEP_OPERATIONS operations. Runs once per process; later calls do nothing.
+    """
+    global _recovered
+    if _recovered:
+        return
+    _recovered = True
+    operations, _ = _read_operations()
+    for op in operations.values():
+        if op["state"] == "open" and not _process_alive(op["pid"]):
+            changed = _roll_back(op)
+            _write_record({"type": "abort", "seq": op["seq"]})
+            if console is not None:
+                console.print(f"[yellow]Rolled back the unfinished operation {op['seq']} ({op['kind']}): {changed} files restored.[/yellow]")
+    if len(operations) > 2 * KEEP_OPERATIONS:
+        compact_journal()
+
+def compact_journal(keep=KEEP_OPERATIONS):
+    """
+    Rewrites the journal with only the last keep committed or undone operations, the operations of
+    the current session and those still open, and deletes the preserved files of the others.
+    Returns the number of operations dropped.
+    """
+    operations, last_seq = _read_operations()
+    finished = [seq for seq, op in operations.items() if op["state"] in ("committed", "undone")]
+    kept = set(finished[len(finished) - keep:] if keep else [])
+    kept |= {
+        seq for seq, op in operations.items()
+        if op["state"] == "open" or (_session is not None and op["session"] == _session)
+    }
+    records = [record for record in _read_records() if record["seq"] in kept]
+    # Keeps the sequence numbers increasing even if every operation is dropped.
+    records.insert(0, {"type": "compact", "seq": last_seq})
+    tmp_path = JOURNAL_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.writelines(json.dumps(record, default=_json_value) + "\n" for record in records)
+    os.replace(tmp_path, JOURNAL_PATH)
+    for seq in set(operations) - kept:
+        shutil.rmtree(os.path.join(JOURNAL_DIR, str(seq)), ignore_errors=True)
+    return len(operations) - len(kept)
+
+def start_session(console):
+    """
+    Starts a session of the interactive app: recovers from a crash of the previous one and marks the
+    operations recorded from now on as part of this session, which undo_session undoes.
+    """
+    global _session
+    recover(console)
+    _session = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+
+# ------------------------------
+# Undo
+# ------------------------------
+
+def _created_edge_files(op):
+    return [
+        relative for relative, key in op["before"].items()
+        if key is None and os.path.dirname(relative) == "Edge_Data"
+    ]
+
+def _undo_add(op, console):
+    """
+    Removes the edge files created by an addition and their rows and manifest entries.
+    """
+    from polytope_app.manifest import load_manifest, save_manifest
+    from polytope_app.storage import load_database, save_database
+    created = _created_edge_files(op)
+    for relative in created:
+        path = os.path.join(DATA_DIR, relative)
+        if os.path.exists(path):
+            preserve(path)
+            os.remove(path)
+    names = {os.path.basename(relative)[:-4] for relative in created}
+    df = load_database()
+    if df is not None and 'name' in df.columns:
+        save_database(df[~df['name'].isin(names)])
+    manifest = load_manifest()
+    for relative in created:
+        manifest["files"].pop(os.path.basename(relative), None)
+    save_manifest(manifest)
+
+def _undo_add_property(op, console):
+    from polytope_app.database import drop_property
+    drop_property(op["details"]["property"], console)
+
+def _undo_remove_property(op, console):
+    """
+    Lists the property again at its former position and restores its column from the values
+    recorded when it was removed.
+    """
+    from polytope_app.database import get_property_names
+    from polytope_app.manifest import refresh_manifest_properties
+    from polytope_app.storage import load_database, save_database, write_text_atomically
+    details = op["details"]
+    prop = details["property"]
+    properties = get_property_names()
+    if prop not in properties:
+        properties.insert(min(details.get("position", len(properties)), len(properties)), prop)
+        write_text_atomically(os.path.join(DATA_DIR, "polytope_properties.txt"), "".join(p + "\n" for p in properties))
+    values = details.get("values")
+    df = load_database()
+    if values is not None and df is not None and prop not in df.columns:
+        column = min(details.get("column", len(df.columns)), len(df.columns))
+        df.insert(column, prop, [values.get(name) for name in df['name']])
+        save_database(df)
+        refresh_manifest_properties(get_property_names())
+
+# Inverse of each kind of operation, used when its files were written again by later operations.
+# The other kinds can only be undone while they are the latest change to their files.
+INVERSES = {
+    "add": _undo_add,
+    "add-property": _undo_add_property,
+    "remove-property": _undo_remove_property,
+}
+
+def _is_latest(op):
+    return all(_current_key(relative) == key for relative, key in op["after"].items())
+
+def _public(op):
+    # The values recorded to restore a removed property are left out.
+    details = {key: value for key, value in op["details"].items() if key != "values"}
+    return JournalOperation(op["seq"], op["kind"], details, op["session"], op["time"], op["state"], len(op["before"]))
+
+def undo_operation(console, seq=None):
+    """
+    Undoes the committed operation seq, or the last committed operation if seq is None.
+
+    If no later operation wrote its files, they are put back from the preserved versions, which
+    takes one rename or truncation per file: undoing an addition of one polytope touches its edge
+    file, the CSV export, the pending rows and the manifest, whatever the size of the database.
+    Otherwise its inverse in INVERSES is applied as a new operation, which can itself be undone.
+    Returns the undone operation as a JournalOperation, or None if it could not be undone.
+    """
+    operations, _ = _read_operations()
+    if seq is None:
+        committed = [op_seq for op_seq, op in operations.items() if op["state"] == "committed"]
+        if not committed:
+            console.print("[yellow]There is no operation to undo.[/yellow]")
+            return
+        seq = committed[-1]
+    op = operations.get(seq)
+    if op is None or op["state"] != "committed":
+        console.print(f"[red]Operation {seq} is not a committed operation of the journal.[/red]")
+        return
+    if _is_latest(op) and all(
+        _preserved_intact(os.path.join(JOURNAL_DIR, str(seq), relative), key)
+        for relative, key in op["before"].items() if key is not None
+    ):
+        changed = _roll_back(op)
+        _write_record({"type": "undo", "seq": seq})
+        console.print(f"[green]Undid operation {seq} ({op['kind']}): {changed} files restored or removed.[/green]")
+    elif op["kind"] in INVERSES:
+        with operation("undo", target=seq, target_kind=op["kind"]) as inverse:
+            INVERSES[op["kind"]](op, console)
+        if inverse["seq"] is None:
+            # The inverse had nothing left to write.
+            _write_record({"type": "undo", "seq": seq})
+        console.print(f"[green]Undid operation {seq} ({op['kind']}) by applying its inverse.[/green]")
+    else:
+        console.print(f"[red]Operation {seq} ({op['kind']}) can only be undone while no later operation has written its files.[/red]")
+        return
+    return _public(op)._replace(state="undone")
+
+def undo_session(console):
+    """
+    Undoes the committed operations of the current session, newest first. Returns the number undone.
+    """
+    undone = 0
+    while _session is not None:
+        operations, _ = _read_operations()
+        pending = [seq for seq, op in operations.items() if op["session"] == _session and op["state"] == "committed"]
+        if not pending or undo_operation(console, pending[-1]) is None:
+            break
+        undone += 1
+    return undone
+
+def list_operations(limit=None):
+    """
+    Returns the operations recorded in the journal as JournalOperation tuples, newest last, where
+    files is the number of files they touched. With limit, only the last limit operations.
+    """
+    operations = [_public(op) for op in _read_operations()[0].values()]
+    return operations[-limit:] if limit else operations
+
+def _describe(op):
+    if op.kind == "add":
+        return f"{op.details.get('count', 0)} from {op.details.get('source', '')}"
+    if op.kind == "undo":
+        return f"operation {op.details['target']} ({op.details['target_kind']})"
+    return op.details.get("property") or op.details.get("mode", "")
+
+def undo_mode(console):
+    """
+    Shows the latest operations of the journal and prompts for the one to undo.
+    """
+    operations = list_operations(limit=15)
+    if not operations:
+        console.print("[yellow]The journal is empty.[/yellow]")
+        return
+    table = Table(title="Journal")
+    for column in ("Operation", "Kind", "Details", "Time", "State"):
+        table.add_column(column)
+    for op in operations:
+        table.add_row(
+            str(op.seq), op.kind, _describe(op)[:60],
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(op.time)), op.state,
+        )
+    console.print(table)
+    seq = IntPrompt.ask("[bold cyan]Operation to undo[/bold cyan]", default=operations[-1].seq)
+    undo_operation(console, seq)
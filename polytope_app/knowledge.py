@@ -0,0 +1,225 @@
+# polytope_app/knowledge.py
+
+import os
+import hashlib
+import pickle
+from importlib import metadata
+import numpy as np
+import pandas as pd
+from itertools import chain
+from graffitiai import GraffitiAI
+
+from polytope_app.registry import PROPERTY_METADATA
+from polytope_app.storage import CSV_PATH, DATABASE_PATH, PENDING_PATH, load_database
+
+__all__ = [
+    'KNOWLEDGE_CACHE_PATH',
+    'KNOWLEDGE_TABLE_VERSION',
+    'database_content_hash',
+    'face_count_name',
+    'padded_p_vectors',
+    'p_vector_columns',
+    'coerce_timed_out_cells',
+    'build_knowledge_graffiti',
+    'load_knowledge_graffiti',
+]
+
+KNOWLEDGE_CACHE_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_knowledge.pkl")
+
+# Bump whenever build_knowledge_graffiti changes the table it prepares, so cached tables are rebuilt.
+KNOWLEDGE_TABLE_VERSION = 3
+
+# The GraffitiAI attributes describing the prepared table, restored together with it from the cache.
+CACHED_ATTRIBUTES = ('numerical_columns', 'boolean_columns', 'original_numerical_columns')
+
+# The face sizes that always get a pₖ column, as the fullerene flag and existing conjectures use them.
+BASE_FACE_SIZES = range(3, 8)
+
+_SUBSCRIPTS = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+
+def face_count_name(k):
+    """
+    Returns the column name of the number of k-gonal faces, for example 'p₁₂'.
+    """
+    return "p" + str(k).translate(_SUBSCRIPTS)
+
+def padded_p_vectors(p_vectors):
+    """
+    Turns a sequence of p-vectors [p₃, p₄, ..., pₙ] of different lengths into a zero-padded 2-D
+    integer array, whose column j holds p_(j+3), and the array of their lengths. The vectors are
+    flattened once and scattered into place with NumPy indexing, with no per-row Python work.
+    """
+    lengths = np.fromiter((len(p) for p in p_vectors), dtype=np.int64, count=len(p_vectors))
+    counts = np.fromiter(chain.from_iterable(p_vectors), dtype=np.int64, count=int(lengths.sum()))
+    padded = np.zeros((len(lengths), int(lengths.max(initial=0))), dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    padded[rows, np.arange(len(counts)) - np.repeat(starts, lengths)] = counts
+    return padded, lengths
+
+def p_vector_columns(p_vectors):
+    """
+    Returns the knowledge-table columns derived from the p-vectors, computed on the padded array of
+    padded_p_vectors: pₖ for every face size k of some polytope (and always p₃..p₇),
+    (p₃ + ... + pₙ), n and the flags 'simple polytope graph with pₖ > 0'.
+    """
+    padded, lengths = padded_p_vectors(p_vectors)
+    sizes = sorted(set(BASE_FACE_SIZES) | {j + 3 for j in np.flatnonzero(padded.any(axis=0))})
+    if padded.shape[1] < sizes[-1] - 2:
+        padded = np.pad(padded, ((0, 0), (0, sizes[-1] - 2 - padded.shape[1])))
+    columns = {face_count_name(k): padded[:, k - 3] for k in sizes}
+    columns['(p₃ + ... + pₙ)'] = padded.sum(axis=1)
+    columns['n'] = lengths + 2
+    columns.update(
+        (f'simple polytope graph with {face_count_name(k)} > 0', padded[:, k - 3] > 0) for k in sizes
+    )
+    return columns
+
+def coerce_timed_out_cells(table):
+    """
+    Turns the cells of the registered int and float properties that are not numbers (TIMED_OUT
+    cells) into NaN in place, so those columns stay numeric and are kept among the numerical
+    columns. Returns the table.
+    """
+    for name, (return_type, _) in PROPERTY_METADATA.items():
+        if return_type in ('int', 'float') and name in table.columns and table[name].dtype == object:
+            table[name] = pd.to_numeric(table[name], errors="coerce")
+    return table
+
+def build_knowledge_graffiti():
+    """
+    Loads the database into a GraffitiAI object and prepares its knowledge table for conjecturing:
+    the p-vector statistics and the columns of p_vector_columns are added, the columns are renamed to their
+    mathematical symbols, unused columns are dropped and the numerical and boolean column lists
+    are set. TIMED_OUT cells of numeric properties become NaN. Returns the GraffitiAI object.
+    """
+    # Load the database (list columns are already parsed) and initialize the GraffitiAI object
+    graffiti = GraffitiAI(knowledge_table=coerce_timed_out_cells(load_database()))
+
+    # Rename the 'p_vector' column
+    graffiti.knowledge_table.rename(columns={'p_vector': '[p₃, p₄, ..., pₙ]'}, inplace=True)
+    p_vectors = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].tolist()
+    # Add properties to the knowledge table.
+    graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(np.array)
+    graffiti.add_statistics(['[p₃, p₄, ..., pₙ]'])
+    graffiti.knowledge_table.rename(columns={'order': 'V'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'size': 'E'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'simple_polytope_graph_with_p6_zero': 'simple polytope graph with p₆ = 0'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'simple_polytope_graph': 'simple polytope graph'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'mostly_zeros([p₃, p₄, ..., pₙ])': 'simple polytope graph with at least 70% of p₃, p₄, ..., pₙ equal to zero'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'first_index_half_cumsum([p₃, p₄, ..., pₙ])': 'min{k : p₃ + ... + pₖ ≥ ½ (p₃ + ... + pₙ)}'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'variance([p₃, p₄, ..., pₙ])': 'σ²(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'std_dev([p₃, p₄, ..., pₙ])': 'σ(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'max([p₃, p₄, ..., pₙ])': 'max(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'min([p₃, p₄, ..., pₙ])': 'min(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'mean([p₃, p₄, ..., pₙ])': 'μ(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'median_absolute_deviation([p₃, p₄, ..., pₙ])': 'MAD(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'count_even([p₃, p₄, ..., pₙ])': 'count_even(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'count_odd([p₃, p₄, ..., pₙ])': 'count_odd(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'count_zero([p₃, p₄, ..., pₙ])': 'count_zero(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'count_non_zero([p₃, p₄, ..., pₙ])': 'count_non_zero(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'unique_count([p₃, p₄, ..., pₙ])': '|{pₖ : 3 ≤ k ≤ n}|'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'range([p₃, p₄, ..., pₙ])': '(max{pₖ : 3 ≤ k ≤ n} - min{pₖ : 3 ≤ k ≤ n})'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'median([p₃, p₄, ..., pₙ])': 'median(p₃,..., pₙ)'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'zeros_clustered([p₃, p₄, ..., pₙ])': 'simple polytope graph with at least 50% of zero values in the p-vector clustered contiguously'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'domination_number': 'γ'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'independence_number': 'α'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'total_domination_number': 'γₜ'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'vertex_cover_number': 'β'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'matching_number': 'μ'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'diameter': 'diam'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'girth': 'g'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'radius': 'rad'}, inplace=True)
+    graffiti.knowledge_table.rename(columns={'zero_adjacency_eigenvalue_count': 'count_zero(λ₁, λ₂, ..., λₙ)'}, inplace=True)
+    face_columns = p_vector_columns(p_vectors)
+    graffiti.knowledge_table = pd.concat(
+        [graffiti.knowledge_table, pd.DataFrame(face_columns, index=graffiti.knowledge_table.index)], axis=1,
+    )
+
+    # graffiti.knowledge_table['k with pk > 0'] = graffiti.knowledge_table['[p₃, p₄, ..., pₙ]'].apply(lambda x: [k for k in range(3, len(x) + 3) if x[k - 3] > 0])
+
+    # fullerene's only have p5 and p6 faces. To check this, we check the length of the p-vector is 4 and
+    # the first two entries are zero and the last two entries are non-zero.
+    graffiti.knowledge_table['fullerene'] = (graffiti.knowledge_table['n'] == 6) & (graffiti.knowledge_table['p₃'] == 0) & (graffiti.knowledge_table['p₄'] == 0) & (graffiti.knowledge_table['p₅'] > 0) & (graffiti.knowledge_table['p₆'] > 0)
+
+
+
+    # drop the columns that are not needed
+    graffiti.drop_columns(['[p₃, p₄, ..., pₙ]', 'length([p₃, p₄, ..., pₙ])', 'adjacency_matrix', 'E', 'simple_polytope_graph_with_p6_greater_than_zero'])
+
+    graffiti.numerical_columns = graffiti.knowledge_table.select_dtypes(include=['number']).columns.tolist()
+    graffiti.boolean_columns = graffiti.knowledge_table.select_dtypes(include='bool').columns.tolist()
+    return graffiti
+
+def _graffitiai_version():
+    try:
+        return metadata.version("graffitiai")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+def database_content_hash():
+    """
+    Returns the SHA-256 hex digest of the database contents: the CSV export, which every save and
+    insert keeps complete, or the binary file and its pending rows if there is no CSV.
+    """
+    paths = [CSV_PATH] if os.path.exists(CSV_PATH) else [DATABASE_PATH, PENDING_PATH]
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+def _cache_key():
+    return {
+        "version": KNOWLEDGE_TABLE_VERSION,
+        "graffitiai": _graffitiai_version(),
+        "database": database_content_hash(),
+    }
+
+def _read_cache(key):
+    if not os.path.exists(KNOWLEDGE_CACHE_PATH):
+        return None
+    try:
+        with open(KNOWLEDGE_CACHE_PATH, "rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cached
+
+def _write_cache(key, graffiti):
+    """
+    Writes the prepared table and its column lists atomically.
+    """
+    cached = {"key": key, "table": graffiti.knowledge_table}
+    cached.update((name, getattr(graffiti, name, None)) for name in CACHED_ATTRIBUTES)
+    tmp_path = KNOWLEDGE_CACHE_PATH + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, KNOWLEDGE_CACHE_PATH)
+
+def load_knowledge_graffiti():
+    """
+    Returns a GraffitiAI object holding the prepared knowledge table, read from the cache next to
+    the database when it was prepared from the same database contents (see database_content_hash)
+    by the same KNOWLEDGE_TABLE_VERSION and graffitiai version. Otherwise the table is rebuilt with
+    build_knowledge_graffiti and the cache is rewritten. The cache is a pickle of the table and its
+    numerical and boolean column lists.
+    """
+    key = _cache_key()
+    cached = _read_cache(key)
+    if cached is None:
+        graffiti = build_knowledge_graffiti()
+        try:
+            _write_cache(key, graffiti)
+        except OSError:
+            pass  # A read-only data directory only costs the rebuild next time.
+        return graffiti
+    graffiti = GraffitiAI(knowledge_table=cached["table"])
+    for name in CACHED_ATTRIBUTES:
+        if cached.get(name) is not None:
+            setattr(graffiti, name, cached[name])
+    return graffiti
@@ -0,0 +1,120 @@
+# polytope_app/manifest.py
+
+import os
+import json
+import hashlib
+from importlib import metadata
+import graphcalc as gc
+
+from polytope_app.journal import preserve
+from polytope_app.storage import append_line
+
+__all__ = [
+    'load_manifest',
+    'save_manifest',
+    'edge_file_hash',
+    'graphcalc_version',
+    'manifest_entry',
+    'is_entry_current',
+    'record_manifest_entries',
+    'refresh_manifest_properties',
+]
+
+MANIFEST_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_manifest.json")
+# Entries recorded since the manifest was last saved, one JSON object of filename -> entry per line.
+MANIFEST_PENDING_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_manifest.pending.jsonl")
+
+def graphcalc_version():
+    """
+    Returns the installed graphcalc version string.
+    """
+    try:
+        return metadata.version("graphcalc")
+    except metadata.PackageNotFoundError:
+        return getattr(gc, "__version__", "unknown")
+
+def edge_file_hash(filename):
+    """
+    Returns the SHA-256 hex digest of the contents of an edge list file in Edge_Data.
+    """
+    file_path = os.path.join("Simple_Polytope_Data", "Edge_Data", filename)
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_manifest():
+    """
+    Loads the manifest stored next to simple_polytope_properties.csv.
+    The manifest maps each edge file name to the content hash, property list and graphcalc version
+    used to compute its row, with the entries recorded since it was saved applied on top. Returns an
+    empty manifest if the file is missing or unreadable.
+    """
+    manifest = {"files": {}}
+    if os.path.exists(MANIFEST_PATH):
+        try:
+            with open(MANIFEST_PATH, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {"files": {}}
+    manifest.setdefault("files", {})
+    if os.path.exists(MANIFEST_PENDING_PATH):
+        with open(MANIFEST_PENDING_PATH, "r") as f:
+            for line in f:
+                if line.strip():
+                    manifest["files"].update(json.loads(line))
+    return manifest
+
+def save_manifest(manifest):
+    """
+    Writes the manifest atomically so readers never see a half-written file. The recorded entries
+    are now part of it, so their file is removed.
+    """
+    preserve(MANIFEST_PATH, MANIFEST_PENDING_PATH)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+    if os.path.exists(MANIFEST_PENDING_PATH):
+        os.remove(MANIFEST_PENDING_PATH)
+
+def manifest_entry(filename, property_names, file_hash=None):
+    """
+    Builds the manifest entry describing how the row for filename was computed.
+    """
+    return {
+        "hash": file_hash if file_hash is not None else edge_file_hash(filename),
+        "properties": list(property_names),
+        "graphcalc_version": graphcalc_version(),
+    }
+
+def is_entry_current(manifest, filename, file_hash, property_names):
+    """
+    Returns True if the manifest entry for filename matches the current inputs of its row.
+    """
+    entry = manifest["files"].get(filename)
+    return (
+        entry is not None
+        and entry.get("hash") == file_hash
+        and entry.get("properties") == list(property_names)
+        and entry.get("graphcalc_version") == graphcalc_version()
+    )
+
+def record_manifest_entries(filenames, property_names):
+    """
+    Records fresh manifest entries for the given edge files by appending them to the pending
+    entries, without reading or rewriting the manifest.
+    """
+    entries = {filename: manifest_entry(filename, property_names) for filename in filenames}
+    if entries:
+        append_line(MANIFEST_PENDING_PATH, json.dumps(entries) + "\n")
+
+def refresh_manifest_properties(property_names):
+    """
+    Updates the property list of every manifest entry after a column was added to or removed from
+    every row of the database, so that incremental recomputes do not treat those rows as stale.
+    """
+    manifest = load_manifest()
+    if not manifest["files"]:
+        return
+    for entry in manifest["files"].values():
+        entry["properties"] = list(property_names)
+    save_manifest(manifest)
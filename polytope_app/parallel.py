@@ -0,0 +1,42 @@
+# polytope_app/parallel.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from rich.progress import track
+
+__all__ = [
+    'default_worker_count',
+    'parallel_map',
+]
+
+def default_worker_count():
+    """
+    Returns the number of worker processes to use when none is requested explicitly.
+    """
+    return os.cpu_count() or 1
+
+def parallel_map(func, items, workers=None, description="Working...", chunksize=None, use_pool=False):
+    """
+    Applies func to every item using a pool of worker processes and returns the results
+    as a list in the same order as items, while showing a progress bar.
+
+    func must be a module-level function so that it can be sent to the workers.
+    With a single worker the items are processed in this process without a pool, unless use_pool
+    is set: func then runs in one pool worker, away from the progress bar's refresh thread, which
+    it needs if it forks processes of its own (budget.run_with_budget).
+    """
+    items = list(items)
+    if workers is None:
+        workers = default_worker_count()
+    workers = max(1, min(int(workers), len(items) or 1))
+
+    if workers == 1 and not use_pool:
+        return [func(item) for item in track(items, description=description)]
+
+    if chunksize is None:
+        # Small chunks keep the workers balanced when a few large graphs dominate the run.
+        chunksize = max(1, len(items) // (workers * 16))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(func, items, chunksize=chunksize)
+        return list(track(results, total=len(items), description=description))
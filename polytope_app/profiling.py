@@ -0,0 +1,101 @@
+# polytope_app/profiling.py
+
+import os
+import time
+import tracemalloc
+from datetime import datetime
+import pandas as pd
+from rich.table import Table
+
+from polytope_app.registry import evaluate_property
+
+__all__ = [
+    'measure_property',
+    'write_measurements',
+    'print_profile_summary',
+]
+
+PROFILE_DIR = "profiles"
+
+def measure_property(spec, context, track_memory=False, budget=None):
+    """
+    Evaluates one property like evaluate_property and also returns a measurement record with
+    its wall time and, if track_memory is set, the peak Python heap memory used while computing it.
+    Intermediates shared through the GraphContext are charged to the first property that needs them.
+    Memory used inside an isolated worker (see evaluate_property) is not tracked.
+    """
+    if track_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    value = evaluate_property(spec, context, budget)
+    record = {"property": spec.name, "seconds": time.perf_counter() - start}
+    if track_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        record["peak_memory_kib"] = peak / 1024
+    return value, record
+
+def write_measurements(records, label):
+    """
+    Writes the raw per-property, per-graph measurements to profiles/<timestamp>_<label>.csv
+    and returns the path, so runs can be compared to track regressions.
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(PROFILE_DIR, f"{timestamp}_{label}.csv")
+    df = pd.DataFrame(records)
+    leading = [column for column in ("name", "order", "property") if column in df.columns]
+    df = df[leading + [column for column in df.columns if column not in leading]]
+    df.to_csv(path, index=False)
+    return path
+
+def print_profile_summary(records, console, top=10):
+    """
+    Prints summary tables of the measurements: the properties taking the most time,
+    how the time per graph grows with graph order, and the slowest graphs.
+    """
+    if not records:
+        console.print("[yellow]No measurements were recorded.[/yellow]")
+        return
+    df = pd.DataFrame(records)
+    total = df["seconds"].sum()
+
+    by_property = df.groupby("property")["seconds"].agg(["sum", "mean", "max"]).sort_values("sum", ascending=False)
+    table = Table(title="Time by property")
+    table.add_column("Property")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("Mean (s)", justify="right")
+    table.add_column("Max (s)", justify="right")
+    table.add_column("Share", justify="right")
+    if "peak_memory_kib" in df.columns:
+        peaks = df.groupby("property")["peak_memory_kib"].max()
+        table.add_column("Peak memory (KiB)", justify="right")
+    for prop, row in by_property.head(top).iterrows():
+        cells = [prop, f"{row['sum']:.3f}", f"{row['mean']:.4f}", f"{row['max']:.3f}", f"{row['sum'] / total:.1%}"]
+        if "peak_memory_kib" in df.columns:
+            cells.append(f"{peaks[prop]:.0f}")
+        table.add_row(*cells)
+    console.print(table)
+
+    per_graph = df.groupby(["name", "order"], as_index=False)["seconds"].sum()
+    bins = pd.cut(per_graph["order"], bins=min(8, per_graph["order"].nunique()))
+    by_order = per_graph.groupby(bins, observed=True)["seconds"].agg(["count", "mean", "max"])
+    table = Table(title="Time per graph by order")
+    table.add_column("Order")
+    table.add_column("Graphs", justify="right")
+    table.add_column("Mean (s)", justify="right")
+    table.add_column("Max (s)", justify="right")
+    for interval, row in by_order.iterrows():
+        table.add_row(str(interval), str(int(row["count"])), f"{row['mean']:.3f}", f"{row['max']:.3f}")
+    console.print(table)
+
+    slowest = per_graph.sort_values("seconds", ascending=False).head(top)
+    table = Table(title="Slowest graphs")
+    table.add_column("Name")
+    table.add_column("Order", justify="right")
+    table.add_column("Total (s)", justify="right")
+    for _, row in slowest.iterrows():
+        table.add_row(str(row["name"]), str(row["order"]), f"{row['seconds']:.3f}")
+    console.print(table)
+    console.print(f"[cyan]Total property time: {total:.2f} s over {len(per_graph)} graphs.[/cyan]")
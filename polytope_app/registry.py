@@ -0,0 +1,106 @@
+# polytope_app/registry.py
+
+from collections import namedtuple
+from functools import partial
+import networkx as nx
+import graphcalc as gc
+
+from polytope_app.budget import ISOLATED_COSTS, run_with_budget
+from polytope_app.invariants import CONTEXT_PROPERTIES
+
+__all__ = [
+    'PropertySpec',
+    'PROPERTY_METADATA',
+    'resolve_property',
+    'build_property_registry',
+    'get_property_registry',
+    'evaluate_property',
+]
+
+# A property resolved to the callable that computes it from a GraphContext.
+# source is 'context', 'graphcalc', 'networkx' or 'unresolved'.
+PropertySpec = namedtuple('PropertySpec', ['name', 'compute', 'source', 'return_type', 'cost'])
+
+# Expected return type and cost class of the known properties. The cost classes are
+# 'trivial', 'polynomial', 'spectral' and 'exponential' (NP-hard invariants).
+PROPERTY_METADATA = {
+    'simple_polytope_graph': ('bool', 'polynomial'),
+    'simple_polytope_graph_with_p6_greater_than_zero': ('bool', 'polynomial'),
+    'simple_polytope_graph_with_p6_zero': ('bool', 'polynomial'),
+    'p_vector': ('list', 'polynomial'),
+    'density': ('float', 'trivial'),
+    'diameter': ('int', 'polynomial'),
+    'radius': ('int', 'polynomial'),
+    'girth': ('int', 'polynomial'),
+    'vertex_cover_number': ('int', 'exponential'),
+    'independence_number': ('int', 'exponential'),
+    'matching_number': ('int', 'polynomial'),
+    'order': ('int', 'trivial'),
+    'size': ('int', 'trivial'),
+    'algebraic_connectivity': ('float', 'spectral'),
+    'zero_adjacency_eigenvalues_count': ('int', 'spectral'),
+    'second_largest_adjacency_eigenvalue': ('float', 'spectral'),
+    'largest_laplacian_eigenvalue': ('float', 'spectral'),
+    'smallest_adjacency_eigenvalue': ('float', 'spectral'),
+    'harmonic_index': ('float', 'trivial'),
+    'domination_number': ('int', 'exponential'),
+    'total_domination_number': ('int', 'exponential'),
+    'connected_and_bipartite': ('bool', 'polynomial'),
+}
+
+def _call_on_graph(func, context):
+    return func(context.graph)
+
+def resolve_property(name):
+    """
+    Resolves a property name to a PropertySpec.
+
+    Properties with a shared-intermediate implementation are taken from CONTEXT_PROPERTIES;
+    otherwise the name is looked up in graphcalc and then networkx. Names found in neither
+    library resolve to a spec with source 'unresolved' and no callable.
+    """
+    return_type, cost = PROPERTY_METADATA.get(name, ('unknown', 'unknown'))
+    if name in CONTEXT_PROPERTIES:
+        return PropertySpec(name, CONTEXT_PROPERTIES[name], 'context', return_type, cost)
+    for source, library in (('graphcalc', gc), ('networkx', nx)):
+        func = getattr(library, name, None)
+        if callable(func):
+            return PropertySpec(name, partial(_call_on_graph, func), source, return_type, cost)
+    return PropertySpec(name, None, 'unresolved', return_type, cost)
+
+def build_property_registry(property_names):
+    """
+    Resolves every property name once and returns the registry, a dict of name -> PropertySpec
+    in the order of property_names.
+    """
+    return {name: resolve_property(name) for name in property_names}
+
+_registry_cache = {}
+
+def get_property_registry(property_names):
+    """
+    Returns the registry for the given property list, building it only the first time that
+    list is seen (the list changes when properties are added or removed).
+    """
+    key = tuple(property_names)
+    if key not in _registry_cache:
+        _registry_cache.clear()
+        _registry_cache[key] = build_property_registry(property_names)
+    return _registry_cache[key]
+
+def evaluate_property(spec, context, budget=None):
+    """
+    Computes one property from a GraphContext by dispatching to its resolved callable.
+    Unresolved properties and errors raised while computing give None.
+
+    If a time budget (in seconds) is given, properties in the NP-hard or unknown cost classes run in an
+    isolated worker process that is killed when the budget runs out, giving TIMED_OUT.
+    """
+    if spec.compute is None:
+        return None
+    if budget and spec.cost in ISOLATED_COSTS:
+        return run_with_budget(spec.compute, context, budget)
+    try:
+        return spec.compute(context)
+    except Exception:
+        return None
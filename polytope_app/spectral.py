@@ -0,0 +1,154 @@
+# polytope_app/spectral.py
+
+import time
+import numpy as np
+
+__all__ = [
+    'BATCHED_SPECTRAL_PROPERTIES',
+    'SPARSE_SPECTRAL_PROPERTIES',
+    'use_sparse_solver',
+    'sparse_spectral_value',
+    'batched_spectra',
+    'spectral_columns',
+    'fill_spectral_columns',
+]
+
+# Spectral properties derived from the sorted adjacency (A) and Laplacian (L) spectra of a batch
+# of graphs, one row per graph. Each entry mirrors the CONTEXT_PROPERTIES entry of the same name.
+BATCHED_SPECTRAL_PROPERTIES = {
+    'algebraic_connectivity': lambda A, L: L[:, 1],
+    'largest_laplacian_eigenvalue': lambda A, L: np.abs(L).max(axis=1),
+    'second_largest_adjacency_eigenvalue': lambda A, L: A[:, -2],
+    'smallest_adjacency_eigenvalue': lambda A, L: A[:, 0],
+    'zero_adjacency_eigenvalues_count': lambda A, L: np.isclose(A, 0).sum(axis=1),
+}
+
+# Largest stack of matrices solved in one call; bigger groups are split.
+MAX_BATCH_BYTES = 256 * 1024 * 1024
+
+# Extreme-eigenvalue properties that switch to a sparse iterative solver for graphs of at least
+# SPARSE_SPECTRAL_ORDER vertices, where dense solves cost O(n^3) time and O(n^2) memory.
+# zero_adjacency_eigenvalues_count needs the whole spectrum and always uses the dense solver.
+SPARSE_SPECTRAL_PROPERTIES = (
+    'algebraic_connectivity',
+    'largest_laplacian_eigenvalue',
+    'second_largest_adjacency_eigenvalue',
+    'smallest_adjacency_eigenvalue',
+)
+SPARSE_SPECTRAL_ORDER = 1000
+# Relative accuracy requested from the Lanczos iterations (scipy's eigsh tol).
+SPARSE_TOLERANCE = 1e-10
+# Distance from the ends of the spectrum at which the shift-invert solves are centered. The
+# adjacency spectrum lies in [-D, D] and the Laplacian spectrum in [0, 2D], where D is the largest
+# degree, so shifts just outside these intervals keep the factorized matrices nonsingular while
+# separating the wanted extreme eigenvalues from near-equal neighbors (a long prism has gaps of
+# order 1/n^2 at both ends of its spectra, where plain Lanczos iterations stall).
+SPECTRAL_SHIFT = 1e-6
+
+def use_sparse_solver(order):
+    """
+    Returns True if graphs of the given order use the sparse iterative solver.
+    """
+    return SPARSE_SPECTRAL_ORDER is not None and order >= SPARSE_SPECTRAL_ORDER
+
+def sparse_spectral_value(name, adjacency, tol=None):
+    """
+    Computes one of SPARSE_SPECTRAL_PROPERTIES from an adjacency matrix (dense or SciPy sparse)
+    with scipy.sparse.linalg.eigsh in shift-invert mode, which factorizes the sparse matrix once
+    and finds the eigenvalues nearest a shift placed just beyond the wanted end of the spectrum.
+    """
+    from scipy.sparse import csc_matrix, diags
+    from scipy.sparse.linalg import eigsh
+
+    tol = SPARSE_TOLERANCE if tol is None else tol
+    A = csc_matrix(adjacency, dtype=float)
+    degrees = np.asarray(A.sum(axis=1)).ravel()
+    max_degree = degrees.max()
+
+    def nearest(matrix, sigma, k):
+        values = eigsh(matrix, k=k, sigma=sigma, which='LM', tol=tol, return_eigenvectors=False)
+        return np.sort(values)
+
+    if name == 'second_largest_adjacency_eigenvalue':
+        return float(nearest(A, max_degree + SPECTRAL_SHIFT, 2)[0])
+    if name == 'smallest_adjacency_eigenvalue':
+        return float(nearest(A, -max_degree - SPECTRAL_SHIFT, 1)[0])
+    L = (diags(degrees) - A).tocsc()
+    if name == 'largest_laplacian_eigenvalue':
+        return float(nearest(L, 2 * max_degree + SPECTRAL_SHIFT, 1)[-1])
+    if name == 'algebraic_connectivity':
+        return float(nearest(L, -SPECTRAL_SHIFT, 2)[1])
+    raise ValueError(f"'{name}' has no sparse solver.")
+
+def batched_spectra(adjacency):
+    """
+    Given a 3-D array of symmetric adjacency matrices of the same order, returns the sorted
+    adjacency and Laplacian spectra as two 2-D arrays (one row per graph), using one batched
+    symmetric eigensolve for each.
+    """
+    adjacency = np.asarray(adjacency, dtype=float)
+    laplacian = -adjacency
+    degrees = adjacency.sum(axis=2)
+    n = adjacency.shape[1]
+    laplacian[:, np.arange(n), np.arange(n)] += degrees
+    return np.linalg.eigvalsh(adjacency), np.linalg.eigvalsh(laplacian)
+
+def spectral_columns(adjacency_matrices, property_names):
+    """
+    Computes the given batched spectral properties for a list of adjacency matrices (nested lists
+    or arrays). The graphs are grouped by order, each group is stacked into a 3-D array and solved
+    in batches, and every property is derived from the spectra in one vectorized pass. Groups of
+    order SPARSE_SPECTRAL_ORDER or more use the sparse solver, one graph at a time, for the
+    properties in SPARSE_SPECTRAL_PROPERTIES. Returns a dict of property name -> list of values in
+    input order. Graphs with no matrix or too few vertices for a property get None.
+    """
+    columns = {name: [None] * len(adjacency_matrices) for name in property_names}
+    groups = {}
+    for i, matrix in enumerate(adjacency_matrices):
+        if matrix is None or len(matrix) < 2:
+            continue
+        groups.setdefault(len(matrix), []).append(i)
+
+    for order, rows in groups.items():
+        dense_names = property_names
+        if use_sparse_solver(order):
+            dense_names = [name for name in property_names if name not in SPARSE_SPECTRAL_PROPERTIES]
+            for name in property_names:
+                if name in SPARSE_SPECTRAL_PROPERTIES:
+                    for i in rows:
+                        columns[name][i] = sparse_spectral_value(name, adjacency_matrices[i])
+        if not dense_names:
+            continue
+        batch_size = max(1, MAX_BATCH_BYTES // (8 * order * order))
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            A, L = batched_spectra(np.array([adjacency_matrices[i] for i in batch], dtype=float))
+            for name in dense_names:
+                values = BATCHED_SPECTRAL_PROPERTIES[name](A, L).tolist()
+                for i, value in zip(batch, values):
+                    columns[name][i] = value
+    return columns
+
+def fill_spectral_columns(rows, property_names, measurements=None):
+    """
+    Fills in the batched spectral properties of database rows (dicts holding an 'adjacency_matrix'
+    entry) in place. If a measurements list is given, the batch time is shared evenly among the rows
+    and recorded like per-property measurements.
+    """
+    property_names = [name for name in property_names if name in BATCHED_SPECTRAL_PROPERTIES]
+    rows = [row for row in rows if row]
+    if not property_names or not rows:
+        return
+    start = time.perf_counter()
+    columns = spectral_columns([row.get('adjacency_matrix') for row in rows], property_names)
+    seconds = (time.perf_counter() - start) / (len(rows) * len(property_names))
+    for i, row in enumerate(rows):
+        for name in property_names:
+            row[name] = columns[name][i]
+            if measurements is not None:
+                measurements.append({
+                    "name": row.get('name'),
+                    "order": len(row.get('adjacency_matrix') or []),
+                    "property": name,
+                    "seconds": seconds,
+                })
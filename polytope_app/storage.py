@@ -0,0 +1,480 @@
+# polytope_app/storage.py
+
+import os
+import ast
+import csv
+import json
+import shutil
+from itertools import chain, islice
+import numpy as np
+import pandas as pd
+
+from polytope_app.budget import TIMED_OUT, is_timed_out
+from polytope_app.journal import file_key, preserve
+
+__all__ = [
+    'DATABASE_PATH',
+    'CSV_PATH',
+    'database_exists',
+    'load_database',
+    'load_list_column',
+    'save_database',
+    'insert_row',
+    'append_rows',
+    'append_line',
+    'export_csv',
+    'write_text_atomically',
+]
+
+DATABASE_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.npz")
+CSV_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.csv")
+# Rows inserted since the binary file was last written, one JSON object per line.
+PENDING_PATH = os.path.join("Simple_Polytope_Data", "simple_polytope_properties.pending.jsonl")
+
+FORMAT_VERSION = 1
+
+# ------------------------------
+# Column encoding
+# ------------------------------
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+def _is_typed_array(series):
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf"
+
+def _is_list_like(value):
+    return isinstance(value, (list, tuple, np.ndarray))
+
+def _inner_tuples(values):
+    """
+    Returns True if the list-valued entries hold tuples (e.g. the edgelist column), so they can be
+    restored as tuples when decoded.
+    """
+    for value in values:
+        if isinstance(value, (list, tuple)) and len(value) > 0:
+            return isinstance(value[0], tuple)
+    return False
+
+def _encode_column(key, series, arrays):
+    """
+    Stores one column under the given key prefix and returns its metadata.
+
+    Typed numeric and boolean columns are stored as a single array. Columns of lists (edgelist,
+    adjacency_matrix, p_vector, ...) are stored as one flat array of values plus per-row offsets
+    and shapes. Other object columns are stored as values plus a missing-value mask.
+    Cells holding TIMED_OUT are treated as missing and recorded in a separate mask.
+    """
+    if _is_typed_array(series):
+        arrays[f"{key}.values"] = series.to_numpy()
+        return {"kind": "array"}
+
+    values = series.tolist()
+    timed_out = np.array([is_timed_out(v) for v in values], dtype=bool)
+    if timed_out.any():
+        arrays[f"{key}.timed_out"] = timed_out
+        values = [None if t else v for v, t in zip(values, timed_out)]
+    present = [v for v in values if not _is_missing(v)]
+    if not present:
+        return {"kind": "none"}
+
+    if all(_is_list_like(v) for v in present):
+        rows = [None if _is_missing(v) else np.asarray(v) for v in values]
+        ndim = max(row.ndim for row in rows if row is not None)
+        shapes = np.full((len(rows), ndim), -1, dtype=np.int64)
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        for i, row in enumerate(rows):
+            size = 0
+            if row is not None:
+                shapes[i, :row.ndim] = row.shape
+                size = row.size
+            offsets[i + 1] = offsets[i] + size
+        flat_rows = [row.ravel() for row in rows if row is not None and row.size]
+        flat = np.concatenate(flat_rows) if flat_rows else np.zeros(0, dtype=np.int64)
+        arrays[f"{key}.values"] = flat
+        arrays[f"{key}.offsets"] = offsets
+        arrays[f"{key}.shapes"] = shapes
+        ndims = np.array([-1 if row is None else row.ndim for row in rows], dtype=np.int8)
+        arrays[f"{key}.ndims"] = ndims
+        return {"kind": "ragged", "tuples": _inner_tuples(present)}
+
+    mask = np.array([_is_missing(v) for v in values], dtype=bool)
+    if all(isinstance(v, (bool, np.bool_, int, np.integer, float, np.floating)) for v in present):
+        filler = present[0]
+        arrays[f"{key}.values"] = np.asarray([filler if m else v for v, m in zip(values, mask)])
+    else:
+        arrays[f"{key}.values"] = np.asarray(["" if m else str(v) for v, m in zip(values, mask)])
+    arrays[f"{key}.mask"] = mask
+    return {"kind": "masked"}
+
+def _decode_column(key, meta, data, n_rows):
+    column = _decode_values(key, meta, data, n_rows)
+    if f"{key}.timed_out" in data:
+        column = [TIMED_OUT if t else v for v, t in zip(column, data[f"{key}.timed_out"])]
+    return column
+
+def _decode_values(key, meta, data, n_rows):
+    kind = meta["kind"]
+    if kind == "array":
+        return data[f"{key}.values"]
+    if kind == "none":
+        return [None] * n_rows
+    if kind == "masked":
+        values = data[f"{key}.values"].tolist()
+        mask = data[f"{key}.mask"]
+        return [None if m else v for v, m in zip(values, mask)]
+
+    flat = data[f"{key}.values"]
+    offsets = data[f"{key}.offsets"]
+    shapes = data[f"{key}.shapes"]
+    ndims = data[f"{key}.ndims"]
+    column = []
+    for i in range(n_rows):
+        if ndims[i] < 0:
+            column.append(None)
+            continue
+        value = flat[offsets[i]:offsets[i + 1]].reshape(shapes[i, :ndims[i]]).tolist()
+        if meta.get("tuples"):
+            value = [tuple(item) for item in value]
+        column.append(value)
+    return column
+
+# ------------------------------
+# Database files
+# ------------------------------
+
+def database_exists():
+    """
+    Returns True if the database exists in the binary format or as a CSV file.
+    """
+    return os.path.exists(DATABASE_PATH) or os.path.exists(CSV_PATH)
+
+def _parse_scalar(value):
+    if value in ("True", "False"):
+        return value == "True"
+    for parse in (int, float):
+        try:
+            return parse(value)
+        except ValueError:
+            pass
+    return value
+
+def _read_csv_database():
+    """
+    Reads the CSV export, turning its Python-literal list columns back into lists and
+    restoring the values of columns that contain TIMED_OUT cells.
+    """
+    df = pd.read_csv(CSV_PATH, float_precision="round_trip")
+    for column in df.columns:
+        if _is_typed_array(df[column]):
+            continue
+        present = df[column].dropna()
+        present = present[~present.map(is_timed_out)]
+        if len(present) and present.map(lambda v: isinstance(v, str) and v.startswith(("[", "("))).all():
+            df[column] = df[column].map(
+                lambda v: v if is_timed_out(v) else ast.literal_eval(v) if isinstance(v, str) else None
+            )
+        elif len(present) < len(df[column].dropna()):
+            df[column] = df[column].map(
+                lambda v: None if _is_missing(v) else v if is_timed_out(v) else _parse_scalar(v)
+            ).astype(object)
+    return df
+
+def _binary_is_current():
+    """
+    Returns True if the binary file (together with the pending rows) holds the same data as the CSV.
+    The CSV is newer when it was replaced outside the app, for example after pulling changes.
+    """
+    if not os.path.exists(DATABASE_PATH):
+        return False
+    if not os.path.exists(CSV_PATH):
+        return True
+    written = os.path.getmtime(DATABASE_PATH)
+    if os.path.exists(PENDING_PATH):
+        written = max(written, os.path.getmtime(PENDING_PATH))
+    return os.path.getmtime(CSV_PATH) <= written
+
+def _read_pending_rows():
+    """
+    Returns the rows inserted since the binary file was written, keeping the last row for each name.
+    """
+    if not os.path.exists(PENDING_PATH):
+        return []
+    rows = {}
+    with open(PENDING_PATH, "r") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                rows.pop(row.get("name"), None)
+                rows[row.get("name")] = row
+    return list(rows.values())
+
+def _read_binary_database():
+    with np.load(DATABASE_PATH, allow_pickle=False) as data:
+        meta = json.loads(str(data["__meta__"]))
+        n_rows = meta["rows"]
+        columns = {
+            column["name"]: _decode_column(f"c{i}", column, data, n_rows)
+            for i, column in enumerate(meta["columns"])
+        }
+    df = pd.DataFrame(columns, index=pd.RangeIndex(n_rows))
+    pending = _read_pending_rows()
+    if not pending:
+        return df
+    pending = pd.DataFrame(pending, columns=df.columns)
+    for column in meta["columns"]:
+        if column.get("tuples"):
+            pending[column["name"]] = pending[column["name"]].map(
+                lambda v: [tuple(item) for item in v] if isinstance(v, list) else v
+            )
+    df = df[~df["name"].isin(pending["name"])]
+    return pd.concat([df, pending], ignore_index=True)
+
+def load_database():
+    """
+    Loads the polytope database as a DataFrame whose list-valued columns hold Python lists.
+
+    The binary columnar file is read when present. If only the CSV exists, or the CSV is newer
+    (for example after pulling changes), the CSV is read instead. Returns None if neither exists.
+    """
+    if _binary_is_current():
+        return _read_binary_database()
+    if os.path.exists(CSV_PATH):
+        return _read_csv_database()
+    return None
+
+def load_list_column(name):
+    """
+    Reads a single list-valued column (e.g. 'edgelist') from the binary file in bulk and returns it
+    as a list of NumPy arrays, one per row, that are views into one flat buffer. Returns None if the
+    binary file is missing or stale, rows were inserted since it was written, or the column is not
+    stored as a list column.
+    """
+    if not _binary_is_current() or os.path.exists(PENDING_PATH):
+        return None
+    with np.load(DATABASE_PATH, allow_pickle=False) as data:
+        meta = json.loads(str(data["__meta__"]))
+        names = [column["name"] for column in meta["columns"]]
+        if name not in names or meta["columns"][names.index(name)]["kind"] != "ragged":
+            return None
+        key = f"c{names.index(name)}"
+        flat = data[f"{key}.values"]
+        offsets = data[f"{key}.offsets"]
+        shapes = data[f"{key}.shapes"]
+        ndims = data[f"{key}.ndims"]
+    rows = np.split(flat, offsets[1:-1])
+    return [
+        None if ndim < 0 else row.reshape(shape[:ndim])
+        for row, shape, ndim in zip(rows, shapes, ndims)
+    ]
+
+def write_text_atomically(path, text):
+    """
+    Writes text to path through a temporary file and os.replace, so that the file is never seen
+    half-written and is never modified in place: the hard links of a session snapshot keep the
+    previous contents. Inside a journal operation, the previous version is preserved first.
+    """
+    preserve(path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def export_csv(df, path=CSV_PATH):
+    """
+    Writes the database as a CSV file, with list-valued columns as Python literals.
+    """
+    preserve(path)
+    tmp_path = path + ".tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def save_database(df, export=True):
+    """
+    Saves the database in the binary columnar format and, unless export is False, also exports
+    it as simple_polytope_properties.csv. Both files are replaced atomically.
+    """
+    df = df.reset_index(drop=True)
+    if export:
+        # The CSV is written first so that the binary file is never older than its export.
+        export_csv(df)
+
+    arrays = {}
+    columns = []
+    for i, name in enumerate(df.columns):
+        meta = _encode_column(f"c{i}", df[name], arrays)
+        meta["name"] = name
+        columns.append(meta)
+    meta = {"version": FORMAT_VERSION, "rows": len(df), "columns": columns}
+    arrays["__meta__"] = np.array(json.dumps(meta))
+
+    preserve(DATABASE_PATH, PENDING_PATH)
+    tmp_path = DATABASE_PATH + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, DATABASE_PATH)
+    # The binary file now includes every pending row.
+    if os.path.exists(PENDING_PATH):
+        os.remove(PENDING_PATH)
+
+# ------------------------------
+# Single-row inserts
+# ------------------------------
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+def append_line(path, line):
+    """
+    Appends line to path with a single write in append mode, so concurrent readers never see a
+    partial line. Inside a journal operation, the previous version is preserved first.
+    """
+    preserve(path)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+def _csv_lines(rows, header):
+    # Formatted like the rows of a full export, except that each cell keeps its own type.
+    return pd.DataFrame(rows, columns=header, dtype=object).to_csv(header=False, index=False)
+
+def _csv_header():
+    with open(CSV_PATH, "r", newline="") as f:
+        return next(csv.reader(f), [])
+
+# (key, names): the set of names in the database and the file keys of the binary file and the
+# pending rows it was read from. insert_row adds to it, so consecutive inserts read neither file.
+_names_cache = None
+
+def _database_key():
+    return [file_key(path) if os.path.exists(path) else None for path in (DATABASE_PATH, PENDING_PATH)]
+
+def _stored_names():
+    """
+    Returns the set of names in the database. It is read from the name column of the binary file
+    and the pending rows only when they changed since the last call or insert_row.
+    """
+    global _names_cache
+    key = _database_key()
+    if _names_cache is None or _names_cache[0] != key:
+        _names_cache = (key, _read_stored_names())
+    return _names_cache[1]
+
+def _read_stored_names():
+    with np.load(DATABASE_PATH, allow_pickle=False) as data:
+        meta = json.loads(str(data["__meta__"]))
+        names = [column["name"] for column in meta["columns"]]
+        if "name" not in names:
+            return set()
+        names = set(_decode_column(f"c{names.index('name')}", meta["columns"][names.index("name")], data, meta["rows"]))
+    return names | {row.get("name") for row in _read_pending_rows()}
+
+def _replace_csv_row(name, line, header):
+    """
+    Streams the CSV to a temporary file with the row named name replaced by line, then swaps it in.
+    """
+    position = header.index("name")
+    preserve(CSV_PATH)
+    tmp_path = CSV_PATH + ".tmp"
+    with open(CSV_PATH, "r", newline="") as src, open(tmp_path, "w", newline="") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst, lineterminator="\n")
+        writer.writerow(next(reader))
+        for record in reader:
+            if len(record) > position and record[position] == name:
+                dst.write(line)
+            else:
+                writer.writerow(record)
+    os.replace(tmp_path, CSV_PATH)
+
+def insert_row(row):
+    """
+    Adds one row (a dict of column -> value) to the database, replacing the row with the same name
+    if there is one, without loading the table. Returns True if an existing row was replaced.
+
+    The row is appended to the CSV export (or swapped in with an atomic rewrite when replacing) and
+    then to a pending-rows file that load_database applies on top of the binary file, until the next
+    save_database folds it in. The names in the database are kept in memory between inserts, so an
+    insert reads neither file. If the files are missing or out of date, or the row does not have the
+    CSV's columns, the whole database is loaded and saved instead.
+    """
+    header = _csv_header() if os.path.exists(CSV_PATH) else []
+    if not _binary_is_current() or sorted(header) != sorted(row):
+        df = load_database()
+        if df is None:
+            df = pd.DataFrame()
+        replaced = 'name' in df.columns and row['name'] in df['name'].values
+        if replaced:
+            df = df[df['name'] != row['name']]
+        save_database(pd.concat([df, pd.DataFrame([row])], ignore_index=True))
+        return replaced
+
+    global _names_cache
+    line = _csv_lines([row], header)
+    names = _stored_names()
+    replaced = row['name'] in names
+    if replaced:
+        _replace_csv_row(row['name'], line, header)
+    else:
+        append_line(CSV_PATH, line)
+    # Written after the CSV, so the pending rows are never older than the export they belong to.
+    append_line(PENDING_PATH, json.dumps(row, default=_json_default) + "\n")
+    names.add(row['name'])
+    _names_cache = (_database_key(), names)
+    return replaced
+
+def append_rows(rows, chunk_size=1000):
+    """
+    Appends new rows (an iterable of dicts, none of whose names are in the database yet) in one batch
+    without loading the table, and returns the number of rows appended.
+
+    The rows are streamed in chunks into copies of the CSV export and of the pending-rows file, which
+    then replace the originals, so readers see either none or all of the new rows. If the files are
+    missing or out of date, or the rows do not have the CSV's columns, the whole database is loaded
+    and saved instead.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+    rows = chain([first], rows)
+    header = _csv_header() if os.path.exists(CSV_PATH) else []
+    if not _binary_is_current() or sorted(header) != sorted(first):
+        df = load_database()
+        new = pd.DataFrame(list(rows))
+        save_database(new if df is None else pd.concat([df, new], ignore_index=True))
+        return len(new)
+
+    csv_tmp = CSV_PATH + ".tmp"
+    pending_tmp = PENDING_PATH + ".tmp"
+    count = 0
+    try:
+        shutil.copyfile(CSV_PATH, csv_tmp)
+        if os.path.exists(PENDING_PATH):
+            shutil.copyfile(PENDING_PATH, pending_tmp)
+        with open(csv_tmp, "a", newline="") as csv_file, open(pending_tmp, "a") as pending_file:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                if any(sorted(row) != sorted(header) for row in chunk):
+                    raise ValueError("The new rows do not have the columns of the database.")
+                csv_file.write(_csv_lines(chunk, header))
+                pending_file.writelines(json.dumps(row, default=_json_default) + "\n" for row in chunk)
+                count += len(chunk)
+    except BaseException:
+        for path in (csv_tmp, pending_tmp):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    preserve(CSV_PATH, PENDING_PATH)
+    os.replace(csv_tmp, CSV_PATH)
+    # Replaced after the CSV, so the pending rows are never older than the export they belong to.
+    os.replace(pending_tmp, PENDING_PATH)
+    return count
@@ -0,0 +1,195 @@
+# polytope_app/validation.py
+
+from collections import namedtuple
+import numpy as np
+import networkx as nx
+
+from polytope_app.faces import enumerate_faces
+from polytope_app.parallel import parallel_map
+
+__all__ = [
+    'ValidationResult',
+    'VALIDATION_STAGES',
+    'validate_simple_polytope',
+    'validate_edge_arrays',
+    'validate_graphs',
+]
+
+# Outcome of validating one graph: stage is the first check that failed (None for a valid simple
+# polytope graph) and reason explains the failure.
+ValidationResult = namedtuple('ValidationResult', ['valid', 'stage', 'reason'])
+
+# The checks in the order they run, cheapest first. Each one may assume the ones before it passed.
+VALIDATION_STAGES = ('simple', '3-regular', 'edge count', 'connected', 'planar', '3-connected')
+
+VALID = ValidationResult(True, None, None)
+
+def _failure(stage, reason):
+    return ValidationResult(False, stage, reason)
+
+def _check_simple(G):
+    if G.number_of_nodes() == 0:
+        return "the graph is empty"
+    if G.is_directed():
+        return "the graph is directed"
+    loops = nx.number_of_selfloops(G)
+    if loops:
+        return f"{loops} self-loop(s), for example at vertex {next(nx.nodes_with_selfloops(G))}"
+    if G.is_multigraph():
+        for u, v in G.edges():
+            if G.number_of_edges(u, v) > 1:
+                return f"multiple edges between {u} and {v}"
+    return None
+
+def _check_cubic(G):
+    for v, degree in G.degree():
+        if degree != 3:
+            return f"vertex {v} has degree {degree}"
+    return None
+
+def _check_edge_count(G):
+    n, m = G.number_of_nodes(), G.number_of_edges()
+    if 2 * m != 3 * n:
+        return f"{m} edges for {n} vertices, expected 3V/2"
+    return None
+
+def _check_connected(G):
+    components = nx.number_connected_components(G)
+    if components > 1:
+        return f"the graph has {components} connected components"
+    return None
+
+def _check_three_connected(embedding):
+    """
+    A connected cubic plane graph is 3-connected exactly when it is 3-edge-connected (vertex and
+    edge connectivity agree for cubic graphs), and its minimal edge cuts are the cycles of the dual
+    graph. So it is 3-connected if and only if the dual is simple: no edge has the same face on
+    both sides (a bridge) and no two faces share two edges (a 2-edge cut). Runs in O(E) on the
+    face walk of the embedding.
+    """
+    _, face_of = enumerate_faces(embedding)
+    darts = list(embedding.edges())
+    index = {dart: i for i, dart in enumerate(darts)}
+    twin = np.fromiter((index[(w, v)] for v, w in darts), dtype=np.int64, count=len(darts))
+    left, right = face_of, face_of[twin]
+    bridges = np.flatnonzero(left == right)
+    if len(bridges):
+        u, v = darts[bridges[0]]
+        return f"edge ({u}, {v}) is a bridge"
+    # Each edge appears as two darts; keep the one with the smaller face on its left.
+    pairs = np.stack([left, right], axis=1)[left < right]
+    unique, counts = np.unique(pairs, axis=0, return_counts=True)
+    if len(unique) and counts.max() > 1:
+        # Two edges with faces a and b on their sides form a 2-edge cut. The walk around face a from
+        # the head of the first to the tail of the second uses neither, so those two ends lie on the
+        # same side, which has at least four vertices in a simple cubic graph without bridges.
+        a, b = unique[counts.argmax()]
+        first, second = np.flatnonzero((left == a) & (right == b))[:2]
+        (u1, v1), (u2, v2) = darts[first], darts[second]
+        return f"removing vertices {v1} and {u2} disconnects the graph (edges ({u1}, {v1}) and ({u2}, {v2}) form a 2-edge cut)"
+    return None
+
+def validate_simple_polytope(G, planarity=None):
+    """
+    Checks whether G is a simple polytope graph (the same test as gc.simple_polytope_graph) by
+    running the VALIDATION_STAGES in order and stopping at the first failure. The last stage tests
+    3-connectivity in linear time from the planar embedding found by the planarity stage; pass the
+    result of nx.check_planarity(G) as planarity to reuse one. Returns a ValidationResult.
+    """
+    for stage, check in (
+        ('simple', _check_simple),
+        ('3-regular', _check_cubic),
+        ('edge count', _check_edge_count),
+        ('connected', _check_connected),
+    ):
+        reason = check(G)
+        if reason is not None:
+            return _failure(stage, reason)
+    is_planar, embedding = planarity if planarity is not None else nx.check_planarity(G)
+    if not is_planar:
+        return _failure('planar', "the graph is not planar")
+    reason = _check_three_connected(embedding)
+    if reason is not None:
+        return _failure('3-connected', reason)
+    return VALID
+
+def validate_edge_arrays(edge_arrays):
+    """
+    Runs the counting stages (simple, 3-regular, edge count) on a batch of graphs given as (E, 2)
+    integer edge arrays, in a few NumPy operations over the whole batch. Repeated edges are counted
+    once, as in the networkx graph built from the list. Returns a list holding a failed
+    ValidationResult for each graph rejected here and None for the graphs that still need the
+    graph-search stages.
+    """
+    arrays = [np.asarray(edges, dtype=np.int64).reshape(-1, 2) for edges in edge_arrays]
+    if not any(len(edges) for edges in arrays):
+        return [_failure('simple', "the graph is empty") for _ in arrays]
+    edges = np.concatenate(arrays)
+    graph_of = np.repeat(np.arange(len(arrays)), [len(edges) for edges in arrays])
+
+    # One row per distinct edge, as (graph, smaller end, larger end).
+    keys = np.unique(np.stack([graph_of, edges.min(axis=1), edges.max(axis=1)], axis=1), axis=0)
+    graph_of = keys[:, 0]
+    sizes = np.bincount(graph_of, minlength=len(arrays))
+    loops = np.bincount(graph_of[keys[:, 1] == keys[:, 2]], minlength=len(arrays))
+
+    # Number the vertices of every graph apart from those of the other graphs.
+    ends = np.concatenate([keys[:, [0, 1]], keys[:, [0, 2]]])
+    vertices, vertex = np.unique(ends, axis=0, return_inverse=True)
+    orders = np.bincount(vertices[:, 0], minlength=len(arrays))
+    degrees = np.bincount(vertex.ravel(), minlength=len(vertices))
+    irregular = np.bincount(vertices[degrees != 3, 0], minlength=len(arrays))
+
+    results = [None] * len(arrays)
+    for g in range(len(arrays)):
+        if sizes[g] == 0:
+            results[g] = _failure('simple', "the graph is empty")
+        elif loops[g]:
+            results[g] = _failure('simple', f"{loops[g]} self-loop(s)")
+        elif irregular[g]:
+            results[g] = _failure('3-regular', f"{irregular[g]} vertices do not have degree 3")
+        elif 2 * sizes[g] != 3 * orders[g]:
+            results[g] = _failure('edge count', f"{sizes[g]} edges for {orders[g]} vertices, expected 3V/2")
+    return results
+
+def _validate_worker(graph):
+    if not isinstance(graph, nx.Graph):
+        edges = graph
+        graph = nx.Graph()
+        graph.add_edges_from(edges.tolist())
+    return validate_simple_polytope(graph)
+
+def validate_graphs(graphs, workers=None, description="Validating graphs..."):
+    """
+    Validates a batch of graphs, given as networkx graphs or edge lists, and returns one
+    ValidationResult per graph in order. The counting stages run vectorized over the whole batch
+    with validate_edge_arrays, and only the graphs that pass them are sent to a pool of worker
+    processes for the connectivity, planarity and 3-connectivity stages.
+    """
+    graphs = list(graphs)
+    results = [None] * len(graphs)
+    edge_arrays = []
+    for i, G in enumerate(graphs):
+        if isinstance(G, nx.Graph):
+            if G.is_directed() or G.is_multigraph() or nx.number_of_isolates(G):
+                # Not described by its edge array alone; validated on its own.
+                results[i] = validate_simple_polytope(G)
+            index = {v: k for k, v in enumerate(G.nodes())}
+            edges = [(index[u], index[v]) for u, v in G.edges()]
+        else:
+            edges = G
+        edge_arrays.append(np.asarray(edges, dtype=np.int64).reshape(-1, 2))
+
+    counted = validate_edge_arrays(edge_arrays)
+    remaining = []
+    for i, result in enumerate(counted):
+        if results[i] is None:
+            if result is not None:
+                results[i] = result
+            else:
+                remaining.append(i)
+    items = [graphs[i] if isinstance(graphs[i], nx.Graph) else edge_arrays[i] for i in remaining]
+    checked = parallel_map(_validate_worker, items, workers=workers, description=description)
+    for i, result in zip(remaining, checked):
+        results[i] = result
+    return results